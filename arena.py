@@ -0,0 +1,207 @@
+"""N-player arena: TwoPlayerGame's rules for any number of snakes.
+
+All collisions go through one cell-ownership grid (a flat array of y*width+x holding the index
+of the snake whose body covers the cell, OBSTACLE, or EMPTY), so resolving a tick costs
+O(number of snakes) no matter how long they are. Each move step:
+  1. every moving snake advances (tails that are not growing leave the grid first),
+  2. wall_ghost heads wrap,
+  3. a head dies if it is off the board, on an owned cell (obstacle, any body) or shares its
+     cell with another new head (head-on),
+  4. surviving heads take ownership of their cell; dead snakes' bodies are cleared.
+speed_self snakes move in a second step after everyone's first; slow_opponent slows every
+other live snake. Food and power-ups spawn from the shared FreeCellIndex.
+"""
+import math
+import random
+from array import array
+from maps import map_layout
+from snake_core import ITEM_EXPIRY, FreeCellIndex, PowerUp, Snake, TimerWheel
+
+EMPTY = -1; OBSTACLE = -2
+SNAKE_COLORS = ['GREEN', 'BLUE', 'YELLOW', 'MAGENTA', 'CYAN', 'ORANGE', 'WHITE', 'PINK']
+
+class ArenaGame:
+    def __init__(self, width, height, num_snakes=8, map_id=0, game_mode='last_snake', target_score=10, seed=None):
+        if not 1 <= num_snakes <= 127: raise ValueError("an arena holds 1 to 127 snakes")
+        self.width = width; self.height = height; self.map_id = map_id
+        self.game_mode = game_mode; self.target_score = target_score
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self.rng = random.Random(self.seed)
+        self.tick = 0; self.game_over = False; self.winner = None # winner: snake id, 'draw' or None
+        self.timers = TimerWheel() # Power-up effect and item expiries; see snake_core.TimerWheel
+        self.foods = []; self._food_set = set(); self.MAX_FOOD_ITEMS = max(5, num_snakes)
+        self.powerup_item = None; self.powerup_spawn_chance = 0.20
+        self.powerup_item_ends = 0; self.POWERUP_MAP_LIFESPAN = 100
+        self.POWERUP_DEFINITIONS = {
+            'speed_self': {'symbol': 'S', 'color': 'LIGHTBLUE', 'effect_duration': 50, 'applies_to': 'self'},
+            'slow_opponent': {'symbol': 'O', 'color': 'ORANGE', 'effect_duration': 50, 'applies_to': 'opponent'},
+            'wall_ghost': {'symbol': 'G', 'color': 'PURPLE', 'effect_duration': 70, 'applies_to': 'self'},
+        }
+        self.obstacles = list(map_layout(map_id, width, height).obstacles)
+        self.grid = array('b', [EMPTY]) * (width * height)
+        for x, y in self.obstacles: self.grid[y * width + x] = OBSTACLE
+        self._free_cells = FreeCellIndex(width, height, self.obstacles)
+        self.snakes = []; self.alive = []
+        for i, pos in enumerate(self._spawn_points(num_snakes)):
+            snake = Snake(i + 1, pos, 'RIGHT' if pos[0] < width // 2 else 'LEFT', SNAKE_COLORS[i % len(SNAKE_COLORS)])
+            snake.cell_index = self._free_cells; snake.timers = self.timers; self._free_cells.occupy(pos)
+            self.grid[pos[1] * width + pos[0]] = i
+            self.snakes.append(snake); self.alive.append(True)
+        self._generate_food()
+
+    def _spawn_points(self, n):
+        # Spread snakes over a near-square lattice of the board; clashes fall back to a random free cell
+        cols = math.ceil(math.sqrt(n)); rows = math.ceil(n / cols)
+        points = []; taken = set(self.obstacles)
+        for i in range(n):
+            r, c = divmod(i, cols)
+            pos = (int((c + 0.5) * self.width / cols), int((r + 0.5) * self.height / rows))
+            if pos in taken:
+                for p in taken: self._free_cells.occupy(p)
+                pos = self._free_cells.sample(self.rng)
+                for p in taken: self._free_cells.release(p)
+                if pos is None: raise ValueError("board too small for this many snakes")
+            points.append(pos); taken.add(pos)
+        return points
+
+    # --- Spawning ---
+    def _generate_location(self):
+        return self._free_cells.sample(self.rng)
+
+    def _generate_food(self):
+        while len(self.foods) < self.MAX_FOOD_ITEMS:
+            pos = self._generate_location()
+            if pos is None: break
+            self.foods.append(pos); self._food_set.add(pos); self._free_cells.occupy(pos)
+
+    def _generate_powerup_item(self):
+        if self.powerup_item is None and self.rng.random() < self.powerup_spawn_chance:
+            pos = self._generate_location()
+            if pos is None: return
+            type_id = self.rng.choice(list(self.POWERUP_DEFINITIONS.keys()))
+            d = self.POWERUP_DEFINITIONS[type_id]
+            self.powerup_item = PowerUp(type_id, pos, d['color'], d['symbol'], d['effect_duration'])
+            self._free_cells.occupy(pos)
+            self.powerup_item_ends = self.tick + self.POWERUP_MAP_LIFESPAN
+            self.timers.schedule(self.powerup_item_ends, ITEM_EXPIRY, self)
+
+    def _clear_powerup_item(self):
+        if self.powerup_item: self._free_cells.release(self.powerup_item.position)
+        self.powerup_item = None; self.powerup_item_ends = self.tick
+
+    @property
+    def powerup_on_map_lifespan_timer(self): return max(0, self.powerup_item_ends - self.tick)
+
+    # --- Power-ups ---
+    def _deactivate_direct_effects(self, s):
+        s.steps_per_update = 1; s.is_wall_ghost = False; s.is_slowed_timer = 0; s.slow_effect_counter = 0
+        if s.active_powerup_type is not None: s.active_powerup_type = None; s.powerup_effect_timer = 0
+
+    def _activate_powerup(self, i, powerup_type):
+        d = self.POWERUP_DEFINITIONS[powerup_type]; snake = self.snakes[i]
+        if d['applies_to'] == 'self': self._deactivate_direct_effects(snake)
+        snake.active_powerup_type = powerup_type; snake.powerup_effect_timer = d['effect_duration']
+        if powerup_type == 'speed_self': snake.steps_per_update = 2
+        elif powerup_type == 'wall_ghost': snake.is_wall_ghost = True
+        elif powerup_type == 'slow_opponent':
+            for j, other in enumerate(self.snakes):
+                if j != i and self.alive[j]: other.is_slowed_timer = d['effect_duration']; other.slow_effect_counter = 0
+
+    def expire(self, kind, tick):
+        if self.powerup_item and self.powerup_item_ends == tick: self._clear_powerup_item()
+
+    def _update_powerup_timers(self):
+        for kind, target, tick in self.timers.advance(self.tick):
+            if target is self or self.alive[target.id - 1]: target.expire(kind, tick) # Dead snakes keep their effects
+
+    # --- Tick ---
+    def _kill(self, i):
+        """Remove a dead snake's body from the grid and the free-cell index."""
+        self.alive[i] = False
+        grid = self.grid; w = self.width; h = self.height
+        for x, y in self.snakes[i].body:
+            if 0 <= x < w and 0 <= y < h and grid[y * w + x] == i: grid[y * w + x] = EMPTY
+            self._free_cells.release((x, y))
+
+    def _move_step(self, movers):
+        grid = self.grid; w = self.width; h = self.height; snakes = self.snakes
+        heads = {}
+        for i in movers: # 1. Advance; vacated tails leave the grid before any head is checked
+            s = snakes[i]
+            tail = s.body[-1]; grows = s.grow_pending
+            s.move()
+            if not grows: grid[tail[1] * w + tail[0]] = EMPTY
+            x, y = s.body[0]
+            if s.is_wall_ghost and not (0 <= x < w and 0 <= y < h): # 2. Wrap
+                x %= w; y %= h; s.set_head((x, y))
+            heads[i] = (x, y)
+        counts = {}
+        for pos in heads.values(): counts[pos] = counts.get(pos, 0) + 1
+        dead = []
+        for i, (x, y) in heads.items(): # 3. Resolve against the grid and the other new heads
+            if not (0 <= x < w and 0 <= y < h) or grid[y * w + x] != EMPTY or counts[(x, y)] > 1: dead.append(i)
+        for i, (x, y) in heads.items(): # 4. Claim cells
+            if i not in dead: grid[y * w + x] = i
+        for i in dead: self._kill(i)
+
+    def update(self):
+        if self.game_over: return
+        self.tick += 1
+        self._update_powerup_timers()
+        snakes = self.snakes; alive = self.alive
+        movers = []
+        for i, s in enumerate(snakes):
+            if not alive[i] or not s.is_started: continue
+            if s.slowed_ends > self.tick:
+                s.slow_effect_counter = (s.slow_effect_counter + 1) % 2
+                if s.slow_effect_counter == 1: continue
+            movers.append(i)
+        if not movers: return
+        self._move_step(movers)
+        fast = [i for i in movers if alive[i] and snakes[i].steps_per_update > 1]
+        if fast: self._move_step(fast)
+
+        # Food and power-up pickup, in snake order
+        eaten = False
+        for i in movers:
+            if not alive[i]: continue
+            s = snakes[i]; head = s.body[0]
+            if head in self._food_set:
+                s.grow(); eaten = True
+                self.foods.remove(head); self._food_set.discard(head); self._free_cells.release(head)
+            if self.powerup_item and head == self.powerup_item.position:
+                self._activate_powerup(i, self.powerup_item.type_id); self._clear_powerup_item()
+        if eaten: self._generate_food(); self._generate_powerup_item()
+        self._check_game_over()
+
+    def _check_game_over(self):
+        living = [i for i, a in enumerate(self.alive) if a]
+        if self.game_mode == 'first_to_x':
+            best = max(s.score for s in self.snakes)
+            if best >= self.target_score:
+                leaders = [s.id for s in self.snakes if s.score == best]
+                self.game_over = True; self.winner = leaders[0] if len(leaders) == 1 else 'draw'; return
+        if len(self.snakes) > 1 and len(living) <= 1:
+            self.game_over = True; self.winner = self.snakes[living[0]].id if living else 'draw'
+        elif len(self.snakes) == 1 and not living:
+            self.game_over = True
+
+    # --- Interface (mirrors TwoPlayerGame with snake ids 1..n) ---
+    def change_snake_direction(self, snake_id, new_direction):
+        if self.game_over or not 1 <= snake_id <= len(self.snakes) or not self.alive[snake_id - 1]: return
+        self.snakes[snake_id - 1].turn(new_direction)
+    def get_powerup_item_details(self):
+        if self.powerup_item: return {'position': self.powerup_item.position, 'symbol': self.powerup_item.symbol, 'color': self.powerup_item.color}
+        return None
+    def get_obstacles(self): return self.obstacles
+    def get_scores(self): return [s.score for s in self.snakes]
+    def is_game_over(self): return self.game_over
+    def get_winner(self): return self.winner
+    def get_snake_bodies(self): return [s.get_body() for s in self.snakes]
+    def get_snake_colors(self): return [s.color for s in self.snakes]
+    def get_alive(self): return list(self.alive)
+    def get_foods(self): return self.foods
+    def owner_at(self, pos):
+        """Index of the snake covering pos, OBSTACLE, or EMPTY (also for off-board cells)."""
+        x, y = pos
+        return self.grid[y * self.width + x] if 0 <= x < self.width and 0 <= y < self.height else EMPTY
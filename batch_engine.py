@@ -0,0 +1,351 @@
+import numpy as np
+from maps import map_layout
+
+# --- Batched headless engine ---
+# Holds N independent games as NumPy arrays and steps all of them with one step(actions) call.
+# Rules mirror snake_core.Game.update / TwoPlayerGame.update; spawns use a per-batch
+# numpy Generator, so individual games do not reproduce the random stream of snake_core.
+
+DIRECTIONS = ('UP', 'DOWN', 'LEFT', 'RIGHT') # Action codes 0..3, same order as Snake.turn
+NO_ACTION = -1
+_DX = np.array([0, 0, -1, 1], dtype=np.int32)
+_DY = np.array([-1, 1, 0, 0], dtype=np.int32)
+_OPPOSITE = np.array([1, 0, 3, 2], dtype=np.int8)
+
+# Power-up type codes; effect durations mirror Game/TwoPlayerGame.POWERUP_DEFINITIONS
+POWERUP_TYPES = ('speed_self', 'wall_ghost', 'slow_opponent')
+SPEED_SELF, WALL_GHOST, SLOW_OPPONENT = 0, 1, 2
+_EFFECT_DURATION = np.array([50, 70, 50], dtype=np.int32)
+
+WINNER_NONE, WINNER_P1, WINNER_P2, WINNER_DRAW = 0, 1, 2, 3
+WINNER_NAMES = (None, 'player1', 'player2', 'draw')
+
+class _BatchBase:
+    """Array storage shared by the single and two-snake batch engines.
+
+    Per snake: a ring buffer of segments (head at ring[head]), a per-cell segment count grid,
+    direction and power-up state. Per game: food mask, power-up item and obstacle mask.
+    Coordinates are stored as (x, y); grids are indexed [game, y, x].
+    """
+    POWERUP_CHOICES = (SPEED_SELF, WALL_GHOST)
+
+    def __init__(self, num_games, width, height, num_snakes, map_id=0, max_food=5,
+                 powerup_spawn_chance=0.15, powerup_map_lifespan=100, seed=None):
+        self.n = num_games; self.width = width; self.height = height; self.k = num_snakes
+        self.MAX_FOOD_ITEMS = max_food; self.powerup_spawn_chance = powerup_spawn_chance
+        self.POWERUP_MAP_LIFESPAN = powerup_map_lifespan
+        self.rng = np.random.default_rng(seed)
+        self.cap = width * height + 8 # Ring capacity; bodies never exceed the board plus a few off-board segments
+        n, k = num_games, num_snakes
+
+        self.layout = map_layout(map_id, width, height) # Same obstacles and spawn points as snake_core on this board
+        self.obstacles = np.frombuffer(self.layout.blocked, dtype=np.uint8).reshape(height, width).astype(bool)
+
+        self.ring = np.zeros((n, k, self.cap, 2), dtype=np.int16)
+        self.head = np.zeros((n, k), dtype=np.int32); self.length = np.zeros((n, k), dtype=np.int32)
+        self.head_x = np.zeros((n, k), dtype=np.int32); self.head_y = np.zeros((n, k), dtype=np.int32)
+        self.grid = np.zeros((n, k, height, width), dtype=np.uint16) # In-bounds segment counts per snake
+        self.direction = np.zeros((n, k), dtype=np.int8)
+        self.started = np.zeros((n, k), dtype=bool); self.grow_pending = np.zeros((n, k), dtype=bool)
+        self.score = np.zeros((n, k), dtype=np.int32)
+        self.active_powerup = np.full((n, k), -1, dtype=np.int8); self.effect_timer = np.zeros((n, k), dtype=np.int32)
+        self.wall_ghost = np.zeros((n, k), dtype=bool); self.steps_per_update = np.ones((n, k), dtype=np.int8)
+        self.slowed_timer = np.zeros((n, k), dtype=np.int32); self.slow_counter = np.zeros((n, k), dtype=np.int8)
+
+        self.food = np.zeros((n, height, width), dtype=bool); self.food_count = np.zeros(n, dtype=np.int32)
+        self.powerup_type = np.full(n, -1, dtype=np.int8); self.powerup_x = np.zeros(n, dtype=np.int32)
+        self.powerup_y = np.zeros(n, dtype=np.int32); self.powerup_lifespan = np.zeros(n, dtype=np.int32)
+        self.game_over = np.zeros(n, dtype=bool); self.winner = np.zeros(n, dtype=np.int8)
+        self._all = np.ones(n, dtype=bool)
+
+    # --- Reset ---
+    def _initial_positions(self): raise NotImplementedError
+
+    def reset(self, mask=None):
+        mask = self._all if mask is None else np.asarray(mask, dtype=bool)
+        idx = np.nonzero(mask)[0]
+        if idx.size == 0: return
+        self.grid[idx] = 0; self.food[idx] = False; self.food_count[idx] = 0
+        self.powerup_type[idx] = -1; self.powerup_lifespan[idx] = 0
+        self.game_over[idx] = False; self.winner[idx] = WINNER_NONE
+        for arr, value in ((self.started, False), (self.grow_pending, False), (self.score, 0),
+                           (self.active_powerup, -1), (self.effect_timer, 0), (self.wall_ghost, False),
+                           (self.steps_per_update, 1), (self.slowed_timer, 0), (self.slow_counter, 0)):
+            arr[idx] = value
+        for s, (pos, direction) in enumerate(self._initial_positions()):
+            x = np.full(idx.size, pos[0], dtype=np.int32); y = np.full(idx.size, pos[1], dtype=np.int32)
+            if self.obstacles[pos[1], pos[0]]: # Spawn point blocked by the map: pick a free cell instead
+                cells = self._sample_free(idx)
+                x = np.where(cells >= 0, cells % self.width, 1); y = np.where(cells >= 0, cells // self.width, 1)
+            self.head[idx, s] = 0; self.length[idx, s] = 1
+            self.ring[idx, s, 0, 0] = x; self.ring[idx, s, 0, 1] = y
+            self.head_x[idx, s] = x; self.head_y[idx, s] = y
+            self.grid[idx, s, y, x] += 1
+            self.direction[idx, s] = DIRECTIONS.index(direction)
+        self._generate_food(mask)
+
+    # --- Input ---
+    def _turn(self, s, actions):
+        # Snake.turn: the first key press starts the snake in any direction, afterwards no reversing
+        actions = np.asarray(actions, dtype=np.int8)
+        valid = (actions >= 0) & (actions < 4) & ~self.game_over
+        first = valid & ~self.started[:, s]
+        allowed = valid & self.started[:, s] & (actions != _OPPOSITE[self.direction[:, s]])
+        upd = first | allowed
+        self.direction[upd, s] = actions[upd]; self.started[first, s] = True
+
+    # --- Occupancy and spawning ---
+    def _in_bounds(self, x, y): return (x >= 0) & (x < self.width) & (y >= 0) & (y < self.height)
+
+    def _occupied(self, idx):
+        occ = (self.grid[idx] > 0).any(axis=1) | self.food[idx] | self.obstacles
+        has_pu = self.powerup_type[idx] >= 0
+        occ[np.nonzero(has_pu)[0], self.powerup_y[idx][has_pu], self.powerup_x[idx][has_pu]] = True
+        return occ
+
+    def _sample_free(self, idx):
+        # Uniform free cell per game as a flat y*width+x index, -1 when the board is full
+        r = self.rng.random((idx.size, self.height * self.width))
+        r[self._occupied(idx).reshape(idx.size, -1)] = -1.0
+        cells = r.argmax(axis=1)
+        return np.where(r[np.arange(idx.size), cells] >= 0, cells, -1)
+
+    def _generate_food(self, mask):
+        need = mask & (self.food_count < self.MAX_FOOD_ITEMS)
+        while need.any():
+            idx = np.nonzero(need)[0]
+            cells = self._sample_free(idx)
+            ok = cells >= 0; idx = idx[ok]; cells = cells[ok]
+            self.food[idx, cells // self.width, cells % self.width] = True; self.food_count[idx] += 1
+            need[np.nonzero(need)[0][~ok]] = False
+            need &= self.food_count < self.MAX_FOOD_ITEMS
+
+    def _generate_powerup_item(self, mask):
+        roll = mask & (self.powerup_type < 0)
+        roll &= self.rng.random(self.n) < self.powerup_spawn_chance
+        idx = np.nonzero(roll)[0]
+        if idx.size == 0: return
+        cells = self._sample_free(idx)
+        ok = cells >= 0; idx = idx[ok]; cells = cells[ok]
+        choices = np.array(self.POWERUP_CHOICES, dtype=np.int8)
+        self.powerup_type[idx] = choices[self.rng.integers(0, len(choices), idx.size)]
+        self.powerup_x[idx] = cells % self.width; self.powerup_y[idx] = cells // self.width
+        self.powerup_lifespan[idx] = self.POWERUP_MAP_LIFESPAN
+
+    def _clear_powerup_item(self, mask): self.powerup_type[mask] = -1; self.powerup_lifespan[mask] = 0
+
+    # --- Movement ---
+    def _move(self, mask, s):
+        idx = np.nonzero(mask)[0]
+        if idx.size == 0: return
+        d = self.direction[idx, s]
+        nx = self.head_x[idx, s] + _DX[d]; ny = self.head_y[idx, s] + _DY[d]
+        h = (self.head[idx, s] - 1) % self.cap
+        self.ring[idx, s, h, 0] = nx; self.ring[idx, s, h, 1] = ny
+        self.head[idx, s] = h; self.length[idx, s] += 1
+        self.head_x[idx, s] = nx; self.head_y[idx, s] = ny
+        inb = self._in_bounds(nx, ny)
+        self.grid[idx[inb], s, ny[inb], nx[inb]] += 1
+
+        pop = ~self.grow_pending[idx, s]; self.grow_pending[idx, s] = False
+        idx = idx[pop]
+        t = (self.head[idx, s] + self.length[idx, s] - 1) % self.cap
+        tx = self.ring[idx, s, t, 0].astype(np.int32); ty = self.ring[idx, s, t, 1].astype(np.int32)
+        self.length[idx, s] -= 1
+        inb = self._in_bounds(tx, ty)
+        self.grid[idx[inb], s, ty[inb], tx[inb]] -= 1
+
+    def _wrap_head(self, mask, s):
+        # wall_ghost: an off-board head re-enters on the opposite edge (Snake.set_head)
+        idx = np.nonzero(mask)[0]
+        x = self.head_x[idx, s] % self.width; y = self.head_y[idx, s] % self.height
+        h = self.head[idx, s]
+        self.ring[idx, s, h, 0] = x; self.ring[idx, s, h, 1] = y
+        self.head_x[idx, s] = x; self.head_y[idx, s] = y
+        self.grid[idx, s, y, x] += 1
+
+    def _cell_value(self, arr, x, y):
+        # arr[game, y, x] for every game, False/0 where (x, y) is off the board
+        inb = self._in_bounds(x, y)
+        v = arr[np.arange(self.n), np.clip(y, 0, self.height - 1), np.clip(x, 0, self.width - 1)]
+        return np.where(inb, v, 0)
+
+    def _eat_food(self, mask, s):
+        idx = np.nonzero(mask)[0]
+        self.grow_pending[idx, s] = True; self.score[idx, s] += 1
+        self.food[idx, self.head_y[idx, s], self.head_x[idx, s]] = False; self.food_count[idx] -= 1
+
+    def _on_powerup(self, s):
+        return (self.powerup_type >= 0) & (self.head_x[:, s] == self.powerup_x) & (self.head_y[:, s] == self.powerup_y)
+
+    # --- Getters ---
+    def get_snake_body(self, game, s=0):
+        h = self.head[game, s]; n = self.length[game, s]
+        seg = self.ring[game, s, (h + np.arange(n)) % self.cap]
+        return [(int(x), int(y)) for x, y in seg]
+
+    def get_foods(self, game):
+        ys, xs = np.nonzero(self.food[game])
+        return [(int(x), int(y)) for x, y in zip(xs, ys)]
+
+    def get_powerup_item(self, game):
+        if self.powerup_type[game] < 0: return None
+        return POWERUP_TYPES[self.powerup_type[game]], (int(self.powerup_x[game]), int(self.powerup_y[game]))
+
+class BatchGame(_BatchBase):
+    """N single-player games stepped together with the rules of snake_core.Game.update."""
+    def __init__(self, num_games, width, height, **kwargs):
+        kwargs.setdefault('powerup_spawn_chance', 0.15)
+        super().__init__(num_games, width, height, 1, **kwargs)
+        self.reset()
+
+    def _initial_positions(self): return [((self.width // 2, self.height // 2), 'RIGHT')]
+
+    def _update_powerup_timers(self, live):
+        t = live & (self.effect_timer[:, 0] > 0)
+        self.effect_timer[t, 0] -= 1
+        expired = t & (self.effect_timer[:, 0] == 0)
+        self.steps_per_update[expired & (self.active_powerup[:, 0] == SPEED_SELF), 0] = 1
+        self.wall_ghost[expired & (self.active_powerup[:, 0] == WALL_GHOST), 0] = False
+        self.active_powerup[expired, 0] = -1
+        item = live & (self.powerup_type >= 0)
+        self.powerup_lifespan[item] -= 1
+        self._clear_powerup_item(item & (self.powerup_lifespan <= 0))
+
+    def _activate_powerup(self, mask):
+        kind = self.powerup_type
+        self.steps_per_update[mask, 0] = 1; self.wall_ghost[mask, 0] = False
+        self.active_powerup[mask, 0] = kind[mask]; self.effect_timer[mask, 0] = _EFFECT_DURATION[kind[mask]]
+        self.steps_per_update[mask & (kind == SPEED_SELF), 0] = 2
+        self.wall_ghost[mask & (kind == WALL_GHOST), 0] = True
+
+    def step(self, actions=None):
+        """Apply one direction code per game (NO_ACTION to keep going) and advance every live game by one tick.
+
+        Returns the game_over mask.
+        """
+        if actions is not None: self._turn(0, actions)
+        live = ~self.game_over
+        self._update_powerup_timers(live)
+        act = live & self.started[:, 0]
+
+        for k in range(2): # steps_per_update is 1 or 2 (speed_self)
+            m = act & ~self.game_over & (self.steps_per_update[:, 0] > k)
+            self._move(m, 0)
+            out = m & ~self._in_bounds(self.head_x[:, 0], self.head_y[:, 0])
+            self._wrap_head(out & self.wall_ghost[:, 0], 0)
+            self.game_over |= out & ~self.wall_ghost[:, 0]
+            m &= ~self.game_over
+            self.game_over |= m & (self._cell_value(self.grid[:, 0], self.head_x[:, 0], self.head_y[:, 0]) > 1)
+
+        alive = act & ~self.game_over
+        eat = alive & self._cell_value(self.food, self.head_x[:, 0], self.head_y[:, 0]).astype(bool)
+        if eat.any():
+            self._eat_food(eat, 0); self._generate_food(eat); self._generate_powerup_item(eat)
+        pick = alive & self._on_powerup(0)
+        if pick.any(): self._activate_powerup(pick); self._clear_powerup_item(pick)
+        return self.game_over
+
+class BatchTwoPlayerGame(_BatchBase):
+    """N two-player games stepped together with the rules of snake_core.TwoPlayerGame.update."""
+    POWERUP_CHOICES = (SPEED_SELF, SLOW_OPPONENT, WALL_GHOST) # TwoPlayerGame.POWERUP_DEFINITIONS order
+
+    def __init__(self, num_games, width, height, map_id=0, game_mode='last_snake', target_score=10, **kwargs):
+        kwargs.setdefault('powerup_spawn_chance', 0.20)
+        self.game_mode = game_mode; self.target_score = target_score
+        super().__init__(num_games, width, height, 2, map_id=map_id, **kwargs)
+        self.reset()
+
+    def _initial_positions(self): return list(zip(self.layout.spawns, ('RIGHT', 'LEFT')))
+
+    def _update_powerup_timers(self, live):
+        for s in range(2):
+            t = live & (self.effect_timer[:, s] > 0)
+            self.effect_timer[t, s] -= 1
+            expired = t & (self.effect_timer[:, s] == 0)
+            self.steps_per_update[expired & (self.active_powerup[:, s] == SPEED_SELF), s] = 1
+            self.wall_ghost[expired & (self.active_powerup[:, s] == WALL_GHOST), s] = False
+            self.active_powerup[expired, s] = -1
+            slowed = live & (self.slowed_timer[:, s] > 0)
+            self.slowed_timer[slowed, s] -= 1
+            self.slow_counter[slowed & (self.slowed_timer[:, s] == 0), s] = 0
+        item = live & (self.powerup_type >= 0) & (self.powerup_lifespan > 0)
+        self.powerup_lifespan[item] -= 1
+        self._clear_powerup_item(item & (self.powerup_lifespan <= 0))
+
+    def _deactivate_direct_effects(self, mask, s):
+        self.steps_per_update[mask, s] = 1; self.wall_ghost[mask, s] = False
+        self.slowed_timer[mask, s] = 0; self.slow_counter[mask, s] = 0
+        self.active_powerup[mask, s] = -1; self.effect_timer[mask, s] = 0
+
+    def _activate_powerup(self, mask, s):
+        o = 1 - s; kind = self.powerup_type
+        self._deactivate_direct_effects(mask & (kind != SLOW_OPPONENT), s)
+        self._deactivate_direct_effects(mask & (kind == SLOW_OPPONENT), o)
+        self.active_powerup[mask, s] = kind[mask]; self.effect_timer[mask, s] = _EFFECT_DURATION[kind[mask]]
+        self.steps_per_update[mask & (kind == SPEED_SELF), s] = 2
+        slow = mask & (kind == SLOW_OPPONENT)
+        self.slowed_timer[slow, o] = _EFFECT_DURATION[SLOW_OPPONENT]; self.slow_counter[slow, o] = 0
+        self.wall_ghost[mask & (kind == WALL_GHOST), s] = True
+
+    def step(self, actions=None):
+        """Apply an (N, 2) array of direction codes (NO_ACTION to keep going) and advance every live game.
+
+        Returns the game_over mask; see `winner` / WINNER_NAMES for outcomes.
+        """
+        if actions is not None:
+            actions = np.asarray(actions)
+            self._turn(0, actions[:, 0]); self._turn(1, actions[:, 1])
+        live = ~self.game_over
+        self._update_powerup_timers(live)
+
+        for s in range(2):
+            m = live & self.started[:, s]
+            slowed = m & (self.slowed_timer[:, s] > 0)
+            self.slow_counter[slowed, s] = (self.slow_counter[slowed, s] + 1) % 2
+            m &= ~(slowed & (self.slow_counter[:, s] == 1))
+            for k in range(2):
+                self._move(m & (self.steps_per_update[:, s] > k), s)
+
+        act = live & self.started.any(axis=1)
+        eat1 = act & self.started[:, 0] & self._cell_value(self.food, self.head_x[:, 0], self.head_y[:, 0]).astype(bool)
+        if eat1.any():
+            self._eat_food(eat1, 0); self._generate_food(eat1); self._generate_powerup_item(eat1)
+        eat2 = act & self.started[:, 1] & self._cell_value(self.food, self.head_x[:, 1], self.head_y[:, 1]).astype(bool)
+        if eat2.any():
+            self._eat_food(eat2, 1); self._generate_food(eat2); self._generate_powerup_item(eat2 & ~eat1)
+
+        pick1 = act & self.started[:, 0] & self._on_powerup(0)
+        pick2 = act & ~pick1 & self.started[:, 1] & self._on_powerup(1)
+        if pick1.any(): self._activate_powerup(pick1, 0); self._clear_powerup_item(pick1)
+        if pick2.any(): self._activate_powerup(pick2, 1); self._clear_powerup_item(pick2)
+
+        if self.game_mode == 'first_to_x':
+            s1r = act & (self.score[:, 0] >= self.target_score); s2r = act & (self.score[:, 1] >= self.target_score)
+            both = s1r & s2r
+            self.winner[both] = np.where(self.score[both, 0] == self.score[both, 1], WINNER_DRAW,
+                                         np.where(self.score[both, 0] > self.score[both, 1], WINNER_P1, WINNER_P2))
+            self.winner[s1r & ~s2r] = WINNER_P1; self.winner[s2r & ~s1r] = WINNER_P2
+            self.game_over |= s1r | s2r
+
+        c = act & ~self.game_over
+        out = [c & ~self._in_bounds(self.head_x[:, s], self.head_y[:, s]) for s in range(2)]
+        for s in range(2): self._wrap_head(out[s] & self.wall_ghost[:, s], s)
+        hx, hy = self.head_x, self.head_y
+        hc = (hx[:, 0] == hx[:, 1]) & (hy[:, 0] == hy[:, 1])
+        lost = []
+        for s in range(2):
+            o = 1 - s
+            ob = out[s] & ~self.wall_ghost[:, s]
+            sc = self._cell_value(self.grid[:, s], hx[:, s], hy[:, s]) > 1
+            hb = ~hc & (self._cell_value(self.grid[:, o], hx[:, s], hy[:, s]) > 0)
+            ho = self._cell_value(np.broadcast_to(self.obstacles, self.food.shape), hx[:, s], hy[:, s]).astype(bool)
+            lost.append(ob | sc | hb | ho)
+        p1l, p2l = lost
+        self.winner[c & (hc | (p1l & p2l))] = WINNER_DRAW
+        self.winner[c & ~hc & p1l & ~p2l] = WINNER_P2
+        self.winner[c & ~hc & p2l & ~p1l] = WINNER_P1
+        self.game_over |= c & (hc | p1l | p2l)
+        return self.game_over
+
+    def get_winner(self, game): return WINNER_NAMES[self.winner[game]]
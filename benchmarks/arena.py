@@ -0,0 +1,53 @@
+"""Tick cost of ArenaGame against snake count and snake length.
+
+Snakes are spaced evenly along one Hamiltonian cycle and steered along it, so nobody dies and
+nothing grows (no food); the cost per tick should track the snake count, not the total length.
+
+    python -m benchmarks.arena [--counts 2 8 16 32] [--lengths 5 50 100] [--ticks 2000]
+"""
+import argparse
+import sys
+import time
+from array import array
+from arena import EMPTY, ArenaGame
+from benchmarks.fixtures import CycleDriver, hamiltonian_cycle
+
+def arena_on_cycle(width, height, count, length):
+    game = ArenaGame(width, height, count, seed=0)
+    game.MAX_FOOD_ITEMS = 0; game.powerup_spawn_chance = 0
+    for pos in game.foods: game._free_cells.release(pos)
+    game.foods = []; game._food_set = set()
+    driver = CycleDriver(hamiltonian_cycle(0, 0, width, height))
+    spacing = len(driver.cycle) // count
+    if spacing <= length: raise ValueError(f"{count} snakes of length {length} do not fit")
+    game.grid = array('b', [EMPTY]) * (width * height) # Re-laid below along the cycle
+    for i, snake in enumerate(game.snakes):
+        driver.place(game, snake, i * spacing + length - 1, length)
+        for x, y in snake.body: game.grid[y * width + x] = i
+    return game, driver
+
+def measure(count, length, ticks, width=64, height=64):
+    game, driver = arena_on_cycle(width, height, count, length)
+    snakes = game.snakes; steer = driver.steer
+    t0 = time.perf_counter()
+    for _ in range(ticks):
+        for s in snakes: steer(s)
+        game.update()
+    elapsed = time.perf_counter() - t0
+    if not all(game.alive): raise RuntimeError("a benchmark snake died; the fixture is broken")
+    return elapsed / ticks * 1e6
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--counts', type=int, nargs='+', default=[2, 8, 16, 32])
+    parser.add_argument('--lengths', type=int, nargs='+', default=[5, 50, 100])
+    parser.add_argument('--ticks', type=int, default=2000)
+    args = parser.parse_args(argv)
+    print(f"{'snakes':>6} " + ' '.join(f"{f'len={n}':>10}" for n in args.lengths) + "   (us per tick, 64x64 board)")
+    for count in args.counts:
+        row = [f"{measure(count, length, args.ticks):10.1f}" for length in args.lengths]
+        print(f"{count:6d} " + ' '.join(row))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,196 @@
+"""Batched engine vs snake_core: differential rule check and batched vs per-object stepping speed.
+
+The check steps N core games and one batch of N games side by side with the same actions and the
+random spawns of both replaced by the same deterministic policy (the batch engine samples with a
+numpy Generator, so its raw random stream differs from the core's), and compares bodies, scores,
+power-up state, foods, the item on the map and outcomes of every game after every tick. The speed
+comparison steps N games one object at a time and as one batch, restarting finished games.
+
+    python -m benchmarks.batch_engine [--check 32] [--games 1 64 1024] [--ticks 200]
+"""
+import argparse
+import random
+import sys
+import time
+import numpy as np
+import snake_core
+import batch_engine
+from batch_engine import BatchGame, BatchTwoPlayerGame, DIRECTIONS, NO_ACTION, POWERUP_TYPES
+from snake_core import Game, TwoPlayerGame
+
+_HASH = 2654435761
+_VECTORS = ((0, -1), (0, 1), (-1, 0), (1, 0)) # DIRECTIONS order
+
+class _SharedSpawnPolicy:
+    """Per game: the k-th spawn takes a hashed rank among the free cells in row-major order, and the
+    power-up type is a hash of its cell. Power-up rolls always succeed so effects come up often."""
+    def __init__(self, games):
+        self.current = 0 # Core game being stepped
+        self.core_calls = [0] * games; self.batch_calls = [0] * games
+        self.core_cell = [0] * games; self.batch_cells = np.zeros(0, dtype=np.int64)
+
+    def _pick(self, calls, g, free):
+        calls[g] += 1; return free[(calls[g] * _HASH) % len(free)]
+
+    def install(self):
+        policy = self; saved = (snake_core.FreeCellIndex.sample, batch_engine._BatchBase._sample_free)
+        def core_sample(index, rng=None):
+            if not index._free: return None
+            g = policy.current; c = policy._pick(policy.core_calls, g, sorted(index._free))
+            policy.core_cell[g] = c
+            return (c % index.width, c // index.width)
+        def batch_sample(batch, idx):
+            occupied = batch._occupied(idx).reshape(idx.size, -1); cells = np.full(idx.size, -1, dtype=np.int64)
+            for j, g in enumerate(idx):
+                free = np.flatnonzero(~occupied[j])
+                if free.size: cells[j] = policy._pick(policy.batch_calls, g, free)
+            policy.batch_cells = cells
+            return cells
+        snake_core.FreeCellIndex.sample = core_sample; batch_engine._BatchBase._sample_free = batch_sample
+        return saved
+
+    @staticmethod
+    def uninstall(saved):
+        snake_core.FreeCellIndex.sample, batch_engine._BatchBase._sample_free = saved
+
+    def core_rng(self, g):
+        policy = self
+        class CoreRng:
+            def random(self): return 0.0
+            def choice(self, seq): return seq[(policy.core_cell[g] * _HASH >> 16) % len(seq)]
+        return CoreRng()
+
+    def batch_rng(self):
+        policy = self
+        class BatchRng:
+            def random(self, size): return np.zeros(size)
+            def integers(self, low, high, size): # Called for the games whose spawn found a cell
+                cells = policy.batch_cells[policy.batch_cells >= 0]
+                return low + (cells * _HASH >> 16) % (high - low)
+        return BatchRng()
+
+def _core_state(game, snakes):
+    pu = game.powerup_item
+    return ([(list(s.body), s.score, s.direction, s.active_powerup_type, s.powerup_effect_timer, s.is_wall_ghost,
+              s.steps_per_update, s.is_slowed_timer, s.slow_effect_counter) for s in snakes],
+            sorted(game.foods), (pu.type_id, pu.position) if pu else None, game.game_over, getattr(game, 'winner', None))
+
+def _batch_state(batch, g, two):
+    pu = batch.get_powerup_item(g)
+    kind = lambda k: POWERUP_TYPES[k] if k >= 0 else None
+    return ([(batch.get_snake_body(g, s), int(batch.score[g, s]), DIRECTIONS[batch.direction[g, s]],
+              kind(batch.active_powerup[g, s]), int(batch.effect_timer[g, s]), bool(batch.wall_ghost[g, s]),
+              int(batch.steps_per_update[g, s]), int(batch.slowed_timer[g, s]), int(batch.slow_counter[g, s]))
+             for s in range(batch.k)],
+            sorted(batch.get_foods(g)), pu, bool(batch.game_over[g]), batch.get_winner(g) if two else None)
+
+def _steer(game, snake, others, rng):
+    """Mostly a safe direction, often towards the power-up item; sometimes anything."""
+    if rng.random() < 0.03: return rng.randrange(4)
+    w, h = game.width, game.height; (x, y) = snake.body[0]
+    blocked = set(getattr(game, 'obstacle_set', ()))
+    for s in others: blocked.update(s.body)
+    safe = [d for d, (dx, dy) in enumerate(_VECTORS)
+            if (snake.is_wall_ghost or (0 <= x + dx < w and 0 <= y + dy < h)) and ((x + dx) % w, (y + dy) % h) not in blocked]
+    if not safe: return rng.randrange(4)
+    if game.powerup_item and rng.random() < 0.8:
+        px, py = game.powerup_item.position
+        return min(safe, key=lambda d: abs(x + _VECTORS[d][0] - px) + abs(y + _VECTORS[d][1] - py))
+    return rng.choice(safe)
+
+def check_batch(games, two, width, height, max_ticks, seed, map_id=0, game_mode='last_snake'):
+    """Returns (ticks compared, power-up effect ticks seen, first mismatch or None)."""
+    policy = _SharedSpawnPolicy(games); saved = policy.install(); rng = random.Random(seed); ticks = effects = 0
+    try:
+        cores = []
+        for g in range(games):
+            policy.current = g
+            game = (TwoPlayerGame(width, height, map_id=map_id, game_mode=game_mode, target_score=6, seed=g) if two
+                    else Game(width, height, seed=g))
+            game.rng = policy.core_rng(g); cores.append(game)
+        kwargs = dict(map_id=map_id, game_mode=game_mode, target_score=6) if two else {}
+        batch = (BatchTwoPlayerGame if two else BatchGame)(games, width, height, **kwargs) # Foods spawned by the policy
+        batch.rng = policy.batch_rng()
+        for t in range(max_ticks + 1):
+            for g, game in enumerate(cores):
+                snakes = [game.snake1, game.snake2] if two else [game.snake]
+                a, b = _core_state(game, snakes), _batch_state(batch, g, two)
+                if a != b: return ticks, effects, (g, t, a, b)
+                effects += sum(s.active_powerup_type is not None or s.is_slowed_timer > 0 for s in snakes)
+            if batch.game_over.all() or t == max_ticks: break
+            actions = np.full((games, batch.k), NO_ACTION, dtype=np.int8)
+            for g, game in enumerate(cores):
+                snakes = [game.snake1, game.snake2] if two else [game.snake]
+                for s, snake in enumerate(snakes):
+                    if game.game_over or rng.random() >= 0.5: continue
+                    actions[g, s] = d = _steer(game, snake, snakes, rng)
+                    if two: game.change_snake_direction(s + 1, DIRECTIONS[d])
+                    else: game.change_snake_direction(DIRECTIONS[d])
+                policy.current = g; ticks += not game.game_over; game.update()
+            batch.step(actions if two else actions[:, 0])
+    finally:
+        policy.uninstall(saved)
+    return ticks, effects, None
+
+def check(games, max_ticks=400, seed=0):
+    """Every board size, map and mode; returns (ticks compared, effect ticks, first mismatch or None)."""
+    ticks = effects = 0; n = 0
+    for width, height in ((40, 30), (30, 20), (12, 10)):
+        configs = [(False, 0, 'last_snake')] + [(True, m, mode) for m in (0, 1, 2) for mode in ('last_snake', 'first_to_x')]
+        for two, map_id, mode in configs:
+            t, e, mismatch = check_batch(games, two, width, height, max_ticks, seed + n, map_id, mode); n += 1
+            ticks += t; effects += e
+            if mismatch: return ticks, effects, ((width, height, two, map_id, mode),) + mismatch
+    return ticks, effects, None
+
+def _actions(rng, ticks, games, snakes):
+    actions = rng.integers(0, 4, (ticks, games, snakes), dtype=np.int8)
+    actions[rng.random((ticks, games, snakes)) >= 0.1] = NO_ACTION
+    actions[0] = rng.integers(0, 4, (games, snakes)) # Start every snake
+    return actions
+
+def bench_core(games, two, ticks, seed=0):
+    actions = _actions(np.random.default_rng(seed), ticks, games, 2 if two else 1).tolist()
+    objs = [TwoPlayerGame(40, 30, seed=g) if two else Game(40, 30, seed=g) for g in range(games)]
+    starts = [g.snapshot() for g in objs]
+    t0 = time.perf_counter()
+    for row in actions:
+        for game, start, acts in zip(objs, starts, row):
+            if two:
+                if acts[0] >= 0: game.change_snake_direction(1, DIRECTIONS[acts[0]])
+                if acts[1] >= 0: game.change_snake_direction(2, DIRECTIONS[acts[1]])
+            elif acts[0] >= 0: game.change_snake_direction(DIRECTIONS[acts[0]])
+            game.update()
+            if game.game_over: game.restore(start)
+    return games * ticks / (time.perf_counter() - t0)
+
+def bench_batch(games, two, ticks, seed=0):
+    actions = _actions(np.random.default_rng(seed), ticks, games, 2 if two else 1)
+    batch = BatchTwoPlayerGame(games, 40, 30, seed=seed) if two else BatchGame(games, 40, 30, seed=seed)
+    t0 = time.perf_counter()
+    for acts in actions:
+        over = batch.step(acts if two else acts[:, 0])
+        if over.any(): batch.reset(over)
+    return games * ticks / (time.perf_counter() - t0)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--check', type=int, default=32, metavar='GAMES', help='games per differential batch (0 to skip)')
+    parser.add_argument('--games', type=int, nargs='+', default=[1, 64, 1024])
+    parser.add_argument('--ticks', type=int, default=200)
+    args = parser.parse_args(argv)
+    if args.check:
+        ticks, effects, mismatch = check(args.check)
+        if mismatch:
+            config, g, t, a, b = mismatch
+            print(f"MISMATCH {config} in game {g} at tick {t}\n core:  {a}\n batch: {b}"); return 1
+        print(f"differential check: {ticks} game ticks identical ({effects} snake ticks under a power-up effect)")
+    print(f"{'engine':>10} {'games':>6} {'core ticks/s':>13} {'batch ticks/s':>14} {'speedup':>8}")
+    for two in (False, True):
+        for games in args.games:
+            core = bench_core(games, two, args.ticks); batch = bench_batch(games, two, args.ticks)
+            print(f"{'two' if two else 'single':>10} {games:6d} {core:13.0f} {batch:14.0f} {batch / core:7.2f}x")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""Bitboard backend vs snake_core: differential rule check, swap check and speed comparison.
+
+The check plays random games on both backends with the spawn sampler of each replaced by the
+same deterministic policy (the backends intentionally sample free cells differently), and
+compares the complete visible and internal state after every tick. The swap check drives both
+backends with the greedy and path bots under the same policy and requires identical moves,
+Observation arrays, DeltaEncoder bytes and replay.state_fingerprint on every tick, i.e. that
+the bitboard games run unchanged through the code written against snake_core.
+
+    python -m benchmarks.bitboard [--check 300] [--swap 40] [--ticks 20000]
+"""
+import argparse
+import random
+import sys
+import time
+import timeit
+import numpy as np
+import snake_core
+import bitboard
+from bitboard import BitboardGame, BitboardTwoPlayerGame
+from snake_core import Game, TwoPlayerGame
+from benchmarks.fixtures import two_player_setup
+from bots import DIRECTION_VECTORS, OPPOSITE, greedy_bot, random_bot
+from delta import DeltaEncoder
+from observation import Observation
+from pathfinding import path_bot
+from replay import state_fingerprint
+
+DIRECTIONS = ('UP', 'DOWN', 'LEFT', 'RIGHT')
+_FIELDS = ('direction', 'grow_pending', 'score', 'is_started', 'active_powerup_type', 'powerup_effect_timer',
+           'is_wall_ghost', 'steps_per_update', 'is_slowed_timer', 'slow_effect_counter')
+
+class _SharedSpawnPolicy:
+    """Picks the same free cell on both backends: a hashed rank among free cells in row-major order."""
+    def __init__(self): self.core_calls = 0; self.bb_calls = 0
+
+    def install(self):
+        policy = self; saved = (snake_core.FreeCellIndex.sample, bitboard._BitboardBase._sample_free)
+        def core_sample(index, rng=None):
+            free = sorted(index._free)
+            if not free: return None
+            policy.core_calls += 1; c = free[(policy.core_calls * 2654435761) % len(free)]
+            return (c % index.width, c // index.width)
+        def bb_sample(game, extra=0):
+            free = game.board & ~(game._occupied() | extra)
+            n = free.bit_count()
+            if not n: return None
+            policy.bb_calls += 1
+            return bitboard.select_bit(free, (policy.bb_calls * 2654435761) % n)
+        snake_core.FreeCellIndex.sample = core_sample; bitboard._BitboardBase._sample_free = bb_sample
+        return saved
+
+    @staticmethod
+    def uninstall(saved):
+        snake_core.FreeCellIndex.sample, bitboard._BitboardBase._sample_free = saved
+
+def _state(game, bb):
+    snakes = game._snakes if bb else ([game.snake] if isinstance(game, Game) else [game.snake1, game.snake2])
+    bodies = [list(s.body) for s in snakes]
+    pu = game.powerup_item
+    return (game.tick, game.game_over, getattr(game, 'winner', None), game.get_foods(), bodies,
+            (pu.type_id, pu.position) if pu else None, game.powerup_on_map_lifespan_timer,
+            [tuple(getattr(s, f) for f in _FIELDS) + (tuple(s.input_queue),) for s in snakes])
+
+def _single_bot(game, rng):
+    s = game.snake; x, y = s.body[0]; w, h = game.width, game.height
+    safe = [d for d, (dx, dy) in DIRECTION_VECTORS.items() if d != OPPOSITE[s.direction] or not s.is_started
+            if s.is_wall_ghost or (0 <= x + dx < w and 0 <= y + dy < h)
+            if ((x + dx) % w, (y + dy) % h) not in s._segment_counts]
+    if s.is_started and s.direction in safe and rng.random() >= 0.1: return s.direction
+    return rng.choice(safe) if safe else s.direction
+
+def check(games, max_ticks=600, seed=0):
+    """Returns (games, ticks, first mismatch or None)."""
+    policy = _SharedSpawnPolicy(); saved = policy.install(); ticks = 0
+    try:
+        for g in range(games):
+            rng = random.Random(seed + g); two = g % 3 != 0
+            w, h = rng.choice([(40, 30), (30, 20), (24, 24)])
+            if two:
+                mode = rng.choice(['last_snake', 'first_to_x'])
+                core = TwoPlayerGame(w, h, map_id=g % 3, game_mode=mode, target_score=5, seed=g)
+                bb = BitboardTwoPlayerGame(w, h, map_id=g % 3, game_mode=mode, target_score=5, seed=g)
+            else:
+                core = Game(w, h, seed=g); bb = BitboardGame(w, h, seed=g)
+            max_food = rng.choice([5, 30])
+            for game in (core, bb): game.powerup_spawn_chance = 0.8; game.MAX_FOOD_ITEMS = max_food; game._generate_food()
+            if _state(core, False) != _state(bb, True): return g + 1, ticks, (g, 0, _state(core, False), _state(bb, True))
+            for t in range(max_ticks):
+                if core.game_over: break
+                buffered = g % 4 == 0 # Every other noise game goes through the input buffers, a few presses per tick
+                if g % 2: # Mostly-surviving bots for long games; pure noise for the other half
+                    moves = [(sid, random_bot(core, sid, rng)) for sid in (1, 2)] if two else [(None, _single_bot(core, rng))]
+                else:
+                    moves = [(sid, rng.choice(DIRECTIONS)) for sid in ((1, 2) if two else (None,))
+                             for _ in range(3 if buffered else 1) if rng.random() < 0.2]
+                for sid, d in moves:
+                    for game in (core, bb):
+                        send = game.queue_turn if buffered else game.change_snake_direction
+                        if two: send(sid, d)
+                        else: send(d)
+                core.update(); bb.update(); ticks += 1
+                a, b = _state(core, False), _state(bb, True)
+                if a != b: return g + 1, ticks, (g, t, a, b)
+    finally:
+        policy.uninstall(saved)
+    return games, ticks, None
+
+def swap_check(games, max_ticks=400, seed=0):
+    """Bots, observations, delta encoding and fingerprints on both backends; returns (games, ticks, first mismatch or None)."""
+    policy = _SharedSpawnPolicy(); saved = policy.install(); ticks = 0
+    try:
+        for g in range(games):
+            two = g % 4 != 0; w, h = ((40, 30), (30, 20), (24, 24))[g % 3]
+            if two:
+                mode = ('last_snake', 'first_to_x')[g % 2]
+                pair = [cls(w, h, map_id=g % 3, game_mode=mode, target_score=8, seed=g) for cls in (TwoPlayerGame, BitboardTwoPlayerGame)]
+                bots = [(1, (greedy_bot, path_bot)[g % 2]), (2, (path_bot, greedy_bot)[g % 2])]
+            else:
+                pair = [cls(w, h, seed=g) for cls in (Game, BitboardGame)]; bots = [(1, path_bot)]
+            views = [[Observation(game, sid, np.uint8) for sid, _ in bots] for game in pair]
+            encoders = [DeltaEncoder(game) for game in pair]; rngs = [random.Random(g), random.Random(g)]
+            for t in range(max_ticks):
+                got = []
+                for game, obs, enc, rng in zip(pair, views, encoders, rngs):
+                    arrays = [o.update() for o in obs]
+                    moves = [bot(game, sid, rng) for sid, bot in bots]
+                    for (sid, _), d in zip(bots, moves): game.change_snake_direction(*((sid, d) if two else (d,)))
+                    game.update()
+                    got.append((moves, [(grid.tobytes(), timers.tobytes()) for grid, timers in arrays], enc.encode(),
+                                state_fingerprint(game), _state(game, game is pair[1])))
+                ticks += 1
+                if got[0] != got[1]:
+                    part = next(i for i, (a, b) in enumerate(zip(*got)) if a != b)
+                    name = ('bot moves', 'observations', 'delta stream', 'state fingerprint', 'state')[part]
+                    return g + 1, ticks, (g, t, name, got[0][part] if part != 1 else '...', got[1][part] if part != 1 else '...')
+                if pair[0].game_over: break
+    finally:
+        policy.uninstall(saved)
+    return games, ticks, None
+
+def _tick_rate(game, steer_snakes, driver, ticks):
+    start = game.snapshot(); best = float('inf')
+    for _ in range(3):
+        elapsed = 0.0; done = 0
+        while done < ticks:
+            game.restore(start); n = min(200, ticks - done)
+            t0 = time.perf_counter()
+            for _ in range(n):
+                for s in steer_snakes(game): s.direction = driver(s)
+                game.update()
+            elapsed += time.perf_counter() - t0; done += n
+            if game.game_over: raise RuntimeError("benchmark snakes collided")
+        best = min(best, elapsed)
+    return ticks / best
+
+def bitboard_twin(core):
+    """A BitboardTwoPlayerGame holding the same position as `core` (bodies, foods, scores)."""
+    bb = BitboardTwoPlayerGame(core.width, core.height, map_id=core.map_id, seed=core.seed)
+    bb.powerup_spawn_chance = core.powerup_spawn_chance; bb.MAX_FOOD_ITEMS = core.MAX_FOOD_ITEMS
+    for src, dst in ((core.snake1, bb.snake1), (core.snake2, bb.snake2)):
+        bb._place(dst, bb._index(src.body[-1]))
+        for pos in list(src.body)[-2::-1]: bb._push_head(dst, bb._index(pos))
+        for f in _FIELDS: setattr(dst, f, getattr(src, f))
+    bb.foods = list(core.foods); bb.food_bits = 0
+    for p in bb.foods: bb.food_bits |= bb.BIT[bb._index(p)]
+    return bb
+
+def bench(ticks):
+    print(f"{'position':24s} {'core':>10} {'bitboard':>10}  ticks/s        {'core':>8} {'bitboard':>8}  clone us")
+    for length in (3, 100, 300):
+        core, driver = two_player_setup(40, 30, length, 5, map_id=1)
+        bb = bitboard_twin(core)
+        next_direction = driver.next_direction
+        core_rate = _tick_rate(core, lambda g: (g.snake1, g.snake2), lambda s: next_direction[s.body[0]], ticks)
+        bb_rate = _tick_rate(bb, lambda g: (g.snake1, g.snake2), lambda s: next_direction[s.body[0]], ticks)
+        core_clone = min(timeit.repeat(core.clone, number=500, repeat=3)) / 500 * 1e6
+        bb_clone = min(timeit.repeat(bb.clone, number=500, repeat=3)) / 500 * 1e6
+        print(f"{f'two-player len={length}':24s} {core_rate:10.0f} {bb_rate:10.0f}  ({bb_rate / core_rate:4.2f}x)  "
+              f"{core_clone:8.1f} {bb_clone:8.1f}  ({core_clone / bb_clone:4.2f}x)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--check', type=int, default=300, metavar='GAMES', help='differential games to play (0 to skip)')
+    parser.add_argument('--swap', type=int, default=40, metavar='GAMES', help='swap-check games to play (0 to skip)')
+    parser.add_argument('--ticks', type=int, default=20000)
+    args = parser.parse_args(argv)
+    if args.check:
+        games, ticks, mismatch = check(args.check)
+        if mismatch:
+            g, t, a, b = mismatch
+            print(f"MISMATCH in game {g} at tick {t}\n core:     {a}\n bitboard: {b}"); return 1
+        print(f"differential check: {games} games, {ticks} ticks identical")
+    if args.swap:
+        games, ticks, mismatch = swap_check(args.swap)
+        if mismatch:
+            g, t, name, a, b = mismatch
+            print(f"SWAP MISMATCH ({name}) in game {g} at tick {t}\n core:     {a}\n bitboard: {b}"); return 1
+        print(f"swap check: greedy/path bots, Observation, DeltaEncoder and fingerprints agree over {games} games, {ticks} ticks")
+    bench(args.ticks)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
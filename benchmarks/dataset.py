@@ -0,0 +1,75 @@
+"""Self-play recording throughput: dataset.generate() per worker count vs pickling per-game lists, and reads.
+
+Every run plays the same greedy vs random TwoPlayerGame schedule. 'pickle' keeps, per game, the
+list of both bodies, scores and actions of every tick and pickles it to one file per game;
+'pickle+obs' also keeps both players' uint8 observation grids; 'dataset' writes packed observation
+rows. Reads sample random batches from the written dataset and unpack their observations.
+
+    python -m benchmarks.dataset [--games 4] [--workers 1 2 4] [--max-ticks 1000] [--batch 256]
+"""
+import argparse
+import os
+import pickle
+import random
+import sys
+import tempfile
+import time
+import numpy as np
+import dataset
+from observation import Observation
+from tournament import schedule
+
+def _size(path):
+    return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+
+def bench_pickle(path, specs, observations=False):
+    ticks = 0; t0 = time.perf_counter()
+    for spec in specs:
+        game, policies = dataset._new_game(spec, False)
+        rngs = [random.Random(spec[6] + p) for p in (1, 2)]; steps = []
+        views = [Observation(game, p, np.uint8) for p in (1, 2)] if observations else []
+        while not game.game_over and game.tick < spec[7]:
+            grids = [v.update()[0].copy() for v in views]
+            actions = [policy(game, p, rng) for policy, p, rng in zip(policies, (1, 2), rngs)]
+            for p, d in zip((1, 2), actions): game.change_snake_direction(p, d)
+            game.update()
+            steps.append((list(game.get_snake1_body()), list(game.get_snake2_body()), game.get_scores(), actions, grids))
+        with open(os.path.join(path, f'{spec[0]}.pkl'), 'wb') as f: pickle.dump(steps, f)
+        ticks += len(steps)
+    return ticks, time.perf_counter() - t0
+
+def bench_read(path, batch, batches, seed=0):
+    data = dataset.TrajectoryDataset(path); rng = np.random.default_rng(seed)
+    t0 = time.perf_counter()
+    for _ in range(batches):
+        rows = data.sample(rng.integers(0, len(data), batch)); dataset.unpack_observations(rows['obs'])
+    return batch * batches / (time.perf_counter() - t0)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=4, help='games per bot pairing, map and mode (x24 in total)')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--max-ticks', type=int, default=1000)
+    parser.add_argument('--batch', type=int, default=256)
+    parser.add_argument('--batches', type=int, default=200)
+    args = parser.parse_args(argv)
+    specs = schedule(['greedy', 'random'], args.games, max_ticks=args.max_ticks)
+    print(f"{len(specs)} games, {os.cpu_count()} CPUs")
+    print(f"{'writer':>12} {'ticks/s':>9} {'MiB/s':>7} {'bytes/tick':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for observations, name in ((False, 'pickle'), (True, 'pickle+obs')):
+            path = os.path.join(tmp, name); os.makedirs(path)
+            ticks, elapsed = bench_pickle(path, specs, observations)
+            print(f"{name:>12} {ticks / elapsed:9.0f} {_size(path) / elapsed / 2**20:7.1f} {_size(path) / ticks:11.0f}")
+        for workers in args.workers:
+            path = os.path.join(tmp, f'dataset{workers}')
+            t0 = time.perf_counter()
+            _, ticks, _ = dataset.generate(path, specs, workers=workers, chunk=max(1, len(specs) // (4 * workers)))
+            elapsed = time.perf_counter() - t0
+            print(f"{f'dataset x{workers}':>12} {ticks / elapsed:9.0f} {_size(path) / elapsed / 2**20:7.1f} {_size(path) / ticks:11.0f}")
+        rate = bench_read(path, args.batch, args.batches)
+        print(f"random reads: {rate:.0f} rows/s in batches of {args.batch} (sample + unpack_observations)")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""Bytes and CPU per tick of the delta stream (delta.py) against full-state JSON.
+
+Plays bot-vs-bot TwoPlayerGame matches; every tick is sent both as the delta stream and as a JSON
+object built from the public getters, and (with --verify) the decoded state is checked against
+the game after every message.
+
+    python -m benchmarks.delta_stream [--matches 20] [--keyframe-interval 60] [--verify]
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from snake_core import MAP_DEFINITIONS, TwoPlayerGame
+from bots import BOTS
+from delta import DeltaDecoder, DeltaEncoder, view_of
+
+def full_state_json(game):
+    return json.dumps({'tick': game.tick, 'snake1': list(game.get_snake1_body()), 'snake2': list(game.get_snake2_body()),
+                       'foods': game.get_foods(), 'obstacles': game.get_obstacles(),
+                       'powerup': game.get_powerup_item_details(), 'scores': game.get_scores(),
+                       'game_over': game.is_game_over(), 'winner': game.get_winner()}).encode()
+
+def run(matches, keyframe_interval, verify, max_ticks=3000, seed=0):
+    totals = {'ticks': 0, 'delta_bytes': 0, 'keyframe_bytes': 0, 'keyframes': 0, 'json_bytes': 0,
+              'delta_s': 0.0, 'decode_s': 0.0, 'json_s': 0.0}
+    maps = sorted(MAP_DEFINITIONS)
+    for m in range(matches):
+        game = TwoPlayerGame(40, 30, map_id=maps[m % len(maps)], seed=seed + m)
+        rng = random.Random(seed + m); bot = BOTS['greedy']
+        encoder = DeltaEncoder(game, keyframe_interval); decoder = DeltaDecoder()
+        while not game.game_over and game.tick < max_ticks:
+            game.change_snake_direction(1, bot(game, 1, rng)); game.change_snake_direction(2, bot(game, 2, rng))
+            game.update()
+            t0 = time.perf_counter(); msg = encoder.encode()
+            t1 = time.perf_counter(); view = decoder.apply(msg)
+            t2 = time.perf_counter(); js = full_state_json(game)
+            t3 = time.perf_counter()
+            totals['delta_s'] += t1 - t0; totals['decode_s'] += t2 - t1; totals['json_s'] += t3 - t2
+            totals['ticks'] += 1; totals['json_bytes'] += len(js)
+            if msg[0] == ord('K'): totals['keyframes'] += 1; totals['keyframe_bytes'] += len(msg)
+            else: totals['delta_bytes'] += len(msg)
+            if verify and view.as_tuple() != view_of(game).as_tuple():
+                raise AssertionError(f"decoded state differs from the game at match {m} tick {game.tick}")
+    return totals
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--matches', type=int, default=20)
+    parser.add_argument('--keyframe-interval', type=int, default=60)
+    parser.add_argument('--verify', action='store_true')
+    args = parser.parse_args(argv)
+
+    t = run(args.matches, args.keyframe_interval, args.verify)
+    n = t['ticks']; deltas = n - t['keyframes']
+    stream = t['delta_bytes'] + t['keyframe_bytes']
+    print(f"{n} ticks over {args.matches} matches{' (verified)' if args.verify else ''}")
+    print(f"full-state JSON  {t['json_bytes'] / n:8.1f} B/tick  {t['json_s'] / n * 1e6:7.1f} us/tick")
+    print(f"delta stream     {stream / n:8.1f} B/tick  {t['delta_s'] / n * 1e6:7.1f} us/tick encode, "
+          f"{t['decode_s'] / n * 1e6:.1f} us/tick decode  ({t['json_bytes'] / stream:.0f}x smaller)")
+    print(f"  deltas {t['delta_bytes'] / max(deltas, 1):.1f} B avg, keyframes {t['keyframe_bytes'] / max(t['keyframes'], 1):.1f} B avg "
+          f"every {args.keyframe_interval} messages")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
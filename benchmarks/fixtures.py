@@ -0,0 +1,77 @@
+"""Board setups shared by the benchmarks: long snakes that can keep moving without dying."""
+from snake_core import Game, TwoPlayerGame
+
+_DIRECTION_OF = {(0, -1): 'UP', (0, 1): 'DOWN', (-1, 0): 'LEFT', (1, 0): 'RIGHT'}
+
+def hamiltonian_cycle(x0, y0, w, h):
+    """Cells of a closed walk visiting every cell of the w x h rectangle at (x0, y0) once. h must be even."""
+    if h % 2 or w < 2: raise ValueError("need an even height and a width of at least 2")
+    cells = [(x0 + x, y0) for x in range(w)] # Row 0 left to right
+    for r in range(1, h): # Serpentine over columns 1..w-1, odd rows right to left
+        xs = range(w - 1, 0, -1) if r % 2 else range(1, w)
+        cells.extend((x0 + x, y0 + r) for x in xs)
+    cells.extend((x0, y0 + r) for r in range(h - 1, 0, -1)) # Back up column 0
+    return cells
+
+def obstacle_free_band(game):
+    """(y0, rows) of the tallest even-height band of full rows without obstacles."""
+    blocked = {y for _, y in getattr(game, 'obstacles', [])}
+    best = (0, 0); start = None
+    for y in range(game.height + 1):
+        if y < game.height and y not in blocked:
+            if start is None: start = y
+            continue
+        if start is not None and y - start > best[1]: best = (start, y - start)
+        start = None
+    y0, rows = best
+    return y0, rows - rows % 2
+
+class CycleDriver:
+    """Steers snakes along a Hamiltonian cycle so they never collide."""
+    def __init__(self, cycle):
+        self.cycle = cycle
+        self.next_direction = {}
+        for i, (x, y) in enumerate(cycle):
+            nx, ny = cycle[(i + 1) % len(cycle)]
+            self.next_direction[(x, y)] = _DIRECTION_OF[(nx - x, ny - y)]
+
+    def place(self, game, snake, head_index, length):
+        """Re-lay `snake` along the cycle with its head at cycle[head_index], keeping the free-cell index in sync."""
+        for pos in snake.get_body(): game._free_cells.release(pos)
+        n = len(self.cycle)
+        tail = self.cycle[(head_index - length + 1) % n]
+        snake.reset_body(tail); game._free_cells.occupy(tail)
+        for _ in range(length - 1):
+            snake.direction = self.next_direction[snake.get_head_position()]
+            snake.grow_pending = True; snake.move()
+        snake.grow_pending = False; snake.is_started = True
+        snake.direction = self.next_direction[snake.get_head_position()]
+
+    def steer(self, snake):
+        snake.direction = self.next_direction[snake.get_head_position()]
+
+def single_player_setup(width, height, length, foods, seed=0):
+    game = Game(width, height, seed=seed)
+    game.powerup_spawn_chance = 0 # speed_self double steps would leave the cycle
+    driver = CycleDriver(hamiltonian_cycle(0, 0, width, height - height % 2))
+    driver.place(game, game.snake, length - 1, length)
+    game.MAX_FOOD_ITEMS = foods; game._generate_food()
+    return game, driver
+
+def two_player_setup(width, height, length, foods, map_id=0, seed=0):
+    game = TwoPlayerGame(width, height, map_id=map_id, seed=seed)
+    game.powerup_spawn_chance = 0
+    y0, rows = obstacle_free_band(game)
+    driver = CycleDriver(hamiltonian_cycle(0, y0, width, rows))
+    gap = (len(driver.cycle) - 2 * length) // 2
+    if gap < 20: raise ValueError(f"snakes of length {length} do not fit on the obstacle-free band")
+    driver.place(game, game.snake1, length - 1, length)
+    driver.place(game, game.snake2, 2 * length - 1 + gap, length)
+    game.MAX_FOOD_ITEMS = foods; game._generate_food()
+    return game, driver
+
+def game_with_snake_length(width, height, length, seed=0):
+    """A TwoPlayerGame whose snake1 is `length` segments long (it may overlap snake2; only for copy/fork costs)."""
+    game = TwoPlayerGame(width, height, seed=seed)
+    CycleDriver(hamiltonian_cycle(0, 0, width, height - height % 2)).place(game, game.snake1, length - 1, length)
+    return game
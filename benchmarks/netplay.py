@@ -0,0 +1,55 @@
+"""Rollback netcode over loopback: two netplay.py processes per latency/jitter setting.
+
+Player 1 listens on a free port and player 2 connects; both steer with --bot and add the
+given one-way latency and jitter to what they send. Reports rollbacks per 100 ticks, rollback
+depth, re-simulation cost and stalls (player 1's view), and fails when the peers' settled states
+differ or a fingerprint check caught a desync. Greedy bots (the default) play long enough to reach power-ups.
+
+    python -m benchmarks.netplay [--settings 0/0 20/5 50/20 100/40] [--ticks 300] [--tick-rate 60] [--max-rollback 8]
+                                 [--bot greedy] [--seed 0]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def match(latency_ms, jitter_ms, ticks, tick_rate, max_rollback, bot='greedy', seed=0):
+    common = ['--bot', bot, '--tick-rate', str(tick_rate), '--latency-ms', str(latency_ms), '--jitter-ms', str(jitter_ms),
+              '--max-rollback', str(max_rollback)]
+    run = lambda *args: subprocess.Popen([sys.executable, 'netplay.py', *args, *common], cwd=REPO_ROOT,
+                                         stdout=subprocess.PIPE, text=True)
+    p1 = run('--player', '1', '--port', '0', '--ticks', str(ticks), '--seed', str(seed))
+    port = json.loads(p1.stdout.readline())['listening']
+    p2 = run('--player', '2', '--port', str(port))
+    reports = [json.loads(p.communicate(timeout=ticks / tick_rate * 10 + 30)[0].splitlines()[-1]) for p in (p1, p2)]
+    return reports
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--settings', nargs='+', default=['0/0', '20/5', '50/20', '100/40'], help='latency/jitter in ms')
+    parser.add_argument('--ticks', type=int, default=300)
+    parser.add_argument('--tick-rate', type=float, default=60)
+    parser.add_argument('--max-rollback', type=int, default=8)
+    parser.add_argument('--bot', default='greedy')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    print(f"{'lat/jit ms':>10} {'ticks':>5} {'rb/100t':>7} {'depth mean':>10} {'p99':>4} {'max':>4} "
+          f"{'resim us':>9} {'p99 us':>8} {'stalls':>6} {'checks':>6}  result")
+    failed = False
+    for setting in args.settings:
+        latency, jitter = map(float, setting.split('/'))
+        r1, r2 = match(latency, jitter, args.ticks, args.tick_rate, args.max_rollback, args.bot, args.seed)
+        same = r1['fingerprint'] == r2['fingerprint'] # Settled counts can differ: each stops once it sees the game over
+        ok = same and not r1['desyncs'] and not r2['desyncs']; failed |= not ok
+        depth = r1['rollback_depth']; resim = r1['resimulation']
+        mean_us = resim['sum_ns'] / resim['count'] / 1e3 if resim['count'] else 0
+        print(f"{setting:>10} {r1['settled']:5d} {100 * r1['rollbacks'] / max(r1['settled'], 1):7.1f} {depth['mean']:10.2f} "
+              f"{depth['p99']:4d} {depth['max']:4d} {mean_us:9.1f} {(resim['p99_ns'] or 0) / 1e3:8.1f} {r1['stalls']:6d} "
+              f"{r1['checks']:6d}  {'ok' if ok else 'DESYNC'} ({r1['winner']}, {r1['scores']})")
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
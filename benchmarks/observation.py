@@ -0,0 +1,48 @@
+"""Feature-extraction cost per tick: observation.encode() from scratch vs the incremental Observation.
+
+Two snakes of the given length follow the fixtures' Hamiltonian cycle on a 40x30 board with
+foods (so heads, tails and foods all change); only the observation call is timed.
+
+    python -m benchmarks.observation [--lengths 3 100 300] [--ticks 4000] [--batch 64]
+"""
+import argparse
+import sys
+import time
+from benchmarks.fixtures import two_player_setup
+from observation import ObservationBatch, encode
+
+def measure(length, ticks, incremental, batch=1):
+    setups = [two_player_setup(40, 30, length, 5, map_id=1, seed=i) for i in range(batch)]
+    games = [g for g, _ in setups]; steer = setups[0][1].steer
+    starts = [g.snapshot() for g in games]
+    obs = ObservationBatch(games) if incremental else None
+    elapsed = 0.0; done = 0
+    while done < ticks:
+        for g, s in zip(games, starts): g.restore(s) # Rewind before the snakes fill the board
+        if obs: obs.update() # The restore forces one rebuild; keep it out of the timing
+        for _ in range(min(200, ticks - done)):
+            for g in games:
+                steer(g.snake1); steer(g.snake2); g.update()
+            t0 = time.perf_counter()
+            if obs: obs.update()
+            else: [encode(g) for g in games]
+            elapsed += time.perf_counter() - t0; done += 1
+    if any(g.game_over for g in games): raise RuntimeError("benchmark snakes collided")
+    return elapsed / ticks / batch * 1e6
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lengths', type=int, nargs='+', default=[3, 100, 300])
+    parser.add_argument('--ticks', type=int, default=4000)
+    parser.add_argument('--batch', type=int, default=64)
+    args = parser.parse_args(argv)
+    print(f"{'length':>6} {'batch':>5} {'encode us':>10} {'incremental us':>15} {'speedup':>8}  (per game per tick)")
+    for batch in (1, args.batch):
+        for length in args.lengths:
+            ticks = max(200, args.ticks // batch)
+            full = measure(length, ticks, False, batch); inc = measure(length, ticks, True, batch)
+            print(f"{length:6d} {batch:5d} {full:10.1f} {inc:15.1f} {full / inc:7.1f}x")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""Decision cost of PathBot with the cached, incrementally repaired field vs a BFS rebuild every tick.
+
+The check first plays randomised single and two-player games with restores to earlier snapshots,
+map switches and skipped ticks, and after every decision compares the field of an unbudgeted
+incremental bot, and of a bot whose repairs keep running over a small budget whenever it has caught
+up, with a field built from scratch. Then a single-player PathBot plays for --ticks ticks on each
+board size (a new game whenever it dies); only choose() is timed. 'over' counts calls that hit the
+budget, 'stale' those decided on a field whose repair was still carried over.
+
+    python -m benchmarks.pathfinding [--check 60] [--sizes 20x20 40x30 80x60 160x120] [--ticks 2000] [--budget-ms 1]
+"""
+import argparse
+import random
+import sys
+import time
+from bots import random_bot
+from metrics import Histogram
+from pathfinding import PathBot
+from snake_core import Game, TwoPlayerGame
+
+def _fresh_field(game):
+    bot = PathBot(budget_ms=None); bot._sync(game, None)
+    return bot.field
+
+def _field_mismatch(bot, game):
+    """None if bot's field equals one built from scratch for the game, else what differs."""
+    ref = _fresh_field(game); field = bot.field
+    for part in ('blocked', 'sources', 'dist'):
+        if getattr(field, part) != getattr(ref, part): return part
+    return None
+
+def check(games, max_ticks=500, seed=0):
+    """Returns (ticks compared, caught-up budgeted fields compared, first mismatch or None)."""
+    ticks = caught_up = 0
+    for g in range(games):
+        rng = random.Random(seed + g); two = g % 2 == 1
+        w, h = ((40, 30), (30, 20), (16, 12), (60, 45))[g % 4]
+        game = TwoPlayerGame(w, h, map_id=g % 3, seed=g) if two else Game(w, h, seed=g)
+        game.MAX_FOOD_ITEMS = max(3, w * h // 300)
+        exact = PathBot(1, budget_ms=None); budgeted = PathBot(1, budget_ms=0.1); snapshots = []
+        for t in range(max_ticks):
+            if game.game_over: break
+            roll = rng.random()
+            if snapshots and roll < 0.01: game.restore(rng.choice(snapshots))
+            elif two and roll < 0.015: game.set_map(rng.randrange(3))
+            elif roll < 0.04:
+                for _ in range(rng.randint(1, 3)): game.update() # Ticks the bots do not see
+                if game.game_over: break
+            if rng.random() < 0.05: snapshots.append(game.snapshot())
+            d = exact.choose(game); budgeted.choose(game); ticks += 1
+            part = _field_mismatch(exact, game)
+            if part: return ticks, caught_up, (g, t, 'incremental', part)
+            if budgeted._job is None:
+                caught_up += 1; part = _field_mismatch(budgeted, game)
+                if part: return ticks, caught_up, (g, t, 'budgeted', part)
+            if rng.random() < 0.1: d = random_bot(game, 1, rng) if two else rng.choice(('UP', 'DOWN', 'LEFT', 'RIGHT'))
+            if two: game.change_snake_direction(1, d); game.change_snake_direction(2, random_bot(game, 2, rng))
+            else: game.change_snake_direction(d)
+            game.update()
+    return ticks, caught_up, None
+
+def measure(width, height, ticks, incremental, budget_ms, seed=0):
+    hist = Histogram(); games = 0; scores = []; overruns = stale = 0
+    game = None
+    for _ in range(ticks):
+        if game is None or game.game_over:
+            if game: scores.append(game.get_score()); overruns += bot.overruns; stale += bot.stale
+            game = Game(width, height, seed=seed + games); game.MAX_FOOD_ITEMS = max(5, width * height // 400)
+            bot = PathBot(1, budget_ms=budget_ms, incremental=incremental); games += 1
+        t0 = time.perf_counter_ns()
+        game.change_snake_direction(bot.choose(game))
+        hist.record(time.perf_counter_ns() - t0)
+        game.update()
+    scores.append(game.get_score()); overruns += bot.overruns; stale += bot.stale
+    return hist.summary(), games, sum(scores) / len(scores), overruns, stale
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--check', type=int, default=60, metavar='GAMES', help='randomised field check games (0 to skip)')
+    parser.add_argument('--sizes', nargs='+', default=['20x20', '40x30', '80x60', '160x120'])
+    parser.add_argument('--ticks', type=int, default=2000)
+    parser.add_argument('--budget-ms', type=float, default=1.0)
+    args = parser.parse_args(argv)
+    if args.check:
+        ticks, caught_up, mismatch = check(args.check)
+        if mismatch:
+            g, t, bot, part = mismatch
+            print(f"MISMATCH in game {g} at tick {t}: the {bot} field's {part} differs from a fresh build"); return 1
+        print(f"field check: {ticks} ticks, incremental fields identical to fresh builds "
+              f"({caught_up} budgeted fields compared after catching up)")
+    print(f"{'board':>8} {'field':>12} {'mean us':>8} {'p50 us':>8} {'p99 us':>8} {'over':>5} {'stale':>5} {'games':>5} {'score':>6}")
+    for size in args.sizes:
+        width, height = map(int, size.split('x'))
+        for incremental in (False, True):
+            s, games, score, overruns, stale = measure(width, height, args.ticks, incremental, args.budget_ms)
+            print(f"{size:>8} {'incremental' if incremental else 'rebuild':>12} {s['sum_ns'] / s['count'] / 1e3:8.1f} "
+                  f"{s['p50_ns'] / 1e3:8.1f} {s['p99_ns'] / 1e3:8.1f} {overruns:5d} {stale:5d} {games:5d} {score:6.1f}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,54 @@
+"""Frame cost of the three board renderers as the board grows: one rect per cell, dirty rectangles, NumPy bulk.
+
+The window stays 800x600; bigger boards use smaller cells (main.GRID_SIZE and the grid size are set
+for each run). Two snakes on map 1 follow the fixtures' cycle, together covering --fill of the
+obstacle-free band, with one food per 200 cells; a frame is one tick plus drawing it.
+
+    python -m benchmarks.render [--cells 20 8 4 2] [--frames 100] [--fill 0.5]
+"""
+import argparse
+import os
+import sys
+from benchmarks.fixtures import hamiltonian_cycle, obstacle_free_band
+from benchmarks.suite import _best_of, _frame_runner
+from snake_core import TwoPlayerGame
+
+MODES = ('full', 'dirty', 'bulk') # 'full' is the per-rect path: grid, obstacles and every cell drawn each frame
+
+def measure(ctx, cell, frames, fill, repeat=3):
+    import main
+    main.GRID_SIZE = cell; main.GRID_WIDTH = main.SCREEN_WIDTH // cell; main.GRID_HEIGHT = main.SCREEN_HEIGHT // cell
+    ctx.backgrounds.clear() # Cached per obstacle layout, not per cell size
+    width, height = main.GRID_WIDTH, main.GRID_HEIGHT
+    _, rows = obstacle_free_band(TwoPlayerGame(width, height, map_id=1))
+    length = max(3, int(len(hamiltonian_cycle(0, 0, width, rows)) * fill / 2))
+    times = {}
+    for mode in MODES:
+        frame = _frame_runner(ctx, mode, True, map_id=1, length=length, foods=max(5, width * height // 200))
+        for _ in range(5): frame() # Warm caches (background, text surfaces, palette)
+        def run():
+            for _ in range(frames): frame()
+        times[mode] = _best_of(run, repeat) / frames * 1e3
+    return width, height, length, times
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cells', type=int, nargs='+', default=[20, 8, 4, 2], help='cell sizes in pixels')
+    parser.add_argument('--frames', type=int, default=100)
+    parser.add_argument('--fill', type=float, default=0.5)
+    args = parser.parse_args(argv)
+    os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+    import main as frontend
+    ctx = frontend.RenderContext(headless=True); ctx.init()
+    print(f"{'board':>8} {'length':>6} " + ' '.join(f'{m + " ms":>9}' for m in MODES) + f" {'bulk vs full':>13}")
+    try:
+        for cell in args.cells:
+            width, height, length, t = measure(ctx, cell, args.frames, args.fill)
+            print(f"{f'{width}x{height}':>8} {length:6d} " + ' '.join(f'{t[m]:9.2f}' for m in MODES)
+                  + f" {t['full'] / t['bulk']:12.1f}x")
+    finally:
+        ctx.close()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
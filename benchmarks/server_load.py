@@ -0,0 +1,126 @@
+"""Load test for server.py: tick jitter and input-to-broadcast latency as the number of rooms grows.
+
+Starts the server in a child process, then for each room count connects two simulated clients per
+room. Every client turns at random every few ticks, tagging the input with a sequence number; the
+latency of an input is the time from sending it until the first broadcast that acknowledges it.
+Tick jitter (scheduled vs actual tick start) and per-tick work come from the server's stats op.
+
+    python -m benchmarks.server_load [--rooms 10 50 100 200] [--duration 5] [--tick-rate 20] [--json out.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from metrics import Histogram
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIRECTIONS = ('UP', 'DOWN', 'LEFT', 'RIGHT')
+
+class SimulatedClient:
+    def __init__(self, host, port, room, latency, rng, input_every):
+        self.host = host; self.port = port; self.room = room
+        self.latency = latency; self.rng = rng; self.input_every = input_every
+        self.sent = {} # seq -> send time
+        self.seq = 0; self.snake = None; self.states = 0
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self._send({'op': 'join', 'room': self.room})
+        msg = json.loads(await self.reader.readline())
+        if msg.get('t') != 'joined': raise RuntimeError(f"join failed: {msg}")
+        self.snake = msg['snake']
+
+    def _send(self, msg):
+        self.writer.write((json.dumps(msg, separators=(',', ':')) + '\n').encode())
+
+    async def run(self):
+        try:
+            while True:
+                line = await self.reader.readline()
+                if not line: return
+                msg = json.loads(line)
+                if msg.get('t') != 's': continue
+                now = time.perf_counter()
+                ack = msg['a'][self.snake - 1]
+                for seq in [s for s in self.sent if s <= ack]:
+                    self.latency.record(int((now - self.sent.pop(seq)) * 1e9))
+                self.states += 1
+                if self.states % self.input_every == 0:
+                    self.seq += 1; self.sent[self.seq] = time.perf_counter()
+                    self._send({'op': 'dir', 'd': self.rng.choice(DIRECTIONS), 'seq': self.seq})
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+
+    def close(self): self.writer.close()
+
+async def _request_stats(host, port, reset):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write((json.dumps({'op': 'stats', 'reset': reset}) + '\n').encode())
+    msg = json.loads(await reader.readline())
+    writer.close()
+    return msg
+
+async def measure_level(host, port, rooms, duration, input_every, seed):
+    latency = Histogram(); rng = random.Random(seed)
+    clients = [SimulatedClient(host, port, f'load{rooms}-{i}', latency, random.Random(rng.getrandbits(64)), input_every)
+               for i in range(rooms) for _ in range(2)]
+    for c in clients: await c.connect()
+    tasks = [asyncio.create_task(c.run()) for c in clients]
+    await asyncio.sleep(0.5) # Let every room start ticking
+    await _request_stats(host, port, reset=True); latency.reset()
+    t0 = time.perf_counter()
+    await asyncio.sleep(duration)
+    stats = await _request_stats(host, port, reset=False)
+    elapsed = time.perf_counter() - t0
+    for c in clients: c.close()
+    for t in tasks: t.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    ms = lambda ns: None if ns is None else ns / 1e6
+    return {'rooms': rooms, 'ticks_per_s': stats['ticks'] / elapsed,
+            'jitter_p50_ms': ms(stats['jitter']['p50_ns']), 'jitter_p99_ms': ms(stats['jitter']['p99_ns']),
+            'jitter_max_ms': ms(stats['jitter']['max_ns']), 'tick_work_p99_ms': ms(stats['work']['p99_ns']),
+            'inputs': latency.count, 'latency_p50_ms': ms(latency.percentile(50)),
+            'latency_p99_ms': ms(latency.percentile(99))}
+
+def start_server(tick_rate):
+    proc = subprocess.Popen([sys.executable, 'server.py', '--port', '0', '--tick-rate', str(tick_rate), '--restart'],
+                            cwd=REPO_ROOT, stdout=subprocess.PIPE, text=True)
+    line = proc.stdout.readline() # "listening on HOST:PORT at ..."
+    if not line.startswith('listening on'): proc.kill(); raise RuntimeError(f"server failed to start: {line!r}")
+    host, port = line.split()[2].rsplit(':', 1)
+    return proc, host, int(port)
+
+async def run_load_test(room_counts, duration, tick_rate, input_every=3, seed=0):
+    proc, host, port = start_server(tick_rate)
+    try:
+        return [await measure_level(host, port, rooms, duration, input_every, seed) for rooms in room_counts]
+    finally:
+        proc.terminate(); proc.wait()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rooms', type=int, nargs='+', default=[10, 50, 100, 200])
+    parser.add_argument('--duration', type=float, default=5, help='seconds measured per room count')
+    parser.add_argument('--tick-rate', type=float, default=20)
+    parser.add_argument('--input-every', type=int, default=3, help='ticks between a client\'s inputs')
+    parser.add_argument('--json', metavar='PATH')
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run_load_test(args.rooms, args.duration, args.tick_rate, args.input_every))
+    if args.json:
+        with open(args.json, 'w') as f: json.dump(results, f, indent=1)
+    fmt = lambda v: '   n/a' if v is None else f'{v:6.2f}'
+    print(f"{'rooms':>5} {'ticks/s':>8} {'jit p50':>8} {'jit p99':>8} {'jit max':>8} {'work p99':>8} "
+          f"{'inputs':>7} {'lat p50':>8} {'lat p99':>8}  (ms)")
+    for r in results:
+        print(f"{r['rooms']:5d} {r['ticks_per_s']:8.1f} {fmt(r['jitter_p50_ms']):>8} {fmt(r['jitter_p99_ms']):>8} "
+              f"{fmt(r['jitter_max_ms']):>8} {fmt(r['tick_work_p99_ms']):>8} {r['inputs']:7d} "
+              f"{fmt(r['latency_p50_ms']):>8} {fmt(r['latency_p99_ms']):>8}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
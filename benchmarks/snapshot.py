@@ -0,0 +1,37 @@
+"""Fork cost of TwoPlayerGame: copy.deepcopy vs clone() vs snapshot()/restore().
+
+    python -m benchmarks.snapshot [--width 40 --height 30] [--lengths 1 100 400 1000]
+"""
+import argparse
+import copy
+import sys
+import timeit
+from benchmarks.fixtures import game_with_snake_length
+
+def measure(game, number):
+    snap = game.snapshot()
+    return {
+        'deepcopy_us': min(timeit.repeat(lambda: copy.deepcopy(game), number=number, repeat=3)) / number * 1e6,
+        'clone_us': min(timeit.repeat(game.clone, number=number, repeat=3)) / number * 1e6,
+        'snapshot_us': min(timeit.repeat(game.snapshot, number=number, repeat=3)) / number * 1e6,
+        'restore_us': min(timeit.repeat(lambda: game.restore(snap), number=number, repeat=3)) / number * 1e6,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--width', type=int, default=40)
+    parser.add_argument('--height', type=int, default=30)
+    parser.add_argument('--lengths', type=int, nargs='+', default=[1, 100, 400, 1000])
+    parser.add_argument('--number', type=int, default=200)
+    args = parser.parse_args(argv)
+
+    print(f"{'length':>7} {'deepcopy':>10} {'clone':>10} {'snapshot':>10} {'restore':>10} {'speedup':>8}  (us per op)")
+    for length in args.lengths:
+        if length > args.width * args.height:
+            print(f"{length:>7} skipped: longer than the board"); continue
+        r = measure(game_with_snake_length(args.width, args.height, length), args.number)
+        print(f"{length:>7} {r['deepcopy_us']:10.1f} {r['clone_us']:10.1f} {r['snapshot_us']:10.1f} "
+              f"{r['restore_us']:10.1f} {r['deepcopy_us'] / r['clone_us']:7.1f}x")
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""Soak test for the pygame frontend: thousands of game restarts must keep memory and call depth flat.
+
+Drives main.run_scenes offscreen with scripted key presses: start a game, steer at random until it
+ends, restart with R, and every --menu-every games go back through the menus (alternating single
+player and two-player on each map and mode). Traced Python memory (tracemalloc) and the call depth
+inside the scene loop are sampled every --sample games (--games must cover at least two samples).
+Exits non-zero when memory grew by more than --max-growth-kib after the first sample or the call
+depth changed.
+
+    python -m benchmarks.soak [--games 2000] [--menu-every 25] [--sample 100] [--max-growth-kib 256] [--renderer dirty] [--maps DIR]
+"""
+import argparse
+import gc
+import random
+import sys
+import tracemalloc
+import pygame
+import main as frontend
+import maps
+
+def _depth():
+    frame = sys._getframe(1); depth = 0
+    while frame is not None: frame = frame.f_back; depth += 1
+    return depth
+
+class Script:
+    """Event source for run_scenes: what a player would press on each scene."""
+    def __init__(self, games, menu_every, sample, seed=0):
+        self.games = games; self.menu_every = menu_every; self.sample = sample
+        self.rng = random.Random(seed); self.played = 0; self.menu_visits = 0
+        self.samples = [] # (games played, traced bytes, call depth)
+
+    def _key(self, key): return [pygame.event.Event(pygame.KEYDOWN, key=key)]
+
+    def __call__(self, scene):
+        rng = self.rng
+        if isinstance(scene, frontend.MenuScene):
+            self.menu_visits += 1
+            return self._key(pygame.K_1 if self.menu_visits % 2 else pygame.K_2)
+        if isinstance(scene, frontend.MapSelectScene): return self._key(rng.choice([key for key, _, _ in frontend.map_choices()]))
+        if isinstance(scene, frontend.ModeSelectScene): return self._key(rng.choice((pygame.K_1, pygame.K_2)))
+        if isinstance(scene, frontend.GameOverScene):
+            self.played += 1
+            if self.played % self.sample == 0:
+                gc.collect(); self.samples.append((self.played, tracemalloc.get_traced_memory()[0], _depth()))
+            if self.played >= self.games: return self._key(pygame.K_q)
+            return self._key(pygame.K_m if self.played % self.menu_every == 0 else pygame.K_r)
+        if isinstance(scene, frontend.PlayScene) and rng.random() < 0.3: # Random steering ends games quickly
+            keys = list(frontend.P1_KEYS) + (list(frontend.P2_KEYS) if scene.two_player else [])
+            return self._key(rng.choice(keys))
+        return []
+
+def soak(games, menu_every=25, sample=100, seed=0, renderer='dirty'):
+    random.seed(seed) # Games are unseeded; make their seeds reproducible
+    ctx = frontend.RenderContext(offscreen=True, renderer=renderer); ctx.init()
+    script = Script(games, menu_every, sample, seed)
+    tracemalloc.start()
+    try: frontend.run_scenes(ctx, frontend.MenuScene(ctx), events=script)
+    finally: tracemalloc.stop(); ctx.close()
+    return script.samples, ctx.frame_times.report()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=2000)
+    parser.add_argument('--menu-every', type=int, default=25)
+    parser.add_argument('--sample', type=int, default=100)
+    parser.add_argument('--max-growth-kib', type=float, default=256)
+    parser.add_argument('--renderer', default='dirty', choices=sorted(frontend.RENDERERS))
+    parser.add_argument('--maps', metavar='DIR', help='also play the map files in DIR, as main.py --maps does')
+    args = parser.parse_args(argv)
+    if args.games < 2 * args.sample: parser.error('--games must be at least twice --sample: growth is measured between samples')
+    if args.maps: maps.register_dir(args.maps)
+    samples, frame_times = soak(args.games, args.menu_every, args.sample, renderer=args.renderer)
+    print(f"{'games':>6} {'traced KiB':>11} {'depth':>6}")
+    for played, traced, depth in samples: print(f"{played:6d} {traced / 1024:11.1f} {depth:6d}")
+    for part in ('simulation', 'render'):
+        t = frame_times[part]
+        print(f"{part:>10} mean {t['mean_ms']:.3f} ms  p99 {t['p99_ms']:.3f} ms over {t['frames']} frames")
+    growth = (samples[-1][1] - samples[0][1]) / 1024
+    depths = {d for _, _, d in samples}
+    ok = growth <= args.max_growth_kib and len(depths) == 1
+    print(f"memory growth {growth:.1f} KiB (budget {args.max_growth_kib:.0f}), call depth {sorted(depths)}: {'ok' if ok else 'FAILED'}")
+    return 0 if ok else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
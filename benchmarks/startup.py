@@ -0,0 +1,58 @@
+"""Startup-time budget for the pygame frontend.
+
+Measures, in fresh interpreters, how long `import main` takes on top of a bare interpreter
+start and how long creating an offscreen RenderContext takes. Exits non-zero when either
+median exceeds its budget.
+
+    python -m benchmarks.startup [--runs 7] [--import-budget 0.6] [--context-budget 1.5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The setup snippet may reset t0 to time only its last statement
+_TIMED = '''
+import time
+t0 = time.perf_counter()
+{setup}
+t1 = time.perf_counter()
+print(t1 - t0)
+'''
+
+def _run(setup, runs):
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT='1', SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy')
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, '-c', _TIMED.format(setup=setup)], cwd=REPO_ROOT, env=env,
+                             capture_output=True, text=True, check=True).stdout
+        samples.append(float(out.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+def measure(runs=7):
+    return {
+        'import_main_s': _run('import main', runs),
+        'context_init_s': _run('import main\nt0 = time.perf_counter()\nmain.RenderContext(offscreen=True).init()', runs),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=7)
+    parser.add_argument('--import-budget', type=float, default=0.6, help='seconds allowed for `import main`')
+    parser.add_argument('--context-budget', type=float, default=1.5, help='seconds allowed for RenderContext.init()')
+    args = parser.parse_args(argv)
+
+    results = measure(args.runs)
+    budgets = {'import_main_s': args.import_budget, 'context_init_s': args.context_budget}
+    failed = False
+    for name, value in results.items():
+        ok = value <= budgets[name]
+        failed |= not ok
+        print(f"{name:16s} {value * 1000:8.1f} ms  (budget {budgets[name] * 1000:.0f} ms) {'ok' if ok else 'OVER BUDGET'}")
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
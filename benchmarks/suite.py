@@ -0,0 +1,190 @@
+"""Benchmark suite: core tick throughput, food spawn cost and frontend frame time.
+
+Results are written as JSON ({"results": [{"name", "value", "unit", "better"}, ...]}) and compared
+against a stored baseline; any metric worse than the baseline by more than the tolerance is
+reported as a regression and the run exits non-zero. Baselines are machine-specific, so refresh
+benchmarks/baseline.json with --save-baseline on the machine that runs the comparison.
+
+    python -m benchmarks.suite [--quick] [--json out.json] [--baseline benchmarks/baseline.json]
+                               [--tolerance 0.3] [--save-baseline] [--no-frontend]
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from snake_core import MAP_DEFINITIONS
+from benchmarks.fixtures import single_player_setup, two_player_setup
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+def _result(name, value, unit, better):
+    return {'name': name, 'value': round(value, 3), 'unit': unit, 'better': better}
+
+def _best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter(); fn(); best = min(best, time.perf_counter() - t0)
+    return best
+
+# --- Core ---
+def _tick_rate(game, driver, snakes, ticks, repeat, chunk=200):
+    """Ticks per second, rewinding to the starting state every `chunk` ticks so eating never fills the board."""
+    start = game.snapshot(); steer = driver.steer; update = game.update
+    best = float('inf')
+    for _ in range(repeat):
+        elapsed = 0.0; done = 0
+        while done < ticks:
+            n = min(chunk, ticks - done); game.restore(start)
+            t0 = time.perf_counter()
+            for _ in range(n):
+                for s in snakes: steer(s)
+                update()
+            elapsed += time.perf_counter() - t0; done += n
+            if game.is_game_over(): raise RuntimeError("benchmark snakes collided; the fixture is broken")
+        best = min(best, elapsed)
+    return ticks / best
+
+def bench_tick_single(width, height, length, foods, ticks, repeat=5):
+    game, driver = single_player_setup(width, height, length, foods)
+    return _result(f'tick_single[{width}x{height},len={length},food={foods}]',
+                   _tick_rate(game, driver, (game.snake,), ticks, repeat), 'ticks/s', 'higher')
+
+def bench_tick_two(width, height, length, foods, map_id, ticks, repeat=5):
+    game, driver = two_player_setup(width, height, length, foods, map_id=map_id)
+    return _result(f'tick_two[{width}x{height},map={map_id},len={length},food={foods}]',
+                   _tick_rate(game, driver, (game.snake1, game.snake2), ticks, repeat), 'ticks/s', 'higher')
+
+def bench_spawn_food(width, height, fill, rounds, repeat=5):
+    """Mean cost of one _generate_food placement with `fill` of the board covered by the snake."""
+    length = int(width * height * fill)
+    game, _ = single_player_setup(width, height, length, 5)
+    def run():
+        for _ in range(rounds):
+            for pos in game.foods: game._free_cells.release(pos)
+            game.foods = []; game._generate_food()
+    per_spawn = _best_of(run, repeat) / (rounds * game.MAX_FOOD_ITEMS)
+    return _result(f'spawn_food[{width}x{height},fill={fill:.2f}]', per_spawn * 1e6, 'us', 'lower')
+
+# --- Frontend ---
+def _frame_runner(ctx, mode, two, map_id=0, length=60, foods=5):
+    import main
+    if two:
+        game, driver = two_player_setup(main.GRID_WIDTH, main.GRID_HEIGHT, length, foods, map_id=map_id)
+        snakes = (game.snake1, game.snake2)
+    else:
+        game, driver = single_player_setup(main.GRID_WIDTH, main.GRID_HEIGHT, length, foods)
+        snakes = (game.snake,)
+    obstacles = game.get_obstacles() if two else ()
+    renderer = main.RENDERERS[mode](ctx, obstacles) if mode in main.RENDERERS else None
+
+    def frame():
+        for s in snakes: driver.steer(s)
+        game.update()
+        pu = game.get_powerup_item_details()
+        bodies = [(s.get_body(), s.color if two else main.GREEN) for s in snakes]
+        if renderer: # 'dirty' or 'bulk'
+            cells = main.board_cells(bodies, game.get_foods(), pu)
+            overlays = [main.powerup_overlay(ctx, pu)] if pu else []
+            hud = main.hud_overlays_two_player(ctx, game) if two else main.hud_overlays_single(ctx, game)
+            renderer.render(cells, overlays + hud)
+        else: # What every frame cost before the dirty-rectangle renderer
+            ctx.screen.fill(main.BLACK); main.draw_grid(ctx); main.draw_obstacles(ctx, obstacles)
+            for body, color in bodies: main.draw_snake(ctx, body, color)
+            main.draw_foods(ctx, game.get_foods())
+            if pu: main.draw_powerup_item(ctx, pu)
+            if two: main.display_scores_two_player(ctx, game)
+            else: main.display_score_single(ctx, game)
+            ctx.present()
+    return frame
+
+def bench_frames(frames, repeat=3):
+    os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+    import main
+    ctx = main.RenderContext(headless=True)
+    ctx.init()
+    results = []
+    try:
+        for two, label in ((False, 'single'), (True, 'two')):
+            for mode in ('full', 'dirty', 'bulk'):
+                frame = _frame_runner(ctx, mode, two)
+                for _ in range(10): frame() # Warm caches (background, text surfaces)
+                def run():
+                    for _ in range(frames): frame()
+                results.append(_result(f'frame_{label}[{mode}]', _best_of(run, repeat) / frames * 1e3, 'ms', 'lower'))
+    finally:
+        ctx.close()
+    return results
+
+# --- Driver ---
+def run_suite(quick=False, frontend=True):
+    ticks = 2000 if quick else 20000
+    results = []
+    for width, height in ((20, 20), (40, 30), (80, 60)):
+        for length in (3, 100, 400):
+            if length * 2 > width * height: continue
+            for foods in (1, 5, 20):
+                results.append(bench_tick_single(width, height, length, foods, ticks))
+    for map_id in sorted(MAP_DEFINITIONS):
+        for length in (3, 100):
+            results.append(bench_tick_two(40, 30, length, 5, map_id, ticks))
+    for fill in (0.5, 0.9, 0.99):
+        results.append(bench_spawn_food(40, 30, fill, 200 if quick else 2000))
+    if frontend:
+        results.extend(bench_frames(30 if quick else 100))
+    return results
+
+def compare(results, baseline, tolerance):
+    """Returns (lines, regressions) comparing each result to the baseline entry of the same name."""
+    base = {r['name']: r for r in baseline.get('results', [])}
+    lines = []; regressions = []
+    for r in results:
+        b = base.get(r['name'])
+        if b is None or not b['value']:
+            lines.append(f"{r['name']:48s} {r['value']:>12.3f} {r['unit']:8s} (no baseline)"); continue
+        ratio = r['value'] / b['value']
+        change = ratio - 1 if r['better'] == 'higher' else 1 - ratio # Positive is an improvement
+        regressed = change < -tolerance
+        if regressed: regressions.append(r['name'])
+        lines.append(f"{r['name']:48s} {r['value']:>12.3f} {r['unit']:8s} {change * 100:+6.1f}%"
+                     f"{'  REGRESSION' if regressed else ''}")
+    return lines, regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--quick', action='store_true', help='fewer ticks and frames per measurement')
+    parser.add_argument('--json', metavar='PATH', help="write results as JSON ('-' for stdout)")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--tolerance', type=float, default=0.3, help='allowed fractional slowdown per metric')
+    parser.add_argument('--save-baseline', action='store_true', help='overwrite the baseline with this run')
+    parser.add_argument('--no-frontend', action='store_true', help='skip the pygame frame-time benchmarks')
+    args = parser.parse_args(argv)
+
+    results = run_suite(quick=args.quick, frontend=not args.no_frontend)
+    report = {'python': platform.python_version(), 'machine': platform.machine(), 'quick': args.quick,
+              'results': results}
+    if args.json == '-':
+        json.dump(report, sys.stdout, indent=1); print()
+    elif args.json:
+        with open(args.json, 'w') as f: json.dump(report, f, indent=1)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f: json.dump(report, f, indent=1); f.write('\n')
+        print(f"baseline written to {args.baseline}", file=sys.stderr)
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}; run with --save-baseline first", file=sys.stderr)
+        return 0
+    with open(args.baseline) as f: baseline = json.load(f)
+    lines, regressions = compare(results, baseline, args.tolerance)
+    out = sys.stderr if args.json == '-' else sys.stdout
+    print('\n'.join(lines), file=out)
+    if regressions:
+        print(f"\n{len(regressions)} metric(s) regressed by more than {args.tolerance:.0%}: "
+              + ', '.join(regressions), file=out)
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
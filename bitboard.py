@@ -0,0 +1,457 @@
+"""Bitboard backend: Game/TwoPlayerGame rules on Python-int bitboards, for search-heavy bots.
+
+Cells are bit indices on the board padded by MARGIN cells per side (a two-player snake under
+speed_self can step two cells off the board before its head is wrapped or it loses), so
+b = (y + MARGIN) * stride + x + MARGIN. Each snake keeps its body as a deque of indices plus an
+occupancy bitboard; a cell covered twice (only possible on the tick a snake dies, or mid-way
+through a two-step move) is tracked in a small overflow dict so popping the tail stays exact.
+Obstacles, foods and the in-board mask are bitboards too, so collisions, bounds and spawn
+sampling are bit operations; snapshots are a handful of immutable ints plus the body tuples.
+
+The games expose the snake_core surface, so bots, Observation, pathfinding, delta encoding and
+the frontend run on either backend: snake.body / get_body() / get_head_position() and game.foods
+are (x, y) tuples (kept alongside the bit indices), snake._segment_counts answers membership and
+counts from the bitboards, and state_epoch, profiler, timers (a snake_core.TimerWheel, with the
+same power-up timer properties) and the getters match. Single-player consumers tell the games
+apart by the `snake` attribute, as with Game.
+
+The rules (update order, power-up timers, collision outcome, RNG calls for power-ups) match
+snake_core exactly. Spawn *positions* differ for the same seed: free cells are picked uniformly
+by rank in row-major order instead of from FreeCellIndex's swap-remove order, so replays must
+be played back on the backend that recorded them.
+"""
+import random
+from collections import deque
+from maps import map_layout
+from snake_core import PowerUp, Snake, TimerWheel, _expire_item, _item_lifespan, _set_item_lifespan
+
+MARGIN = 2
+_GEOMETRY = {}
+
+def geometry(width, height):
+    """(stride, BIT table, in-board mask, wrap table for margin cells, POS table of (x, y) per index), cached per board size."""
+    key = (width, height)
+    if key not in _GEOMETRY:
+        stride = width + 2 * MARGIN; nbits = (height + 2 * MARGIN) * stride
+        bits = [1 << i for i in range(nbits)]
+        pos = [(b % stride - MARGIN, b // stride - MARGIN) for b in range(nbits)]
+        board = 0; wrap = {}
+        for y in range(-MARGIN, height + MARGIN):
+            for x in range(-MARGIN, width + MARGIN):
+                b = (y + MARGIN) * stride + x + MARGIN
+                if 0 <= x < width and 0 <= y < height: board |= bits[b]
+                else: wrap[b] = (y % height + MARGIN) * stride + x % width + MARGIN
+        _GEOMETRY[key] = (stride, bits, board, wrap, pos)
+    return _GEOMETRY[key]
+
+def select_bit(x, k):
+    """Index of the k-th (0-based, from the least significant end) set bit of x."""
+    lo, hi = 0, x.bit_length()
+    while lo < hi: # Smallest m with more than k set bits below m
+        mid = (lo + hi) // 2
+        if (x & ((1 << mid) - 1)).bit_count() > k: hi = mid
+        else: lo = mid + 1
+    return lo - 1
+
+class _SegmentCounts:
+    """Read-only {(x, y): segments} view of a BitSnake, answered from its bitboards (Snake._segment_counts)."""
+    __slots__ = ('snake', 'width', 'height', 'stride')
+
+    def __init__(self, snake, width, height, stride):
+        self.snake = snake; self.width = width; self.height = height; self.stride = stride
+
+    def _bit(self, pos):
+        x, y = pos
+        if -MARGIN <= x < self.width + MARGIN and -MARGIN <= y < self.height + MARGIN: return (y + MARGIN) * self.stride + x + MARGIN
+        return None
+
+    def __contains__(self, pos):
+        b = self._bit(pos)
+        return b is not None and self.snake.occ >> b & 1 == 1
+
+    def get(self, pos, default=None):
+        b = self._bit(pos)
+        if b is None or not self.snake.occ >> b & 1: return default
+        return 1 + self.snake.dup.get(b, 0)
+
+    def __getitem__(self, pos):
+        n = self.get(pos)
+        if n is None: raise KeyError(pos)
+        return n
+
+    def __iter__(self): return iter(dict.fromkeys(self.snake.body))
+    def __len__(self): return self.snake.occ.bit_count()
+
+class BitSnake:
+    __slots__ = ('id', 'cells', 'body', 'occ', 'dup', '_segment_counts', 'direction', 'grow_pending', 'color', 'score',
+                 'timers', 'active_powerup_type', 'effect_ends', 'is_wall_ghost', 'steps_per_update', 'slowed_ends',
+                 'slow_effect_counter', 'is_started', 'input_queue')
+
+    def __init__(self, snake_id, direction='RIGHT', color='GREEN'):
+        self.id = snake_id; self.cells = deque(); self.body = deque(); self.occ = 0; self.dup = {}
+        self._segment_counts = None # Attached by the game with its geometry
+        self.direction = direction; self.grow_pending = False; self.color = color; self.score = 0
+        self.timers = TimerWheel(); self.active_powerup_type = None; self.effect_ends = 0; self.is_wall_ghost = False
+        self.steps_per_update = 1; self.slowed_ends = 0; self.slow_effect_counter = 0; self.is_started = False
+        self.input_queue = deque()
+
+    # Shared with snake_core: buffered input, timer properties over the game's TimerWheel, getters
+    queue_turn = Snake.queue_turn; take_turn = Snake.take_turn
+    powerup_effect_timer = Snake.powerup_effect_timer; is_slowed_timer = Snake.is_slowed_timer; expire = Snake.expire
+    get_head_position = Snake.get_head_position; get_body = Snake.get_body
+
+    def turn(self, new_direction): # Same as Snake.turn
+        if new_direction not in ('UP', 'DOWN', 'LEFT', 'RIGHT'): return
+        if not self.is_started: self.direction = new_direction; self.is_started = True
+        elif (new_direction == 'UP' and self.direction != 'DOWN') or (new_direction == 'DOWN' and self.direction != 'UP') or \
+             (new_direction == 'LEFT' and self.direction != 'RIGHT') or (new_direction == 'RIGHT' and self.direction != 'LEFT'):
+            self.direction = new_direction
+
+    def snapshot(self): # Snake.snapshot's layout, with the bitboards in place of the segment counts
+        return (tuple(self.cells), tuple(self.body), self.occ, self.dup.copy(), self.direction, self.grow_pending, self.score,
+                self.is_started, self.active_powerup_type, self.powerup_effect_timer, self.is_wall_ghost,
+                self.steps_per_update, self.is_slowed_timer, self.slow_effect_counter, tuple(self.input_queue))
+
+    def restore(self, state): # The owning game resets the wheel first; the timer setters reschedule
+        (cells, body, self.occ, dup, self.direction, self.grow_pending, self.score, self.is_started, self.active_powerup_type,
+         self.powerup_effect_timer, self.is_wall_ghost, self.steps_per_update, self.is_slowed_timer,
+         self.slow_effect_counter, queue) = state
+        self.cells = deque(cells); self.body = deque(body); self.dup = dup.copy(); self.input_queue = deque(queue)
+
+class _BitboardBase:
+    powerup_on_map_lifespan_timer = property(_item_lifespan, _set_item_lifespan); expire = _expire_item # As snake_core
+
+    def _init_board(self, width, height, seed):
+        self.width = width; self.height = height
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self.rng = random.Random(self.seed)
+        self.tick = 0; self.input_log = None; self.state_epoch = 0; self.profiler = None
+        self.timers = TimerWheel()
+        self.stride, self.BIT, self.board, self._wrap, self.POS = geometry(width, height)
+        s = self.stride
+        self._delta = {'UP': -s, 'DOWN': s, 'LEFT': -1, 'RIGHT': 1}
+        self.obstacle_bits = 0; self.food_bits = 0; self.foods = []
+        self.powerup_item = None; self._pu_index = None; self.powerup_item_ends = 0
+
+    def _index(self, pos): return (pos[1] + MARGIN) * self.stride + pos[0] + MARGIN
+    def _pos(self, b): return self.POS[b]
+
+    def _new_snake(self, snake_id, direction, color):
+        s = BitSnake(snake_id, direction, color); s.timers = self.timers
+        s._segment_counts = _SegmentCounts(s, self.width, self.height, self.stride)
+        return s
+
+    def _place(self, s, b): # Reset `s` to a one-segment body on cell b
+        s.cells = deque([b]); s.body = deque([self.POS[b]]); s.occ = self.BIT[b]; s.dup = {}
+
+    def _occupied(self):
+        occ = self.obstacle_bits | self.food_bits
+        for s in self._snakes: occ |= s.occ
+        if self._pu_index is not None: occ |= self.BIT[self._pu_index]
+        return occ
+
+    def _sample_free(self, extra=0):
+        free = self.board & ~(self._occupied() | extra)
+        n = free.bit_count()
+        if self.profiler:
+            self.profiler.count('spawn_attempts')
+            if not n: self.profiler.count('spawn_failures')
+        if not n: return None
+        return select_bit(free, self.rng.randrange(n))
+
+    def _generate_food(self):
+        while len(self.foods) < self.MAX_FOOD_ITEMS:
+            b = self._sample_free()
+            if b is None: break
+            self.foods.append(self.POS[b]); self.food_bits |= self.BIT[b]
+
+    def _generate_powerup_item(self):
+        if self.powerup_item is None and self.rng.random() < self.powerup_spawn_chance:
+            b = self._sample_free()
+            if b is None: return
+            type_id = self.rng.choice(list(self.POWERUP_DEFINITIONS.keys()))
+            self.powerup_item = self._make_powerup(type_id, b); self._pu_index = b
+            self.powerup_on_map_lifespan_timer = self.POWERUP_MAP_LIFESPAN
+
+    def _clear_powerup_item(self):
+        self.powerup_item = None; self._pu_index = None; self.powerup_on_map_lifespan_timer = 0
+
+    def _update_powerup_timers(self): # See snake_core.Game._update_powerup_timers
+        for kind, target, tick in self.timers.advance(self.tick): target.expire(kind, tick)
+
+    def _occupy(self, s, b):
+        bit = self.BIT[b]
+        if s.occ & bit: s.dup[b] = s.dup.get(b, 0) + 1
+        else: s.occ |= bit
+
+    def _release(self, s, b):
+        n = s.dup.get(b)
+        if n is None: s.occ ^= self.BIT[b]
+        elif n == 1: del s.dup[b]
+        else: s.dup[b] = n - 1
+
+    def _push_head(self, s, b):
+        self._occupy(s, b); s.cells.appendleft(b); s.body.appendleft(self.POS[b])
+
+    def _pop_tail(self, s):
+        self._release(s, s.cells.pop()); s.body.pop()
+
+    def _set_head(self, s, b): # wall_ghost wrap of the current head
+        self._release(s, s.cells[0]); self._occupy(s, b)
+        s.cells[0] = b; s.body[0] = self.POS[b]
+
+    def _move(self, s):
+        self._push_head(s, s.cells[0] + self._delta[s.direction])
+        if s.grow_pending: s.grow_pending = False
+        else: self._pop_tail(s)
+
+    def _eat(self, s, head):
+        """Grow `s` if `head` holds food; returns whether it did."""
+        if not self.food_bits & self.BIT[head]: return False
+        s.grow_pending = True; s.score += 1
+        self.foods.remove(self.POS[head]); self.food_bits ^= self.BIT[head]
+        return True
+
+    def update(self): # See snake_core.Game.update
+        prof = self.profiler
+        if prof is None: return self._step(None)
+        prof.begin_tick()
+        try: self._step(prof)
+        finally: prof.end_tick()
+
+    # --- Getters shared with snake_core ---
+    def get_foods(self): return self.foods
+    def is_game_over(self): return self.game_over
+    def get_powerup_item_details(self):
+        if self.powerup_item: return {'position': self.powerup_item.position, 'symbol': self.powerup_item.symbol, 'color': self.powerup_item.color}
+        return None
+
+    def _make_powerup(self, type_id, b):
+        d = self.POWERUP_DEFINITIONS[type_id]
+        return PowerUp(type_id, self.POS[b], d['color'], d['symbol'], d['effect_duration'])
+
+    def _base_snapshot(self):
+        pu = (self.powerup_item.type_id, self._pu_index) if self.powerup_item else None
+        return (self.tick, self.game_over, tuple(self.foods), self.food_bits, pu, self.powerup_on_map_lifespan_timer,
+                self.rng.getstate(), tuple(s.snapshot() for s in self._snakes))
+
+    def _base_restore(self, state):
+        (self.tick, self.game_over, foods, self.food_bits, pu, lifespan, rng_state, snakes) = state
+        self.timers.reset(self.tick) # Pending expiries belong to the old timeline; the setters below reschedule
+        self.foods = list(foods); self.rng.setstate(rng_state)
+        self.powerup_item = self._make_powerup(*pu) if pu else None; self._pu_index = pu[1] if pu else None
+        self.powerup_on_map_lifespan_timer = lifespan
+        for s, st in zip(self._snakes, snakes): s.restore(st)
+        self.state_epoch += 1
+
+    def _clone_base(self):
+        other = type(self).__new__(type(self)); other.__dict__.update(self.__dict__)
+        other.rng = random.Random.__new__(type(self.rng)); other.timers = TimerWheel()
+        other.input_log = None; other.profiler = None
+        return other
+
+class BitboardGame(_BitboardBase):
+    """Drop-in for snake_core.Game."""
+    def __init__(self, width, height, seed=None):
+        self._init_board(width, height, seed)
+        self.snake = self._new_snake(1, 'RIGHT', 'GREEN'); self._snakes = (self.snake,)
+        self._place(self.snake, self._index((width // 2, height // 2)))
+        self.MAX_FOOD_ITEMS = 5; self.game_over = False
+        self.powerup_spawn_chance = 0.15; self.POWERUP_MAP_LIFESPAN = 100
+        self.POWERUP_DEFINITIONS = {
+            'speed_self': {'symbol': 'S', 'color': 'LIGHTBLUE', 'effect_duration': 50, 'applies_to': 'self'},
+            'wall_ghost': {'symbol': 'G', 'color': 'PURPLE', 'effect_duration': 70, 'applies_to': 'self'},
+        }
+        self._generate_food()
+
+    def _activate_powerup(self, powerup_type):
+        s = self.snake; definition = self.POWERUP_DEFINITIONS[powerup_type]
+        s.steps_per_update = 1; s.is_wall_ghost = False
+        s.active_powerup_type = powerup_type; s.powerup_effect_timer = definition['effect_duration']
+        if powerup_type == 'speed_self': s.steps_per_update = 2
+        elif powerup_type == 'wall_ghost': s.is_wall_ghost = True
+
+    def _step(self, prof):
+        if self.game_over: return
+        self.tick += 1
+        self._update_powerup_timers()
+        if prof: prof.mark('powerup_timers')
+        s = self.snake
+        started_now = not s.is_started and s.take_turn() # Buffered input, as in snake_core
+        if not s.is_started: return
+
+        for step in range(s.steps_per_update):
+            if s.input_queue and not (step == 0 and started_now): s.take_turn()
+            self._move(s); head = s.cells[0]
+            if not self.board & self.BIT[head]:
+                if s.is_wall_ghost: head = self._wrap[head]; self._set_head(s, head)
+                else: self.game_over = True; return
+            if head in s.dup: self.game_over = True; return # Covered twice: the head ran into the body
+        if prof: prof.mark('movement')
+
+        head = s.cells[0]
+        if self._eat(s, head):
+            if prof: prof.mark('food_scan')
+            self._generate_food(); self._generate_powerup_item()
+            if prof: prof.mark('spawn')
+        elif prof: prof.mark('food_scan')
+        if self.powerup_item and head == self._pu_index:
+            self._activate_powerup(self.powerup_item.type_id); self._clear_powerup_item()
+        if prof: prof.mark('powerup_pickup')
+
+    def change_snake_direction(self, new_direction):
+        if not self.game_over:
+            if self.input_log is not None: self.input_log.append((self.tick, 1, new_direction, False))
+            self.snake.turn(new_direction)
+
+    def queue_turn(self, new_direction):
+        if self.game_over: return False
+        if self.input_log is not None: self.input_log.append((self.tick, 1, new_direction, True))
+        return self.snake.queue_turn(new_direction)
+
+    def get_score(self): return self.snake.score
+    def get_snake_body(self): return self.snake.get_body()
+
+    def snapshot(self): return self._base_snapshot()
+    def restore(self, state): self._base_restore(state)
+    def clone(self):
+        other = self._clone_base()
+        other.snake = other._new_snake(1, 'RIGHT', 'GREEN'); other._snakes = (other.snake,)
+        other.restore(self.snapshot())
+        return other
+
+class BitboardTwoPlayerGame(_BitboardBase):
+    """Drop-in for snake_core.TwoPlayerGame."""
+    def __init__(self, width, height, map_id=0, game_mode='last_snake', target_score=10, seed=None):
+        self._init_board(width, height, seed)
+        self.map_id = map_id; self.game_mode = game_mode; self.target_score = target_score
+        self.snake1 = self._new_snake(1, 'RIGHT', 'GREEN'); self.snake2 = self._new_snake(2, 'LEFT', 'BLUE')
+        self._snakes = (self.snake1, self.snake2)
+        self.MAX_FOOD_ITEMS = 5; self.game_over = False; self.winner = None
+        self.powerup_spawn_chance = 0.20; self.POWERUP_MAP_LIFESPAN = 100
+        self.POWERUP_DEFINITIONS = {
+            'speed_self': {'symbol': 'S', 'color': 'LIGHTBLUE', 'effect_duration': 50, 'applies_to': 'self'},
+            'slow_opponent': {'symbol': 'O', 'color': 'ORANGE', 'effect_duration': 50, 'applies_to': 'opponent'},
+            'wall_ghost': {'symbol': 'G', 'color': 'PURPLE', 'effect_duration': 70, 'applies_to': 'self'},
+        }
+        self.set_map(map_id)
+
+    def set_map(self, map_id_to_set):
+        self.map_id = map_id_to_set
+        layout = map_layout(self.map_id, self.width, self.height)
+        self.obstacles = layout.obstacles; self.obstacle_set = layout.obstacle_set
+        bits = layout.cache.get('bitboard') # Obstacle bitboard, cached on the layout like snake_core's free-cell template
+        if bits is None:
+            bits = 0
+            for pos in self.obstacles: bits |= self.BIT[self._index(pos)]
+            layout.cache['bitboard'] = bits
+        self.obstacle_bits = bits
+        if self.powerup_item: self._clear_powerup_item()
+        self.foods = []; self.food_bits = 0
+        for s, pos, d in zip(self._snakes, layout.spawns, ('RIGHT', 'LEFT')):
+            self._place(s, self._index(pos)); s.direction = d
+            self._deactivate_direct_effects(s); s.is_started = False; s.input_queue.clear()
+        self._generate_food()
+        self.snake1.score = 0; self.snake2.score = 0
+        self.game_over = False; self.winner = None; self.state_epoch += 1
+
+    def _deactivate_direct_effects(self, s):
+        s.steps_per_update = 1; s.is_wall_ghost = False; s.is_slowed_timer = 0; s.slow_effect_counter = 0
+        if s.active_powerup_type is not None: s.active_powerup_type = None; s.powerup_effect_timer = 0
+
+    def _activate_powerup(self, snake, opponent, powerup_type):
+        definition = self.POWERUP_DEFINITIONS[powerup_type]
+        self._deactivate_direct_effects(snake if definition['applies_to'] == 'self' else opponent)
+        snake.active_powerup_type = powerup_type; snake.powerup_effect_timer = definition['effect_duration']
+        if powerup_type == 'speed_self': snake.steps_per_update = 2
+        elif powerup_type == 'slow_opponent': opponent.is_slowed_timer = definition['effect_duration']; opponent.slow_effect_counter = 0
+        elif powerup_type == 'wall_ghost': snake.is_wall_ghost = True
+
+    def _step(self, prof):
+        if self.game_over: return
+        self.tick += 1
+        self._update_powerup_timers()
+        if prof: prof.mark('powerup_timers')
+        s1, s2 = self.snake1, self.snake2
+
+        for s in self._snakes: # Movement; collisions are only judged after both snakes moved
+            started_now = not s.is_started and s.take_turn()
+            if not s.is_started: continue
+            if s.slowed_ends > self.tick:
+                s.slow_effect_counter = (s.slow_effect_counter + 1) % 2
+                if s.slow_effect_counter == 1: continue
+            for step in range(s.steps_per_update):
+                if s.input_queue and not (step == 0 and started_now): s.take_turn()
+                self._move(s)
+        if prof: prof.mark('movement')
+        if not (s1.is_started or s2.is_started): return
+
+        h1 = s1.cells[0]; h2 = s2.cells[0] # Food and pickups use the heads before wrapping, as in snake_core
+        eaten1 = s1.is_started and self._eat(s1, h1)
+        if eaten1:
+            if prof: prof.mark('food_scan')
+            self._generate_food(); self._generate_powerup_item()
+            if prof: prof.mark('spawn')
+        if s2.is_started and self._eat(s2, h2):
+            if prof: prof.mark('food_scan')
+            self._generate_food()
+            if not eaten1: self._generate_powerup_item()
+            if prof: prof.mark('spawn')
+        if prof: prof.mark('food_scan')
+        if self.powerup_item:
+            if s1.is_started and h1 == self._pu_index:
+                self._activate_powerup(s1, s2, self.powerup_item.type_id); self._clear_powerup_item()
+            elif s2.is_started and self.powerup_item and h2 == self._pu_index:
+                self._activate_powerup(s2, s1, self.powerup_item.type_id); self._clear_powerup_item()
+        if prof: prof.mark('powerup_pickup')
+
+        if self.game_mode == 'first_to_x':
+            r1 = s1.score >= self.target_score; r2 = s2.score >= self.target_score
+            if r1 and r2: self.winner = 'draw' if s1.score == s2.score else ('player1' if s1.score > s2.score else 'player2')
+            elif r1: self.winner = 'player1'
+            elif r2: self.winner = 'player2'
+            if r1 or r2: self.game_over = True; return
+
+        board = self.board; BIT = self.BIT
+        out1 = not board & BIT[h1]; out2 = not board & BIT[h2]
+        if out1 and s1.is_wall_ghost: h1 = self._wrap[h1]; self._set_head(s1, h1)
+        if out2 and s2.is_wall_ghost: h2 = self._wrap[h2]; self._set_head(s2, h2)
+        head_on = h1 == h2
+        lose1 = (out1 and not s1.is_wall_ghost) or h1 in s1.dup or (not head_on and s2.occ & BIT[h1]) or self.obstacle_bits & BIT[h1]
+        lose2 = (out2 and not s2.is_wall_ghost) or h2 in s2.dup or (not head_on and s1.occ & BIT[h2]) or self.obstacle_bits & BIT[h2]
+        if head_on or (lose1 and lose2): self.game_over = True; self.winner = 'draw'
+        elif lose1: self.game_over = True; self.winner = 'player2'
+        elif lose2: self.game_over = True; self.winner = 'player1'
+        if prof: prof.mark('collision')
+
+    def change_snake_direction(self, snake_id, new_direction):
+        if self.game_over: return
+        if self.input_log is not None and snake_id in (1, 2): self.input_log.append((self.tick, snake_id, new_direction, False))
+        if snake_id == 1: self.snake1.turn(new_direction)
+        elif snake_id == 2: self.snake2.turn(new_direction)
+
+    def queue_turn(self, snake_id, new_direction):
+        if self.game_over or snake_id not in (1, 2): return False
+        if self.input_log is not None: self.input_log.append((self.tick, snake_id, new_direction, True))
+        return (self.snake1 if snake_id == 1 else self.snake2).queue_turn(new_direction)
+
+    def get_obstacles(self): return self.obstacles
+    def get_scores(self): return self.snake1.score, self.snake2.score
+    def get_winner(self): return self.winner
+    def get_snake1_body(self): return self.snake1.get_body()
+    def get_snake2_body(self): return self.snake2.get_body()
+    def get_snake1_color(self): return self.snake1.color
+    def get_snake2_color(self): return self.snake2.color
+
+    def snapshot(self): return (self.winner, self.map_id, self.obstacles, self.obstacle_bits, self._base_snapshot())
+    def restore(self, state):
+        self.winner, self.map_id, self.obstacles, self.obstacle_bits, base = state
+        layout = map_layout(self.map_id, self.width, self.height)
+        self.obstacle_set = layout.obstacle_set if self.obstacles is layout.obstacles else frozenset(self.obstacles)
+        self._base_restore(base)
+    def clone(self):
+        other = self._clone_base()
+        other.snake1 = other._new_snake(1, 'RIGHT', 'GREEN'); other.snake2 = other._new_snake(2, 'LEFT', 'BLUE')
+        other._snakes = (other.snake1, other.snake2)
+        other.restore(self.snapshot())
+        return other
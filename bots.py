@@ -0,0 +1,51 @@
+"""Simple TwoPlayerGame policies for tournaments and load tests.
+
+A bot is a function bot(game, snake_id, rng) -> direction, called once per tick before update().
+It must only use `rng` for randomness so seeded matches stay reproducible.
+"""
+from pathfinding import path_bot
+
+DIRECTION_VECTORS = {'UP': (0, -1), 'DOWN': (0, 1), 'LEFT': (-1, 0), 'RIGHT': (1, 0)}
+OPPOSITE = {'UP': 'DOWN', 'DOWN': 'UP', 'LEFT': 'RIGHT', 'RIGHT': 'LEFT'}
+
+def _snakes(game, snake_id):
+    return (game.snake1, game.snake2) if snake_id == 1 else (game.snake2, game.snake1)
+
+def next_cell(game, snake, direction):
+    dx, dy = DIRECTION_VECTORS[direction]
+    x, y = snake.get_head_position(); x += dx; y += dy
+    if snake.is_wall_ghost: x %= game.width; y %= game.height
+    return (x, y)
+
+def is_blocked(game, pos):
+    x, y = pos
+    if not (0 <= x < game.width and 0 <= y < game.height): return True
+    return pos in game.obstacle_set or pos in game.snake1._segment_counts or pos in game.snake2._segment_counts
+
+def safe_directions(game, snake_id):
+    """Directions that do not run into a wall, obstacle or body on the next step."""
+    me, _ = _snakes(game, snake_id)
+    back = OPPOSITE[me.direction] if me.is_started else None
+    return [d for d in DIRECTION_VECTORS if d != back and not is_blocked(game, next_cell(game, me, d))]
+
+def random_bot(game, snake_id, rng):
+    """Keeps going straight, turning at random 10% of the time; only picks safe moves when it has one."""
+    me, _ = _snakes(game, snake_id)
+    safe = safe_directions(game, snake_id)
+    if not safe: return me.direction
+    if me.is_started and me.direction in safe and rng.random() >= 0.1: return me.direction
+    return rng.choice(safe)
+
+def greedy_bot(game, snake_id, rng):
+    """Steps towards the nearest food (Manhattan distance) among the safe moves."""
+    me, _ = _snakes(game, snake_id)
+    safe = safe_directions(game, snake_id)
+    if not safe: return me.direction
+    if not game.foods: return rng.choice(safe)
+    def distance(d):
+        x, y = next_cell(game, me, d)
+        return min(abs(x - fx) + abs(y - fy) for fx, fy in game.foods)
+    best = min(distance(d) for d in safe)
+    return rng.choice([d for d in safe if distance(d) == best])
+
+BOTS = {'random': random_bot, 'greedy': greedy_bot, 'path': path_bot}
@@ -0,0 +1,283 @@
+"""Self-play trajectory datasets: per-tick (observation, action, reward, done) rows in memory-mapped chunks.
+
+A dataset is a directory. meta.json fixes the board size and so the row dtype (record_dtype): the
+observation grid with its observation.CHANNELS packed into bits (unpack_observations restores
+them), its TIMERS, the action (index into DIRECTIONS), the reward, done, and the game id, tick and
+player the row belongs to. Rows are stored raw, one fixed-size record after another, in chunk
+files of up to chunk_rows rows.
+
+Every TrajectoryWriter has its own name and only touches its own files (<name>-<seq>.rec and
+index-<name>.json), so worker processes write in parallel without locks. A chunk enters the index
+once it is full or the writer closes; the index is replaced atomically, so a reader (or a crashed
+worker) only ever sees complete chunks. TrajectoryDataset maps every indexed chunk read-only: a row
+or a slice within one chunk is a view of the file, not a copy.
+
+Rewards are the points scored on the tick, plus +1 on the last tick for the winner and -1 for the
+loser (a single-player game always ends lost); done marks that last tick. Episodes cut off by
+max_ticks end without a done row. Games are told apart by the game field: generate() stores each
+game's seed there, which also replays it.
+
+    python dataset.py generate out/ [--games 10] [--bots greedy random] [--single] [--workers N] [--seed 0]
+    python dataset.py info out/
+"""
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+import numpy as np
+from bots import BOTS
+from observation import CHANNELS, TIMERS, Observation
+from snake_core import Game, TwoPlayerGame
+from replay import DIRECTIONS
+from tournament import GAME_MODES, match_seed, schedule
+
+FORMAT = 1
+CHUNK_ROWS = 8192
+
+def record_dtype(width, height):
+    return np.dtype([('obs', np.uint8, ((len(CHANNELS) + 7) // 8, height, width)), ('timers', np.int32, (len(TIMERS),)),
+                     ('action', np.int8), ('reward', np.float32), ('done', np.bool_),
+                     ('game', np.uint64), ('tick', np.uint32), ('player', np.uint8)])
+
+_BITS = (1 << np.arange(8, dtype=np.uint8))[:, None, None]
+
+def pack_observation(grid, out=None):
+    """(channels, height, width) 0/1 grid -> the stored 'obs' field: bit c % 8 of byte c // 8 is channel c.
+    Same layout as np.packbits(grid, axis=0, bitorder='little'), several times faster on small grids."""
+    if out is None: out = np.empty(((len(grid) + 7) // 8,) + grid.shape[1:], np.uint8)
+    for i in range(len(out)):
+        part = grid[8 * i:8 * i + 8]; np.bitwise_or.reduce(part * _BITS[:len(part)], axis=0, out=out[i])
+    return out
+
+def unpack_observations(obs):
+    """Stored 'obs' field(s), (..., bytes, height, width) -> uint8 (..., channels, height, width)."""
+    return np.unpackbits(obs, axis=-3, count=len(CHANNELS), bitorder='little')
+
+def _write_json(path, data):
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w') as f: json.dump(data, f)
+    os.replace(tmp, path) # Readers see the old file or the new one, never half of one
+
+def _meta(path, width, height):
+    """Create the dataset's meta.json, or check that an existing one has the same board size."""
+    meta = {'format': FORMAT, 'width': width, 'height': height, 'channels': list(CHANNELS), 'timers': list(TIMERS),
+            'directions': list(DIRECTIONS)}
+    meta_path = os.path.join(path, 'meta.json'); tmp = f'{meta_path}.{os.getpid()}.tmp'
+    with open(tmp, 'w') as f: json.dump(meta, f)
+    try: os.link(tmp, meta_path) # Atomic and exclusive: the first writer wins, nobody sees a partial file
+    except FileExistsError:
+        with open(meta_path) as f: existing = json.load(f)
+        if existing != meta: raise ValueError(f"{path} holds a {existing['width']}x{existing['height']} dataset, not {width}x{height}")
+    finally: os.remove(tmp)
+    return meta
+
+class TrajectoryWriter:
+    """Appends rows to one writer's chunks of a dataset directory (created if missing)."""
+    def __init__(self, path, width, height, name='w0', chunk_rows=CHUNK_ROWS):
+        os.makedirs(path, exist_ok=True)
+        _meta(path, width, height)
+        self.path = path; self.name = name; self.chunk_rows = chunk_rows
+        self.dtype = record_dtype(width, height)
+        self.index_path = os.path.join(path, f'index-{name}.json')
+        try: # Claim the name: an empty index, created exclusively
+            with open(self.index_path, 'x') as f: json.dump({'writer': name, 'chunks': []}, f)
+        except FileExistsError:
+            raise ValueError(f"writer {name!r} already wrote to {path}") from None
+        self.chunks = [] # (file name, rows) of the sealed chunks
+        self.rows = 0
+        self._chunk = None
+
+    def _open_chunk(self):
+        self._file = f'{self.name}-{len(self.chunks):06d}.rec'
+        self._chunk = np.memmap(os.path.join(self.path, self._file), self.dtype, 'w+', shape=(self.chunk_rows,))
+        c = self._chunk; self._n = 0
+        # Column views: assigning into a plain ndarray is much cheaper than into a record
+        self._columns = tuple(np.asarray(c[f]) for f in self.dtype.names) # obs, timers, action, ... in dtype order
+
+    def _seal(self):
+        n = self._n; self._chunk.flush()
+        self._chunk = self._columns = None # Unmap before cutting the unused tail off
+        os.truncate(os.path.join(self.path, self._file), n * self.dtype.itemsize)
+        self.chunks.append((self._file, n))
+        _write_json(self.index_path, {'writer': self.name, 'chunks': [{'file': f, 'rows': r} for f, r in self.chunks]})
+
+    def append(self, grid, timers, action, reward, done, game, tick, player):
+        if self._chunk is None: self._open_chunk()
+        n = self._n
+        obs, tim, act, rew, dn, gm, tk, pl = self._columns
+        pack_observation(grid, obs[n]); tim[n] = timers; act[n] = action; rew[n] = reward; dn[n] = done; gm[n] = game; tk[n] = tick; pl[n] = player
+        self._n = n + 1; self.rows += 1
+        if self._n == self.chunk_rows: self._seal()
+
+    def close(self):
+        if self._chunk is None: return
+        if self._n: self._seal()
+        else: # Opened but nothing written
+            self._chunk = self._columns = None; os.remove(os.path.join(self.path, self._file))
+
+    def __enter__(self): return self
+    def __exit__(self, *exc): self.close()
+
+def _scores(game):
+    return (game.get_score(),) if hasattr(game, 'snake') else game.get_scores()
+
+def _outcome(game, player):
+    if hasattr(game, 'snake'): return -1
+    return {'player1': 1, 'player2': -1}.get(game.winner, 0) * (1 if player == 1 else -1)
+
+def play_episode(writer, game, policies, game_id=0, max_ticks=3000, seed=0):
+    """Plays a Game (one policy) or TwoPlayerGame (two) with policies[k](game, k + 1, rng), the bots
+    convention, writing one row per player per tick. Returns the number of ticks played."""
+    players = range(1, len(policies) + 1)
+    timers = [np.zeros(len(TIMERS), np.int32) for _ in players]
+    observations = [Observation(game, p, np.uint8, timers_out=t) for p, t in zip(players, timers)]
+    rngs = [random.Random(seed + p) for p in players]
+    single = hasattr(game, 'snake'); start = game.tick
+    while not game.game_over and game.tick < max_ticks:
+        grids = [o.update()[0] for o in observations]
+        actions = [policy(game, p, rng) for policy, p, rng in zip(policies, players, rngs)]
+        for p, d in zip(players, actions):
+            if single: game.change_snake_direction(d)
+            else: game.change_snake_direction(p, d)
+        before = _scores(game); tick = game.tick
+        game.update()
+        done = game.game_over
+        for p, grid, t, d, b, a in zip(players, grids, timers, actions, before, _scores(game)):
+            writer.append(grid, t, DIRECTIONS.index(d), a - b + (_outcome(game, p) if done else 0), done, game_id, tick, p)
+    return game.tick - start
+
+# --- Parallel generation ---
+def _new_game(spec, single):
+    index, b1, b2, map_id, mode, target_score, seed, max_ticks, width, height = spec
+    if single: return Game(width, height, seed=seed), [BOTS[b1]]
+    game = TwoPlayerGame(width, height, map_id=map_id, game_mode=mode, target_score=target_score, seed=seed)
+    return game, [BOTS[b1], BOTS[b2]]
+
+def _write_job(job):
+    # One writer per job: its own chunk files and index, nothing shared with other workers
+    path, name, specs, single, chunk_rows = job
+    width, height = specs[0][8], specs[0][9]; ticks = 0
+    with TrajectoryWriter(path, width, height, name, chunk_rows) as writer:
+        for spec in specs:
+            game, policies = _new_game(spec, single)
+            ticks += play_episode(writer, game, policies, spec[6], spec[7], spec[6]) # The seed doubles as the game id
+        return len(specs), ticks, writer.rows
+
+def generate(path, specs, single=False, workers=None, chunk=16, chunk_rows=CHUNK_ROWS, progress=None):
+    """Plays tournament.schedule() specs (single: a Game per spec driven by its first bot) into the dataset
+    at path, `chunk` games per writer job. Returns (games, ticks, rows)."""
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(path, exist_ok=True)
+    taken = [os.path.basename(p)[7:-5] for p in glob.glob(os.path.join(path, 'index-w*.json'))]
+    first = max([int(n[1:]) + 1 for n in taken if n[1:].isdigit()], default=0) # Appending to a dataset: new writer names
+    jobs = [(path, f'w{first + k:05d}', specs[i:i + chunk], single, chunk_rows) for k, i in enumerate(range(0, len(specs), chunk))]
+    if workers == 1:
+        results = map(_write_job, jobs)
+    else:
+        pool = multiprocessing.Pool(workers)
+        results = pool.imap_unordered(_write_job, jobs)
+    totals = [0, 0, 0]
+    try:
+        for result in results:
+            totals = [t + r for t, r in zip(totals, result)]
+            if progress: progress(totals[0], len(specs))
+    finally:
+        if workers != 1: pool.close(); pool.join()
+    return tuple(totals)
+
+# --- Reading ---
+class TrajectoryDataset:
+    """Every sealed chunk of a dataset directory, memory-mapped read-only, as one sequence of rows.
+
+    dataset[i] is a record view and dataset[i:j] an array view when the rows share a chunk (a copy
+    otherwise); dataset.sample(indices) gathers a training batch. chunks are the per-chunk arrays.
+    """
+    def __init__(self, path):
+        with open(os.path.join(path, 'meta.json')) as f: self.meta = json.load(f)
+        if self.meta['format'] != FORMAT: raise ValueError(f"unsupported dataset format {self.meta['format']}")
+        self.path = path; self.width = self.meta['width']; self.height = self.meta['height']
+        self.dtype = record_dtype(self.width, self.height)
+        self.chunks = []
+        for index_path in sorted(glob.glob(os.path.join(path, 'index-*.json'))):
+            with open(index_path) as f: index = json.load(f)
+            for c in index['chunks']:
+                if c['rows']: self.chunks.append(np.memmap(os.path.join(path, c['file']), self.dtype, 'r', shape=(c['rows'],)))
+        self.offsets = np.cumsum([0] + [len(c) for c in self.chunks])
+
+    def __len__(self): return int(self.offsets[-1])
+
+    def _locate(self, i):
+        if i < 0: i += len(self)
+        if not 0 <= i < len(self): raise IndexError(i)
+        k = int(np.searchsorted(self.offsets, i, 'right')) - 1
+        return k, i - int(self.offsets[k])
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            start, stop, step = i.indices(len(self))
+            if step == 1 and start < stop:
+                k, a = self._locate(start)
+                if stop <= self.offsets[k + 1]: return self.chunks[k][a:a + stop - start]
+            return self.sample(np.arange(start, stop, step))
+        k, a = self._locate(i)
+        return self.chunks[k][a]
+
+    def sample(self, indices):
+        """Rows at the given global indices, gathered into one array (chunk by chunk)."""
+        indices = np.asarray(indices, np.int64)
+        if len(indices) and (indices.min() < 0 or indices.max() >= len(self)): raise IndexError("index out of range")
+        out = np.empty(len(indices), self.dtype)
+        k = np.searchsorted(self.offsets, indices, 'right') - 1
+        for c in np.unique(k):
+            mask = k == c
+            out[mask] = self.chunks[c][indices[mask] - self.offsets[c]]
+        return out
+
+    def info(self):
+        games = set()
+        for c in self.chunks: games.update(np.unique(c['game']).tolist())
+        return {'rows': len(self), 'chunks': len(self.chunks), 'games': len(games), 'board': f'{self.width}x{self.height}',
+                'row_bytes': self.dtype.itemsize, 'bytes': len(self) * self.dtype.itemsize}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest='command', required=True)
+    gen = sub.add_parser('generate', help='play self-play games into a dataset directory')
+    gen.add_argument('path')
+    gen.add_argument('--games', type=int, default=10, help='games per ordered bot pairing, map and mode (--single: in total)')
+    gen.add_argument('--bots', nargs=2, default=['greedy', 'random'], choices=sorted(BOTS))
+    gen.add_argument('--single', action='store_true', help="single-player games driven by the path bot")
+    gen.add_argument('--maps', type=int, nargs='+', default=None)
+    gen.add_argument('--modes', nargs='+', default=list(GAME_MODES), choices=GAME_MODES)
+    gen.add_argument('--max-ticks', type=int, default=3000)
+    gen.add_argument('--width', type=int, default=40)
+    gen.add_argument('--height', type=int, default=30)
+    gen.add_argument('--seed', type=int, default=0)
+    gen.add_argument('--workers', type=int, default=None, help='default: one per CPU; 1 runs in-process')
+    gen.add_argument('--chunk', type=int, default=16, help='games per writer job')
+    gen.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    inf = sub.add_parser('info', help='summarise a dataset directory')
+    inf.add_argument('path')
+    args = parser.parse_args(argv)
+
+    if args.command == 'info':
+        print(json.dumps(TrajectoryDataset(args.path).info(), indent=1)); return 0
+    if args.single:
+        specs = [(i, 'path', None, 0, 'last_snake', 0, match_seed(args.seed, i), args.max_ticks, args.width, args.height)
+                 for i in range(args.games)]
+    else:
+        specs = schedule(args.bots, args.games, args.maps, args.modes, max_ticks=args.max_ticks, seed=args.seed,
+                         width=args.width, height=args.height)
+    t0 = time.perf_counter()
+    games, ticks, rows = generate(args.path, specs, args.single, args.workers, args.chunk, args.chunk_rows)
+    elapsed = time.perf_counter() - t0
+    print(f"{games} games, {ticks} ticks, {rows} rows in {elapsed:.1f}s ({ticks / elapsed:.0f} ticks/s, "
+          f"{rows * record_dtype(args.width, args.height).itemsize / elapsed / 2**20:.1f} MiB/s)")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
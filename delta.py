@@ -0,0 +1,234 @@
+"""Delta-encoded state stream for spectators and remote renderers.
+
+DeltaEncoder watches a Game or TwoPlayerGame and, called once after each update(), returns a
+compact binary message: a keyframe with the whole visible state every `keyframe_interval`
+messages, and otherwise only what changed (heads added, tail cells dropped, foods eaten or
+spawned, power-up, scores, winner). DeltaDecoder applies the messages and rebuilds exactly what
+the getters (get_snake*_body, get_foods, get_obstacles, get_powerup_item_details, scores,
+winner) would return.
+
+Cells are sent as varint ids on the board padded by MARGIN cells per side, since a snake's head
+can end up off the board on the tick it dies (two cells off under speed_self). Message layouts:
+  keyframe  'K' tick kind width height map_id status | obstacles | per snake: score len cells | foods | power-up
+  delta     'D' tick_delta flags | per snake: header [direction byte | head cells] [cells] | foods | power-up | scores
+A snake header byte is heads_added (bits 0-1) | heads as direction codes (bit 2) |
+tail cells removed (bits 3-6) | full body follows (bit 7).
+"""
+from collections import deque
+
+POWERUP_TYPES = ('speed_self', 'wall_ghost', 'slow_opponent')
+WINNERS = (None, 'player1', 'player2', 'draw')
+DIRECTIONS = ((0, -1), (0, 1), (-1, 0), (1, 0)) # UP, DOWN, LEFT, RIGHT
+_FOODS, _POWERUP, _SCORES, _STATUS = 1, 2, 4, 8
+MARGIN = 2
+
+def _write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80); value >>= 7
+    out.append(value)
+
+class _Reader:
+    def __init__(self, data): self.data = data; self.pos = 0
+    def byte(self):
+        b = self.data[self.pos]; self.pos += 1
+        return b
+    def varint(self):
+        value = 0; shift = 0
+        while True:
+            b = self.data[self.pos]; self.pos += 1
+            value |= (b & 0x7F) << shift
+            if b < 0x80: return value
+            shift += 7
+
+def _snakes(game):
+    return (game.snake,) if hasattr(game, 'snake') else (game.snake1, game.snake2) # Game or bitboard.BitboardGame: one snake
+
+def _status(game):
+    return (WINNERS.index(getattr(game, 'winner', None)) << 1) | bool(game.game_over)
+
+def _powerup(game):
+    pu = game.powerup_item
+    return (pu.type_id, pu.position) if pu else None
+
+class StateView:
+    """What a renderer needs to draw a game, as rebuilt by DeltaDecoder (or read with view_of)."""
+    def __init__(self, kind, width, height):
+        self.kind = kind; self.width = width; self.height = height
+        self.tick = 0; self.map_id = 0; self.obstacles = []; self.bodies = [deque() for _ in range(kind)]
+        self.foods = []; self.powerup = None; self.scores = [0] * kind; self.game_over = False; self.winner = None
+
+    def as_tuple(self):
+        return (self.kind, self.width, self.height, self.tick, self.map_id, tuple(self.obstacles),
+                tuple(tuple(b) for b in self.bodies), tuple(self.foods), self.powerup, tuple(self.scores),
+                self.game_over, self.winner)
+
+def view_of(game):
+    kind = len(_snakes(game))
+    view = StateView(kind, game.width, game.height)
+    view.tick = game.tick; view.map_id = getattr(game, 'map_id', 0); view.obstacles = list(getattr(game, 'obstacles', []))
+    view.bodies = [deque(s.body) for s in _snakes(game)]; view.foods = list(game.foods)
+    view.powerup = _powerup(game); view.scores = [s.score for s in _snakes(game)]
+    view.game_over = game.game_over; view.winner = getattr(game, 'winner', None)
+    return view
+
+class DeltaEncoder:
+    def __init__(self, game, keyframe_interval=60):
+        self.game = game; self.keyframe_interval = keyframe_interval
+        self.messages = 0; self._prev = None; self._map_id = None
+        self._bodies = None # Bodies as the decoder last rebuilt them
+        w, h = game.width, game.height # One step in each direction, modulo the board (wall_ghost wraps)
+        self._step_codes = {(dx % w, dy % h): code for code, (dx, dy) in enumerate(DIRECTIONS)}
+
+    def _cell(self, pos): return (pos[1] + MARGIN) * (self.game.width + 2 * MARGIN) + pos[0] + MARGIN
+
+    def encode(self, keyframe=False):
+        """The message for the game's current state; the first call is always a keyframe."""
+        game = self.game
+        map_id = getattr(game, 'map_id', 0)
+        if keyframe or self._prev is None or self.messages % self.keyframe_interval == 0 or map_id != self._map_id:
+            out = self._keyframe(); self._map_id = map_id # Obstacles only travel in keyframes
+        else:
+            out = self._delta()
+        self.messages += 1
+        self._prev = (game.tick, list(game.foods), _powerup(game), [s.score for s in _snakes(game)], _status(game))
+        return bytes(out)
+
+    def _keyframe(self):
+        game = self.game; cell = self._cell; snakes = _snakes(game)
+        out = bytearray(b'K')
+        for v in (game.tick, len(snakes), game.width, game.height, getattr(game, 'map_id', 0), _status(game)):
+            _write_varint(out, v)
+        obstacles = getattr(game, 'obstacles', [])
+        _write_varint(out, len(obstacles))
+        for pos in obstacles: _write_varint(out, cell(pos))
+        for s in snakes:
+            _write_varint(out, s.score); _write_varint(out, len(s.body))
+            for pos in s.body: _write_varint(out, cell(pos))
+        self._bodies = [deque(s.body) for s in snakes]
+        self._write_foods(out, (), game.foods)
+        self._write_powerup(out, _powerup(game))
+        return out
+
+    def _delta(self):
+        game = self.game; snakes = _snakes(game)
+        prev_tick, prev_foods, prev_pu, prev_scores, prev_status = self._prev
+        foods = game.foods; pu = _powerup(game); scores = [s.score for s in snakes]; status = _status(game)
+        flags = ((_FOODS if foods != prev_foods else 0) | (_POWERUP if pu != prev_pu else 0) |
+                 (_SCORES if scores != prev_scores else 0) | (_STATUS if status != prev_status else 0))
+        out = bytearray(b'D')
+        _write_varint(out, game.tick - prev_tick); out.append(flags)
+        for s, mirror in zip(snakes, self._bodies): self._write_snake(out, s, mirror)
+        if flags & _FOODS:
+            prev_set = set(prev_foods); cur_set = set(foods)
+            self._write_foods(out, [p for p in prev_foods if p not in cur_set], [p for p in foods if p not in prev_set])
+        if flags & _POWERUP: self._write_powerup(out, pu)
+        if flags & _SCORES:
+            for v in scores: _write_varint(out, v)
+        if flags & _STATUS: out.append(status)
+        return out
+
+    def _write_snake(self, out, snake, mirror):
+        """Writes how `snake` changed since `mirror` (the body as the decoder has it) and updates the mirror."""
+        body = snake.body; n = len(body); m = len(mirror)
+        # The body only changes by pushing heads (possibly wrapped) and popping the tail: find how many
+        # heads are new, then check the ends line up with what the decoder will rebuild
+        for k in range(min(n, 3) + 1):
+            removed = m + k - n
+            if not 0 <= removed < 16 or removed > m: continue
+            if k < n and body[k] != mirror[0]: continue
+            if body[-1] == (mirror[m - 1 - removed] if removed < m else body[k - 1]): break
+        else:
+            out.append(0x80); _write_varint(out, n)
+            for pos in body: _write_varint(out, self._cell(pos))
+            mirror.clear(); mirror.extend(body)
+            return
+        heads = [body[i] for i in range(k - 1, -1, -1)] # Oldest first
+        codes = []; x, y = mirror[0]; w, h = self.game.width, self.game.height; step_codes = self._step_codes
+        for hx, hy in heads: # Direction codes wrap on the decoder, so only for heads on the board
+            code = step_codes.get(((hx - x) % w, (hy - y) % h)) if 0 <= hx < w and 0 <= hy < h else None
+            if code is None: codes = None; break
+            codes.append(code); x, y = hx, hy
+        if codes is not None and k:
+            out.append(k | 0x04 | removed << 3)
+            out.append(sum(c << (2 * i) for i, c in enumerate(codes)))
+        else:
+            out.append(k | removed << 3)
+            for pos in heads: _write_varint(out, self._cell(pos))
+        mirror.extendleft(heads)
+        for _ in range(removed): mirror.pop()
+
+    def _write_foods(self, out, removed, added):
+        _write_varint(out, len(removed))
+        for pos in removed: _write_varint(out, self._cell(pos))
+        _write_varint(out, len(added))
+        for pos in added: _write_varint(out, self._cell(pos))
+
+    def _write_powerup(self, out, pu):
+        if pu is None: out.append(0); return
+        out.append(1 + POWERUP_TYPES.index(pu[0])); _write_varint(out, self._cell(pu[1]))
+
+class DeltaDecoder:
+    def __init__(self):
+        self.view = None
+
+    def apply(self, data):
+        """Apply one message and return the updated StateView."""
+        r = _Reader(data)
+        kind = r.byte()
+        if kind == ord('K'): self._keyframe(r)
+        elif kind == ord('D'):
+            if self.view is None: raise ValueError("delta received before the first keyframe")
+            self._delta(r)
+        else: raise ValueError(f"unknown message type {kind!r}")
+        return self.view
+
+    def _pos(self, c):
+        stride = self.view.width + 2 * MARGIN
+        return (c % stride - MARGIN, c // stride - MARGIN)
+
+    def _keyframe(self, r):
+        tick, kind, width, height, map_id, status = (r.varint() for _ in range(6))
+        v = self.view = StateView(kind, width, height)
+        v.tick = tick; v.map_id = map_id; self._set_status(status)
+        v.obstacles = [self._pos(r.varint()) for _ in range(r.varint())]
+        for i in range(kind):
+            v.scores[i] = r.varint()
+            v.bodies[i] = deque(self._pos(r.varint()) for _ in range(r.varint()))
+        self._foods(r); self._powerup(r)
+
+    def _delta(self, r):
+        v = self.view
+        v.tick += r.varint(); flags = r.byte()
+        for body in v.bodies: self._snake(r, body)
+        if flags & _FOODS: self._foods(r)
+        if flags & _POWERUP: self._powerup(r)
+        if flags & _SCORES: v.scores = [r.varint() for _ in range(v.kind)]
+        if flags & _STATUS: self._set_status(r.byte())
+
+    def _snake(self, r, body):
+        header = r.byte()
+        if header & 0x80:
+            cells = [self._pos(r.varint()) for _ in range(r.varint())]
+            body.clear(); body.extend(cells); return
+        k = header & 0x03; removed = (header >> 3) & 0x0F
+        w, h = self.view.width, self.view.height
+        if header & 0x04:
+            codes = r.byte(); x, y = body[0]
+            for i in range(k):
+                dx, dy = DIRECTIONS[(codes >> (2 * i)) & 3]
+                x, y = (x + dx) % w, (y + dy) % h; body.appendleft((x, y))
+        else:
+            for _ in range(k): body.appendleft(self._pos(r.varint()))
+        for _ in range(removed): body.pop()
+
+    def _foods(self, r):
+        foods = self.view.foods
+        for _ in range(r.varint()): foods.remove(self._pos(r.varint()))
+        for _ in range(r.varint()): foods.append(self._pos(r.varint()))
+
+    def _powerup(self, r):
+        code = r.byte()
+        self.view.powerup = (POWERUP_TYPES[code - 1], self._pos(r.varint())) if code else None
+
+    def _set_status(self, status):
+        self.view.game_over = bool(status & 1); self.view.winner = WINNERS[status >> 1]
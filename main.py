@@ -1,5 +1,12 @@
-import pygame
+import argparse
+import os
 import sys
+import time
+from collections import OrderedDict, deque, namedtuple
+from itertools import chain
+import pygame
+import maps
+from metrics import Histogram
 from snake_core import Game, TwoPlayerGame # Import TwoPlayerGame
 
 # --- Constants ---
@@ -25,32 +32,228 @@ POWERUP_PYGAME_COLORS = {
     'PURPLE': (128, 0, 128),
 }
 
-FPS = 7  # Frames per second, controls game speed (decreased from 10)
-
-# --- Pygame Initialization ---
-pygame.init()
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Snake Game")
-clock = pygame.time.Clock()
-font = pygame.font.SysFont(None, 48) # Increased font size
-game_over_font = pygame.font.SysFont(None, 100) # Increased game over font size
+FPS = 7  # Game ticks per second, controls game speed (decreased from 10)
+# Frames are drawn (and keys polled) at this rate, independently of the game ticks: snakes glide
+# between cells, and a press buffered in the game (queue_turn) reaches the snake at its next move
+# step, at most 1/FPS + 1/RENDER_FPS later
+RENDER_FPS = 60
+MAX_TICKS_PER_FRAME = 5 # Frame skip: a late frame runs up to this many game ticks before drawing once
+P1_KEYS = {pygame.K_UP: 'UP', pygame.K_DOWN: 'DOWN', pygame.K_LEFT: 'LEFT', pygame.K_RIGHT: 'RIGHT'} # Arrows
+P2_KEYS = {pygame.K_w: 'UP', pygame.K_s: 'DOWN', pygame.K_a: 'LEFT', pygame.K_d: 'RIGHT'} # WASD
+BUILTIN_MAP_TITLES = {0: "Classic (No Obstacles)", 1: "Central Blocks", 2: "Pillars"} # Map files use their name: line
+
+# --- Text Render Cache ---
+class TextCache:
+    """Bounded LRU cache of rendered (antialiased) text surfaces keyed by (font, text, colour).
+
+    Surfaces are shared between callers and must not be drawn on.
+    """
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color):
+        key = (font, text, color)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.maxsize:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._surfaces), 'maxsize': self.maxsize}
+
+# --- Input Latency ---
+class InputLatency:
+    """Key-to-move latency: from the poll that saw a key press to the game tick that took it off the snake's queue.
+
+    Presses are matched to the snakes' input queues in order. Dropped presses (queue full) are not
+    counted; presses the game discards as repeats or reversals are counted when they leave the queue.
+    """
+    def __init__(self, clock=time.perf_counter_ns):
+        self.clock = clock
+        self.histogram = Histogram()
+        self._pending = {} # snake id -> press times of its queued inputs
+
+    def pressed(self, snake, accepted):
+        if accepted:
+            self._pending.setdefault(snake.id, deque()).append(self.clock())
+
+    def ticked(self, snakes):
+        now = self.clock()
+        for snake in snakes:
+            times = self._pending.get(snake.id)
+            while times and len(times) > len(snake.input_queue):
+                self.histogram.record(now - times.popleft())
+
+    def reset(self): # New game: forget presses that were still queued
+        self._pending = {}
+
+# --- Fixed Timestep ---
+class FixedTimestep:
+    """Game ticks at a fixed rate, decoupled from the frame rate.
+
+    advance() is called once per frame and returns how many ticks to run before drawing it; alpha is
+    then how far (0..1) real time has moved towards the next tick, for interpolation. When frames
+    come late, several ticks run before one frame is drawn (frames are skipped, the game keeps its
+    speed); beyond max_ticks ticks the backlog is dropped and the game slows down instead of
+    spiralling. realtime=False runs exactly one tick per frame (headless runs are not paced).
+    """
+    def __init__(self, rate, max_ticks=MAX_TICKS_PER_FRAME, realtime=True, clock=time.perf_counter):
+        self.dt = 1 / rate
+        self.max_ticks = max_ticks
+        self.realtime = realtime
+        self.clock = clock
+        self.alpha = 1.0
+        self.skipped_frames = 0 # Frames not drawn because their ticks ran in a later frame
+        self.dropped_ticks = 0 # Ticks given up when even max_ticks per frame could not keep up
+        self.reset()
+
+    def reset(self): # After a pause (menus, game over): start from now, with one tick due
+        self._last = self.clock()
+        self._accumulator = self.dt
+
+    def advance(self):
+        if not self.realtime:
+            self.alpha = 1.0
+            return 1
+        now = self.clock()
+        self._accumulator += now - self._last
+        self._last = now
+        ticks = int(self._accumulator / self.dt)
+        if ticks > self.max_ticks:
+            self.dropped_ticks += ticks - self.max_ticks
+            ticks = self.max_ticks
+            self._accumulator = ticks * self.dt
+        self._accumulator -= ticks * self.dt
+        if ticks > 1:
+            self.skipped_frames += ticks - 1
+        self.alpha = self._accumulator / self.dt
+        return ticks
+
+class FrameTimes:
+    """Simulation and render time per frame (ns histograms), reported separately."""
+    def __init__(self):
+        self.simulation = Histogram() # Frames that ran at least one game tick
+        self.render = Histogram()
+        self.ticks = 0
+
+    def report(self, timestep=None):
+        def ms(h):
+            s = h.summary()
+            return {'frames': s['count'], 'mean_ms': s['sum_ns'] / max(s['count'], 1) / 1e6,
+                    'p99_ms': (s['p99_ns'] or 0) / 1e6, 'max_ms': (s['max_ns'] or 0) / 1e6}
+        report = {'ticks': self.ticks, 'simulation': ms(self.simulation), 'render': ms(self.render)}
+        if timestep is not None:
+            report.update(skipped_frames=timestep.skipped_frames, dropped_ticks=timestep.dropped_ticks)
+        return report
+
+# --- Render Context ---
+class RenderContext:
+    """Owns the display surface, clock and fonts. Nothing touches SDL until first use.
+
+    headless=True selects SDL's dummy video driver so the draw_* helpers and game loops run
+    without a display (CI, render farms); offscreen=True also skips opening a window and
+    draws into a plain Surface. timestep paces the game ticks; input_latency and frame_times
+    collect key-to-move latencies and simulation/render times. renderer names the RENDERERS
+    entry games draw with: 'dirty' (changed cells only) or 'bulk' (NumPy, for large boards).
+    """
+    def __init__(self, headless=False, offscreen=False, renderer='dirty'):
+        self.headless = headless or offscreen
+        self.offscreen = offscreen
+        self.renderer = renderer
+        self._screen = None
+        self._clock = None
+        self._font = None
+        self._game_over_font = None
+        self.backgrounds = {} # Static board surfaces keyed by obstacle layout
+        self.text_cache = TextCache()
+        self.timestep = FixedTimestep(FPS, realtime=not self.headless)
+        self.input_latency = InputLatency()
+        self.frame_times = FrameTimes()
+
+    def init(self):
+        if self._screen is not None:
+            return self
+        if self.headless:
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+        pygame.init()
+        if self.offscreen:
+            self._screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        else:
+            self._screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            pygame.display.set_caption("Snake Game")
+        self._clock = pygame.time.Clock()
+        self._font = pygame.font.SysFont(None, 48) # Increased font size
+        self._game_over_font = pygame.font.SysFont(None, 100) # Increased game over font size
+        return self
+
+    @property
+    def screen(self):
+        return self.init()._screen
+
+    @property
+    def clock(self):
+        return self.init()._clock
+
+    @property
+    def font(self):
+        return self.init()._font
+
+    @property
+    def game_over_font(self):
+        return self.init()._game_over_font
+
+    def render_text(self, text, color, font=None):
+        return self.text_cache.render(font or self.font, text, color)
+
+    def present(self, rects=None):
+        if self.offscreen:
+            return
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+
+    def tick(self, fps):
+        # Headless runs are not paced to wall-clock time
+        self.clock.tick(0 if self.headless else fps)
+
+    def close(self):
+        if self._screen is not None:
+            pygame.quit()
+            self._screen = None
+            self.backgrounds = {}
+            self.text_cache.clear() # Cached surfaces belong to the closed fonts
 
 # --- Helper Functions ---
-def draw_grid():
+def draw_grid(ctx):
     for x in range(0, SCREEN_WIDTH, GRID_SIZE):
-        pygame.draw.line(screen, GRAY, (x, 0), (x, SCREEN_HEIGHT))
+        pygame.draw.line(ctx.screen, GRAY, (x, 0), (x, SCREEN_HEIGHT))
     for y in range(0, SCREEN_HEIGHT, GRID_SIZE):
-        pygame.draw.line(screen, GRAY, (0, y), (SCREEN_WIDTH, y))
+        pygame.draw.line(ctx.screen, GRAY, (0, y), (SCREEN_WIDTH, y))
 
-def draw_snake(snake_body, color=GREEN): # Added color parameter
+def draw_snake(ctx, snake_body, color=GREEN): # Added color parameter
     for segment in snake_body:
-        pygame.draw.rect(screen, color, (segment[0] * GRID_SIZE, segment[1] * GRID_SIZE, GRID_SIZE, GRID_SIZE))
+        pygame.draw.rect(ctx.screen, color, (segment[0] * GRID_SIZE, segment[1] * GRID_SIZE, GRID_SIZE, GRID_SIZE))
 
-def draw_foods(foods_list): # MODIFIED: Renamed and takes a list
+def draw_foods(ctx, foods_list): # MODIFIED: Renamed and takes a list
     for food_position in foods_list: # MODIFIED: Loop through the list
-        pygame.draw.rect(screen, RED, (food_position[0] * GRID_SIZE, food_position[1] * GRID_SIZE, GRID_SIZE, GRID_SIZE))
+        pygame.draw.rect(ctx.screen, RED, (food_position[0] * GRID_SIZE, food_position[1] * GRID_SIZE, GRID_SIZE, GRID_SIZE))
 
-def display_score_single(game_obj): # Modified signature to take game object
+def score_text_single(game_obj):
     score = game_obj.get_score()
     score_text_str = f"Score: {score}"
 
@@ -61,36 +264,34 @@ def display_score_single(game_obj): # Modified signature to take game object
             symbol = powerup_def['symbol']
             timer_secs = round(snake.powerup_effect_timer / FPS)
             score_text_str += f" [{symbol}: {timer_secs}s]"
+    return score_text_str
 
-    score_text_render = font.render(score_text_str, True, BLACK)
-    screen.blit(score_text_render, (10, 10))
+def display_score_single(ctx, game_obj): # Modified signature to take game object
+    score_text_render = ctx.render_text(score_text_single(game_obj), BLACK)
+    ctx.screen.blit(score_text_render, (10, 10))
 
-def draw_obstacles(obstacle_coords):
+def draw_obstacles(ctx, obstacle_coords):
     for x, y in obstacle_coords:
         rect = pygame.Rect(x * GRID_SIZE, y * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-        pygame.draw.rect(screen, OBSTACLE_COLOR, rect)
+        pygame.draw.rect(ctx.screen, OBSTACLE_COLOR, rect)
 
-def draw_powerup_item(details):
+def draw_powerup_item(ctx, details):
     if not details:
         return
     
     pup_color_str = details['color']
     pup_pygame_color = POWERUP_PYGAME_COLORS.get(pup_color_str, BLACK) # Default to BLACK if color str not found
     pup_rect = pygame.Rect(details['position'][0] * GRID_SIZE, details['position'][1] * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-    pygame.draw.rect(screen, pup_pygame_color, pup_rect)
+    pygame.draw.rect(ctx.screen, pup_pygame_color, pup_rect)
     
-    symbol_text = font.render(details['symbol'], True, BLACK) # Black symbol text
+    symbol_text = ctx.render_text(details['symbol'], BLACK) # Black symbol text
     text_rect = symbol_text.get_rect(center=pup_rect.center)
-    screen.blit(symbol_text, text_rect)
+    ctx.screen.blit(symbol_text, text_rect)
 
-def display_scores_two_player(game_obj): # Pass the whole game object
+def score_texts_two_player(game_obj): # Returns (target text or None, P1 text, P2 text)
     s1_score = game_obj.snake1.score
     s2_score = game_obj.snake2.score
-    
-    # Display Target Score if applicable
-    if game_obj.game_mode == 'first_to_x':
-        target_text = font.render(f"Target: {game_obj.target_score}", True, BLACK)
-        screen.blit(target_text, (SCREEN_WIDTH // 2 - target_text.get_width() // 2, 10))
+    target_text_str = f"Target: {game_obj.target_score}" if game_obj.game_mode == 'first_to_x' else None
 
     p1_text_str = f"P1 Score: {s1_score}"
     if game_obj.snake1.active_powerup_type:
@@ -103,40 +304,293 @@ def display_scores_two_player(game_obj): # Pass the whole game object
         symbol = game_obj.POWERUP_DEFINITIONS[game_obj.snake2.active_powerup_type]['symbol']
         timer_secs = round(game_obj.snake2.powerup_effect_timer / FPS)
         p2_text_str += f" [{symbol}: {timer_secs}s]"
+    return target_text_str, p1_text_str, p2_text_str
 
-    score1_text_render = font.render(p1_text_str, True, game_obj.get_snake1_color()) # Use snake's actual color
-    score2_text_render = font.render(p2_text_str, True, game_obj.get_snake2_color()) # Use snake's actual color
-    
-    screen.blit(score1_text_render, (10, 10))
-    screen.blit(score2_text_render, (SCREEN_WIDTH - score2_text_render.get_width() - 10, 10))
-
+def display_scores_two_player(ctx, game_obj): # Pass the whole game object
+    target_text_str, p1_text_str, p2_text_str = score_texts_two_player(game_obj)
 
-def display_game_over_single(score):
-    game_over_text = game_over_font.render("GAME OVER", True, RED)
-    score_text = font.render(f"Final Score: {score}", True, BLACK)
-    instructions_text = font.render("R: Restart | M: Menu | Q: Quit", True, BLACK)
-
-    screen.blit(game_over_text, (SCREEN_WIDTH // 2 - game_over_text.get_width() // 2, SCREEN_HEIGHT // 3 - game_over_text.get_height() // 2))
-    screen.blit(score_text, (SCREEN_WIDTH // 2 - score_text.get_width() // 2, SCREEN_HEIGHT // 2 - score_text.get_height() // 2))
-    screen.blit(instructions_text, (SCREEN_WIDTH // 2 - instructions_text.get_width() // 2, SCREEN_HEIGHT * 2 // 3 - instructions_text.get_height() // 2))
-    pygame.display.flip()
+    # Display Target Score if applicable
+    if target_text_str:
+        target_text = ctx.render_text(target_text_str, BLACK)
+        ctx.screen.blit(target_text, (SCREEN_WIDTH // 2 - target_text.get_width() // 2, 10))
 
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_q:
-                    pygame.quit()
-                    sys.exit()
-                if event.key == pygame.K_r:
-                    return 'restart'
-                if event.key == pygame.K_m:
-                    return 'menu'
-        clock.tick(5)
-
-def display_game_over_two_player(winner, score1, score2):
+    score1_text_render = ctx.render_text(p1_text_str, game_obj.get_snake1_color()) # Use snake's actual color
+    score2_text_render = ctx.render_text(p2_text_str, game_obj.get_snake2_color()) # Use snake's actual color
+    
+    ctx.screen.blit(score1_text_render, (10, 10))
+    ctx.screen.blit(score2_text_render, (SCREEN_WIDTH - score2_text_render.get_width() - 10, 10))
+
+# --- Dirty-Rectangle Rendering ---
+def get_background(ctx, obstacle_coords=()):
+    """Pre-rendered white board with grid lines and the map's obstacles, cached on the context per layout."""
+    key = tuple(obstacle_coords)
+    background = ctx.backgrounds.get(key)
+    if background is None:
+        background = pygame.Surface(ctx.screen.get_size())
+        if not ctx.offscreen:
+            background = background.convert() # Match the display format for fast blits
+        background.fill(WHITE)
+        for x in range(0, SCREEN_WIDTH, GRID_SIZE):
+            pygame.draw.line(background, GRAY, (x, 0), (x, SCREEN_HEIGHT))
+        for y in range(0, SCREEN_HEIGHT, GRID_SIZE):
+            pygame.draw.line(background, GRAY, (0, y), (SCREEN_WIDTH, y))
+        for x, y in obstacle_coords:
+            pygame.draw.rect(background, OBSTACLE_COLOR, (x * GRID_SIZE, y * GRID_SIZE, GRID_SIZE, GRID_SIZE))
+        ctx.backgrounds[key] = background
+    return background
+
+# Part of a cell, filled for a snake gliding between cells: a colour and the pixel rect to fill
+CellPart = namedtuple('CellPart', 'color rect')
+
+def _part_rect(pos, toward, fraction):
+    """Pixel rect covering `fraction` of cell pos on the side facing the adjacent cell `toward`."""
+    x, y = pos[0] * GRID_SIZE, pos[1] * GRID_SIZE
+    n = max(1, round(GRID_SIZE * fraction))
+    if toward[0] > pos[0]: return (x + GRID_SIZE - n, y, n, GRID_SIZE)
+    if toward[0] < pos[0]: return (x, y, n, GRID_SIZE)
+    if toward[1] > pos[1]: return (x, y + GRID_SIZE - n, GRID_SIZE, n)
+    return (x, y, GRID_SIZE, n)
+
+def snake_motion(snake):
+    """What the interpolation needs to remember of a snake before a tick: (head, tail, length)."""
+    return snake.body[0], snake.body[-1], len(snake.body)
+
+def board_cells(snakes, foods_list, powerup_details, alpha=1.0):
+    """Cell -> fill colour (or CellPart) for everything drawn over the background, in the loops' draw
+    order (later wins). snakes: (body, colour) or (body, colour, snake_motion before the last tick);
+    with alpha < 1 a snake that moved one cell is drawn that far from its previous position: the
+    new head cell fills up from the old head while the vacated tail cell empties towards the new tail."""
+    cells = {}
+    for snake in snakes:
+        snake_body, color = snake[0], snake[1]
+        for segment in snake_body:
+            cells[segment] = color
+        if alpha < 1 and len(snake) > 2:
+            head, tail, length = snake[2]; new_head = snake_body[0]
+            if abs(new_head[0] - head[0]) + abs(new_head[1] - head[1]) == 1: # Wraps and two-cell moves just jump
+                cells[new_head] = CellPart(color, _part_rect(new_head, head, alpha))
+                if len(snake_body) == length and tail not in cells: # Not grown: the old tail cell was vacated
+                    cells[tail] = CellPart(color, _part_rect(tail, snake_body[-1] if length > 1 else new_head, 1 - alpha))
+    for food_position in foods_list:
+        cells[food_position] = RED
+    if powerup_details:
+        cells[powerup_details['position']] = POWERUP_PYGAME_COLORS.get(powerup_details['color'], BLACK)
+    return cells
+
+class DirtyRenderer:
+    """Draws a board frame by updating only what changed since the previous frame.
+
+    Cells whose colour changed are restored from the cached background and refilled. Overlays
+    (power-up symbol, HUD text) are (name, key, render_fn) entries: render_fn() -> (surface, rect)
+    is only called when the key changes, and the overlay is re-blitted whenever anything under it
+    was redrawn. The changed rectangles are pushed with pygame.display.update(rects).
+    """
+    def __init__(self, ctx, obstacle_coords=()):
+        self.ctx = ctx
+        self.background = get_background(ctx, obstacle_coords)
+        self.cells = {}
+        self.overlays = {} # name -> (key, surface, rect)
+        self.full_redraw = True
+
+    def invalidate(self):
+        self.full_redraw = True
+
+    def _cell_rect(self, pos):
+        return pygame.Rect(pos[0] * GRID_SIZE, pos[1] * GRID_SIZE, GRID_SIZE, GRID_SIZE)
+
+    def _fill(self, pos, value): # value: a colour for the whole cell or a CellPart
+        if isinstance(value, CellPart):
+            pygame.draw.rect(self.ctx.screen, value.color, value.rect)
+        else:
+            pygame.draw.rect(self.ctx.screen, value, self._cell_rect(pos))
+
+    def _redraw_area(self, rect, cells):
+        # Restore the background under rect and refill every occupied cell it touches
+        screen = self.ctx.screen
+        screen.blit(self.background, rect, rect)
+        screen.set_clip(rect)
+        for gx in range(rect.left // GRID_SIZE, (rect.right - 1) // GRID_SIZE + 1):
+            for gy in range(rect.top // GRID_SIZE, (rect.bottom - 1) // GRID_SIZE + 1):
+                color = cells.get((gx, gy))
+                if color is not None:
+                    self._fill((gx, gy), color)
+        screen.set_clip(None)
+
+    def render(self, cells, overlays=()):
+        screen = self.ctx.screen
+        new_overlays = {}
+        for name, key, render_fn in overlays:
+            old = self.overlays.get(name)
+            if old is not None and old[0] == key:
+                new_overlays[name] = old
+            else:
+                surface, dest = render_fn()
+                rect = dest if isinstance(dest, pygame.Rect) else surface.get_rect(topleft=dest)
+                new_overlays[name] = (key, surface, rect)
+
+        if self.full_redraw:
+            screen.blit(self.background, (0, 0))
+            for pos, color in cells.items():
+                self._fill(pos, color)
+            for _, surface, rect in new_overlays.values():
+                screen.blit(surface, rect)
+            self.cells = dict(cells); self.overlays = new_overlays; self.full_redraw = False
+            self.ctx.present()
+            return
+
+        dirty = []
+        old_cells = self.cells
+        for pos, color in cells.items():
+            if old_cells.get(pos) != color:
+                rect = self._cell_rect(pos)
+                screen.blit(self.background, rect, rect)
+                self._fill(pos, color)
+                dirty.append(rect)
+        for pos in old_cells:
+            if pos not in cells:
+                rect = self._cell_rect(pos)
+                screen.blit(self.background, rect, rect)
+                dirty.append(rect)
+
+        # Areas to rebuild from background + cells: old rects of changed overlays, and every overlay
+        # touching anything dirty (repeated until stable, since overlays can overlap each other)
+        restore = [old[2] for name, old in self.overlays.items()
+                   if name not in new_overlays or new_overlays[name][0] != old[0]]
+        dirty.extend(restore)
+        to_draw = set()
+        changed = True
+        while changed:
+            changed = False
+            for name, (key, surface, rect) in new_overlays.items():
+                if name in to_draw:
+                    continue
+                old = self.overlays.get(name)
+                if old is None or old[0] != key or rect.collidelist(dirty) != -1:
+                    to_draw.add(name); restore.append(rect); dirty.append(rect); changed = True
+        for rect in restore:
+            self._redraw_area(rect, cells)
+        for name, (key, surface, rect) in new_overlays.items():
+            if name in to_draw:
+                screen.blit(surface, rect)
+
+        self.cells = dict(cells); self.overlays = new_overlays
+        if dirty:
+            self.ctx.present(dirty)
+
+class BulkRenderer:
+    """Draws every frame whole through NumPy, for large boards where one rect per cell dominates.
+
+    The board is written into a width x height array of palette indices (background, obstacles,
+    then every colour seen), expanded to GRID_SIZE pixels with the grid lines by broadcasting and
+    pushed with a single surfarray blit, so the pixel work is the same however many cells are
+    filled. Same interface as DirtyRenderer; CellParts and overlays are drawn over the blit.
+    """
+    def __init__(self, ctx, obstacle_coords=()):
+        import numpy as np # Only loaded when this renderer is selected
+        self.np = np; self.ctx = ctx
+        self.size = ctx.screen.get_size()
+        self.width = -(-self.size[0] // GRID_SIZE); self.height = -(-self.size[1] // GRID_SIZE)
+        self.colors = {} # Fill value -> palette index
+        self.fills = []; self.lines = [] # Pixel value per palette index inside a cell and on its grid lines
+        for color in (WHITE, OBSTACLE_COLOR, GREEN, BLUE, RED, BLACK, *POWERUP_PYGAME_COLORS.values()):
+            self._index(color)
+        self.base = np.zeros((self.width, self.height), np.intp) # x-major like surfarray; 0 is the background
+        for x, y in obstacle_coords:
+            if 0 <= x < self.width and 0 <= y < self.height: self.base[x, y] = self.colors[OBSTACLE_COLOR]
+        # Cell (x, y) covers pixels[x, :, y, :]; the view below drops the part of the last cells off screen
+        self.pixels = np.empty((self.width, GRID_SIZE, self.height, GRID_SIZE), np.uint32)
+        self.overlays = {} # name -> (key, surface, rect)
+
+    def _index(self, color):
+        np = self.np; screen = self.ctx.screen
+        i = self.colors[color] = len(self.fills)
+        self.fills.append(screen.map_rgb(pygame.Color(color)))
+        self.lines.append(screen.map_rgb(GRAY) if i == 0 else self.fills[-1]) # Filled cells cover their grid lines
+        self.fill_palette = np.array(self.fills, np.uint32); self.line_palette = np.array(self.lines, np.uint32)
+        return i
+
+    def invalidate(self):
+        pass # Every frame is drawn whole
+
+    def render(self, cells, overlays=()):
+        np = self.np; screen = self.ctx.screen
+        indices = list(map(self.colors.get, cells.values()))
+        parts = []
+        if None in indices: # CellParts and colours not in the palette yet
+            for n, value in enumerate(cells.values()):
+                if indices[n] is not None: continue
+                if isinstance(value, CellPart): parts.append(value); indices[n] = -1 # Drawn over whatever is under it
+                else: indices[n] = self._index(value)
+        board = self.base.copy()
+        if cells:
+            xy = np.fromiter(chain.from_iterable(cells), np.intp, 2 * len(cells)).reshape(-1, 2)
+            indices = np.array(indices, np.intp)
+            keep = (indices >= 0) & (xy[:, 0] >= 0) & (xy[:, 0] < self.width) & (xy[:, 1] >= 0) & (xy[:, 1] < self.height)
+            board[xy[keep, 0], xy[keep, 1]] = indices[keep]
+        pixels = self.pixels; lines = self.line_palette[board]
+        pixels[:] = self.fill_palette[board][:, None, :, None]
+        pixels[:, 0, :, :] = lines[:, :, None]; pixels[:, :, :, 0] = lines[:, None, :]
+        pygame.surfarray.blit_array(screen, pixels.reshape(self.width * GRID_SIZE, -1)[:self.size[0], :self.size[1]])
+        for part in parts:
+            pygame.draw.rect(screen, part.color, part.rect)
+
+        new_overlays = {}
+        for name, key, render_fn in overlays:
+            old = self.overlays.get(name)
+            if old is not None and old[0] == key:
+                new_overlays[name] = old
+            else:
+                surface, dest = render_fn()
+                rect = dest if isinstance(dest, pygame.Rect) else surface.get_rect(topleft=dest)
+                new_overlays[name] = (key, surface, rect)
+            screen.blit(new_overlays[name][1], new_overlays[name][2])
+        self.overlays = new_overlays
+        self.ctx.present()
+
+RENDERERS = {'dirty': DirtyRenderer, 'bulk': BulkRenderer} # RenderContext(renderer=...) / --renderer
+
+def powerup_overlay(ctx, details):
+    # (name, key, render_fn) for the power-up symbol drawn over its cell
+    def render():
+        pup_rect = pygame.Rect(details['position'][0] * GRID_SIZE, details['position'][1] * GRID_SIZE, GRID_SIZE, GRID_SIZE)
+        symbol_text = ctx.render_text(details['symbol'], BLACK)
+        return symbol_text, symbol_text.get_rect(center=pup_rect.center)
+    return ('powerup', (details['symbol'], details['position']), render)
+
+def hud_overlays_single(ctx, game_obj):
+    text = score_text_single(game_obj)
+    return [('score', text, lambda: (ctx.render_text(text, BLACK), (10, 10)))]
+
+def hud_overlays_two_player(ctx, game_obj):
+    target_text_str, p1_text_str, p2_text_str = score_texts_two_player(game_obj)
+    c1 = game_obj.get_snake1_color(); c2 = game_obj.get_snake2_color()
+    def render_p2():
+        surface = ctx.render_text(p2_text_str, c2)
+        return surface, (SCREEN_WIDTH - surface.get_width() - 10, 10)
+    overlays = []
+    if target_text_str:
+        def render_target():
+            surface = ctx.render_text(target_text_str, BLACK)
+            return surface, (SCREEN_WIDTH // 2 - surface.get_width() // 2, 10)
+        overlays.append(('target', target_text_str, render_target))
+    overlays.append(('p1', (p1_text_str, c1), lambda: (ctx.render_text(p1_text_str, c1), (10, 10))))
+    overlays.append(('p2', (p2_text_str, c2), render_p2))
+    return overlays
+
+
+# --- Screens ---
+# Static screens are drawn once when their scene is entered; the scenes below handle their keys
+def draw_game_over_single(ctx, score):
+    game_over_text = ctx.render_text("GAME OVER", RED, ctx.game_over_font)
+    score_text = ctx.render_text(f"Final Score: {score}", BLACK)
+    instructions_text = ctx.render_text("R: Restart | M: Menu | Q: Quit", BLACK)
+
+    ctx.screen.blit(game_over_text, (SCREEN_WIDTH // 2 - game_over_text.get_width() // 2, SCREEN_HEIGHT // 3 - game_over_text.get_height() // 2))
+    ctx.screen.blit(score_text, (SCREEN_WIDTH // 2 - score_text.get_width() // 2, SCREEN_HEIGHT // 2 - score_text.get_height() // 2))
+    ctx.screen.blit(instructions_text, (SCREEN_WIDTH // 2 - instructions_text.get_width() // 2, SCREEN_HEIGHT * 2 // 3 - instructions_text.get_height() // 2))
+    ctx.present()
+
+def draw_game_over_two_player(ctx, winner, score1, score2):
     if winner == 'draw':
         message = "IT'S A DRAW!"
         color = BLACK
@@ -147,238 +601,268 @@ def display_game_over_two_player(winner, score1, score2):
         message = "PLAYER 2 WINS!"
         color = BLUE
 
-    game_over_text = game_over_font.render(message, True, color)
-    score1_text = font.render(f"P1 Final Score: {score1}", True, BLACK)
-    score2_text = font.render(f"P2 Final Score: {score2}", True, BLACK)
-    instructions_text = font.render("R: Restart | M: Menu | Q: Quit", True, BLACK)
-
-    screen.blit(game_over_text, (SCREEN_WIDTH // 2 - game_over_text.get_width() // 2, SCREEN_HEIGHT // 3 - game_over_text.get_height() // 2))
-    screen.blit(score1_text, (SCREEN_WIDTH // 2 - score1_text.get_width() // 2, SCREEN_HEIGHT // 2 - score1_text.get_height() // 2 - 20))
-    screen.blit(score2_text, (SCREEN_WIDTH // 2 - score2_text.get_width() // 2, SCREEN_HEIGHT // 2 - score2_text.get_height() // 2 + 20))
-    screen.blit(instructions_text, (SCREEN_WIDTH // 2 - instructions_text.get_width() // 2, SCREEN_HEIGHT * 2 // 3 - instructions_text.get_height() // 2))
-    pygame.display.flip()
-
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_q:
-                    pygame.quit()
-                    sys.exit()
-                if event.key == pygame.K_r:
-                    return 'restart'
-                if event.key == pygame.K_m:
-                    return 'menu'
-        clock.tick(5)
-
-def display_mode_selection():
-    screen.fill(WHITE)
-    title_text = game_over_font.render("Snake Game", True, BLACK)
-    single_player_text = font.render("Press 1 for Single Player", True, BLACK)
-    two_player_text = font.render("Press 2 for Two Players (VS)", True, BLACK)
-    quit_text = font.render("Press Q to Quit", True, BLACK)
-
-    screen.blit(title_text, (SCREEN_WIDTH // 2 - title_text.get_width() // 2, SCREEN_HEIGHT // 4 - title_text.get_height() // 2))
-    screen.blit(single_player_text, (SCREEN_WIDTH // 2 - single_player_text.get_width() // 2, SCREEN_HEIGHT // 2 - single_player_text.get_height() // 2 - 20))
-    screen.blit(two_player_text, (SCREEN_WIDTH // 2 - two_player_text.get_width() // 2, SCREEN_HEIGHT // 2 - two_player_text.get_height() // 2 + 20))
-    screen.blit(quit_text, (SCREEN_WIDTH // 2 - quit_text.get_width() // 2, SCREEN_HEIGHT * 3 // 4 - quit_text.get_height() // 2))
-    pygame.display.flip()
-
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_1:
-                    return 'single'
-                if event.key == pygame.K_2:
-                    return 'two_player' 
-                if event.key == pygame.K_q:
-                    pygame.quit()
-                    sys.exit()
-        clock.tick(5)
-
-def display_map_selection_menu(): # Keep this function as is
-    screen.fill(WHITE)
-    title_text = game_over_font.render("Select Map", True, BLACK)
-    map0_text = font.render("0: Classic (No Obstacles)", True, BLACK)
-    map1_text = font.render("1: Central Blocks", True, BLACK)
-    map2_text = font.render("2: Pillars", True, BLACK)
-    back_text = font.render("Press B to Go Back to Main Menu", True, BLACK)
-
-    screen.blit(title_text, (SCREEN_WIDTH // 2 - title_text.get_width() // 2, SCREEN_HEIGHT // 5 - title_text.get_height() // 2))
-    screen.blit(map0_text, (SCREEN_WIDTH // 2 - map0_text.get_width() // 2, SCREEN_HEIGHT * 2 // 5 - map0_text.get_height() // 2))
-    screen.blit(map1_text, (SCREEN_WIDTH // 2 - map1_text.get_width() // 2, SCREEN_HEIGHT * 3 // 5 - map1_text.get_height() // 2))
-    screen.blit(map2_text, (SCREEN_WIDTH // 2 - map2_text.get_width() // 2, SCREEN_HEIGHT * 4 // 5 - map2_text.get_height() // 2 - 20))
-    screen.blit(back_text, (SCREEN_WIDTH // 2 - back_text.get_width() // 2, SCREEN_HEIGHT * 4 // 5 + 30 ))
-    pygame.display.flip()
-
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_0:
-                    return 0
-                if event.key == pygame.K_1:
-                    return 1
-                if event.key == pygame.K_2:
-                    return 2
-                if event.key == pygame.K_b: 
-                    return None 
-        clock.tick(5)
-
-def display_game_mode_selection_menu():
-    screen.fill(WHITE)
-    title_text = game_over_font.render("Select Game Mode", True, BLACK)
-    mode1_text = font.render("1: Last Snake Standing", True, BLACK)
-    mode2_text = font.render("2: First to 10 Points", True, BLACK)
-    back_text = font.render("Press B to Go Back to Map Selection", True, BLACK)
-
-    screen.blit(title_text, (SCREEN_WIDTH // 2 - title_text.get_width() // 2, SCREEN_HEIGHT // 5 - title_text.get_height() // 2))
-    screen.blit(mode1_text, (SCREEN_WIDTH // 2 - mode1_text.get_width() // 2, SCREEN_HEIGHT * 2 // 5 - mode1_text.get_height() // 2))
-    screen.blit(mode2_text, (SCREEN_WIDTH // 2 - mode2_text.get_width() // 2, SCREEN_HEIGHT * 3 // 5 - mode2_text.get_height() // 2))
-    screen.blit(back_text, (SCREEN_WIDTH // 2 - back_text.get_width() // 2, SCREEN_HEIGHT * 4 // 5 + 30 ))
-    pygame.display.flip()
-
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_1:
-                    return {'game_mode': 'last_snake'}
-                if event.key == pygame.K_2:
-                    return {'game_mode': 'first_to_x', 'target_score': 10}
-                if event.key == pygame.K_b: # Go back
-                    return None # Indicates going back to map selection
-        clock.tick(5)
-
-# --- Game Loops ---
-def single_player_game_loop():
-    game = Game(GRID_WIDTH, GRID_HEIGHT)
-    running = True
-
-    while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN:
-                if not game.is_game_over():
-                    if event.key == pygame.K_UP:
-                        game.change_snake_direction('UP')
-                    elif event.key == pygame.K_DOWN:
-                        game.change_snake_direction('DOWN')
-                    elif event.key == pygame.K_LEFT:
-                        game.change_snake_direction('LEFT')
-                    elif event.key == pygame.K_RIGHT:
-                        game.change_snake_direction('RIGHT')
-
-        if not game.is_game_over():
-            game.update()
-
-        screen.fill(WHITE)
-        draw_grid()
-        draw_snake(game.get_snake_body()) # Default color (GREEN)
-        draw_foods(game.get_foods()) # MODIFIED: Call draw_foods with game.get_foods()
-        
-        # Display powerup if active on map (for single player)
-        powerup_details_sp = game.get_powerup_item_details()
-        if powerup_details_sp:
-            draw_powerup_item(powerup_details_sp)
-            
-        display_score_single(game) # Pass the whole game object
-
+    game_over_text = ctx.render_text(message, color, ctx.game_over_font)
+    score1_text = ctx.render_text(f"P1 Final Score: {score1}", BLACK)
+    score2_text = ctx.render_text(f"P2 Final Score: {score2}", BLACK)
+    instructions_text = ctx.render_text("R: Restart | M: Menu | Q: Quit", BLACK)
+
+    ctx.screen.blit(game_over_text, (SCREEN_WIDTH // 2 - game_over_text.get_width() // 2, SCREEN_HEIGHT // 3 - game_over_text.get_height() // 2))
+    ctx.screen.blit(score1_text, (SCREEN_WIDTH // 2 - score1_text.get_width() // 2, SCREEN_HEIGHT // 2 - score1_text.get_height() // 2 - 20))
+    ctx.screen.blit(score2_text, (SCREEN_WIDTH // 2 - score2_text.get_width() // 2, SCREEN_HEIGHT // 2 - score2_text.get_height() // 2 + 20))
+    ctx.screen.blit(instructions_text, (SCREEN_WIDTH // 2 - instructions_text.get_width() // 2, SCREEN_HEIGHT * 2 // 3 - instructions_text.get_height() // 2))
+    ctx.present()
+
+def draw_mode_selection(ctx):
+    ctx.screen.fill(WHITE)
+    title_text = ctx.render_text("Snake Game", BLACK, ctx.game_over_font)
+    single_player_text = ctx.render_text("Press 1 for Single Player", BLACK)
+    two_player_text = ctx.render_text("Press 2 for Two Players (VS)", BLACK)
+    quit_text = ctx.render_text("Press Q to Quit", BLACK)
+
+    ctx.screen.blit(title_text, (SCREEN_WIDTH // 2 - title_text.get_width() // 2, SCREEN_HEIGHT // 4 - title_text.get_height() // 2))
+    ctx.screen.blit(single_player_text, (SCREEN_WIDTH // 2 - single_player_text.get_width() // 2, SCREEN_HEIGHT // 2 - single_player_text.get_height() // 2 - 20))
+    ctx.screen.blit(two_player_text, (SCREEN_WIDTH // 2 - two_player_text.get_width() // 2, SCREEN_HEIGHT // 2 - two_player_text.get_height() // 2 + 20))
+    ctx.screen.blit(quit_text, (SCREEN_WIDTH // 2 - quit_text.get_width() // 2, SCREEN_HEIGHT * 3 // 4 - quit_text.get_height() // 2))
+    ctx.present()
+
+def map_choices():
+    """(key, map id, title) for the map menu: the registered maps in id order, on keys 0-9."""
+    return [(pygame.K_0 + n, map_id, BUILTIN_MAP_TITLES.get(map_id, maps.MAPS[map_id].name))
+            for n, map_id in enumerate(sorted(maps.MAPS)[:10])]
+
+def draw_map_selection_menu(ctx):
+    ctx.screen.fill(WHITE)
+    title_text = ctx.render_text("Select Map", BLACK, ctx.game_over_font)
+    back_text = ctx.render_text("Press B to Go Back to Main Menu", BLACK)
+
+    ctx.screen.blit(title_text, (SCREEN_WIDTH // 2 - title_text.get_width() // 2, SCREEN_HEIGHT // 5 - title_text.get_height() // 2))
+    choices = map_choices() # Spread over the middle of the screen, closer together when there are many
+    spacing = min(SCREEN_HEIGHT * 11 // 60, SCREEN_HEIGHT * 7 // 15 // max(len(choices) - 1, 1))
+    top = SCREEN_HEIGHT * 13 // 24 - spacing * (len(choices) - 1) // 2
+    for n, (key, _, title) in enumerate(choices):
+        map_text = ctx.render_text(f"{pygame.key.name(key)}: {title}", BLACK)
+        ctx.screen.blit(map_text, (SCREEN_WIDTH // 2 - map_text.get_width() // 2, top + n * spacing - map_text.get_height() // 2))
+    ctx.screen.blit(back_text, (SCREEN_WIDTH // 2 - back_text.get_width() // 2, SCREEN_HEIGHT * 4 // 5 + 30 ))
+    ctx.present()
+
+def draw_game_mode_selection_menu(ctx):
+    ctx.screen.fill(WHITE)
+    title_text = ctx.render_text("Select Game Mode", BLACK, ctx.game_over_font)
+    mode1_text = ctx.render_text("1: Last Snake Standing", BLACK)
+    mode2_text = ctx.render_text("2: First to 10 Points", BLACK)
+    back_text = ctx.render_text("Press B to Go Back to Map Selection", BLACK)
+
+    ctx.screen.blit(title_text, (SCREEN_WIDTH // 2 - title_text.get_width() // 2, SCREEN_HEIGHT // 5 - title_text.get_height() // 2))
+    ctx.screen.blit(mode1_text, (SCREEN_WIDTH // 2 - mode1_text.get_width() // 2, SCREEN_HEIGHT * 2 // 5 - mode1_text.get_height() // 2))
+    ctx.screen.blit(mode2_text, (SCREEN_WIDTH // 2 - mode2_text.get_width() // 2, SCREEN_HEIGHT * 3 // 5 - mode2_text.get_height() // 2))
+    ctx.screen.blit(back_text, (SCREEN_WIDTH // 2 - back_text.get_width() // 2, SCREEN_HEIGHT * 4 // 5 + 30 ))
+    ctx.present()
+
+# --- Scenes ---
+class Scene:
+    """One screen of the frontend. run_scenes() calls enter() when the scene becomes current, key() for
+    each key press and frame() once per frame; key() and frame() return the scene to show next
+    (self to stay, None to quit). Scenes only hold references to what they show, so a scene left
+    behind is freed along with its game."""
+    fps = 5 # Frame rate while this scene is current
+
+    def __init__(self, ctx):
+        self.ctx = ctx
+
+    def enter(self):
+        pass
+
+    def key(self, key):
+        return self
+
+    def frame(self):
+        return self
+
+class MenuScene(Scene):
+    def enter(self):
+        draw_mode_selection(self.ctx)
+
+    def key(self, key):
+        if key == pygame.K_1:
+            return PlayScene(self.ctx)
+        if key == pygame.K_2:
+            return MapSelectScene(self.ctx)
+        if key == pygame.K_q:
+            return None
+        return self
+
+class MapSelectScene(Scene):
+    def enter(self):
+        draw_map_selection_menu(self.ctx)
+
+    def key(self, key):
+        map_keys = {k: map_id for k, map_id, _ in map_choices()} # Includes maps registered with --maps
+        if key in map_keys:
+            return ModeSelectScene(self.ctx, map_keys[key])
+        if key == pygame.K_b:
+            return MenuScene(self.ctx)
+        return self
+
+class ModeSelectScene(Scene):
+    def __init__(self, ctx, map_id):
+        super().__init__(ctx)
+        self.map_id = map_id
+
+    def enter(self):
+        draw_game_mode_selection_menu(self.ctx)
+
+    def key(self, key):
+        if key == pygame.K_1:
+            return PlayScene(self.ctx, self.map_id, {'game_mode': 'last_snake'})
+        if key == pygame.K_2:
+            return PlayScene(self.ctx, self.map_id, {'game_mode': 'first_to_x', 'target_score': 10})
+        if key == pygame.K_b: # Go back
+            return MapSelectScene(self.ctx)
+        return self
+
+class PlayScene(Scene):
+    """A single-player game (map_id None) or a two-player game on map_id with game_mode_details."""
+    fps = RENDER_FPS # Input is polled and the board drawn every frame; ctx.timestep decides when the game ticks
+
+    def __init__(self, ctx, map_id=None, game_mode_details=None):
+        super().__init__(ctx)
+        self.map_id = map_id; self.game_mode_details = game_mode_details
+        self.game = None
+        self.new_game()
+        self.renderer = RENDERERS[ctx.renderer](ctx, self.game.get_obstacles() if self.two_player else ()) # Same board on restart
+
+    @property
+    def two_player(self):
+        return self.game_mode_details is not None
+
+    def new_game(self):
+        self.game = None # Drop the finished game before building the next one
+        if self.two_player:
+            self.game = TwoPlayerGame(GRID_WIDTH, GRID_HEIGHT,
+                                      map_id=self.map_id,
+                                      game_mode=self.game_mode_details['game_mode'],
+                                      target_score=self.game_mode_details.get('target_score', 10)) # Default target_score if not in dict
+        else:
+            self.game = Game(GRID_WIDTH, GRID_HEIGHT)
+        self.snakes = (self.game.snake1, self.game.snake2) if self.two_player else (self.game.snake,)
+        self.motion = None # snake_motion of each snake before the last tick, for interpolation
+        self.ctx.input_latency.reset()
+
+    def enter(self):
+        self.renderer.invalidate() # A menu or the game-over screen was drawn over the board
+        self.ctx.timestep.reset() # Time spent elsewhere is not game time
+
+    def key(self, key):
+        game = self.game
         if game.is_game_over():
-            action = display_game_over_single(game.get_score())
-            if action == 'restart':
-                single_player_game_loop() # Restart this mode
-            elif action == 'menu':
-                return # Go back to main_menu
-            return # Exit current loop instance
-
-        pygame.display.flip()
-        clock.tick(FPS)
-
-def two_player_game_loop(selected_map_id, game_mode_details): # Added game_mode_details
-    game = TwoPlayerGame(GRID_WIDTH, GRID_HEIGHT, 
-                         map_id=selected_map_id, 
-                         game_mode=game_mode_details['game_mode'], 
-                         target_score=game_mode_details.get('target_score', 10)) # Default target_score if not in dict
-    running = True
-
-    while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN:
-                if not game.is_game_over():
-                    # Player 1 Controls (Arrows)
-                    if event.key == pygame.K_UP:
-                        game.change_snake_direction(1, 'UP')
-                    elif event.key == pygame.K_DOWN:
-                        game.change_snake_direction(1, 'DOWN')
-                    elif event.key == pygame.K_LEFT:
-                        game.change_snake_direction(1, 'LEFT')
-                    elif event.key == pygame.K_RIGHT:
-                        game.change_snake_direction(1, 'RIGHT')
-                    # Player 2 Controls (WASD)
-                    elif event.key == pygame.K_w:
-                        game.change_snake_direction(2, 'UP')
-                    elif event.key == pygame.K_s:
-                        game.change_snake_direction(2, 'DOWN')
-                    elif event.key == pygame.K_a:
-                        game.change_snake_direction(2, 'LEFT')
-                    elif event.key == pygame.K_d:
-                        game.change_snake_direction(2, 'RIGHT')
-
-        if not game.is_game_over():
-            game.update()
-
-        screen.fill(WHITE)
-        draw_grid()
-        draw_obstacles(game.get_obstacles()) # Draw obstacles first
-        draw_snake(game.get_snake1_body(), game.get_snake1_color()) # P1
-        draw_snake(game.get_snake2_body(), game.get_snake2_color()) # P2
-        draw_foods(game.get_foods()) # MODIFIED: Call draw_foods with game.get_foods()
-        
+            return self
+        latency = self.ctx.input_latency
+        if not self.two_player:
+            if key in P1_KEYS:
+                latency.pressed(game.snake, game.queue_turn(P1_KEYS[key]))
+        elif key in P1_KEYS: # Player 1 Controls (Arrows)
+            latency.pressed(game.snake1, game.queue_turn(1, P1_KEYS[key]))
+        elif key in P2_KEYS: # Player 2 Controls (WASD)
+            latency.pressed(game.snake2, game.queue_turn(2, P2_KEYS[key]))
+        return self
+
+    def frame(self):
+        game = self.game; ctx = self.ctx; times = ctx.frame_times
+        ticks = ctx.timestep.advance() # Usually 0 or 1; more when frames are being skipped
+        if ticks:
+            t0 = time.perf_counter_ns()
+            for _ in range(ticks):
+                if game.is_game_over():
+                    break
+                self.motion = [snake_motion(s) for s in self.snakes]
+                game.update(); times.ticks += 1
+            ctx.input_latency.ticked(self.snakes)
+            times.simulation.record(time.perf_counter_ns() - t0)
+
+        # Only cells and HUD text that changed since the last frame are redrawn
+        t0 = time.perf_counter_ns()
+        alpha = 1.0 if game.is_game_over() or self.motion is None else ctx.timestep.alpha
         powerup_details = game.get_powerup_item_details()
-        if powerup_details:
-            draw_powerup_item(powerup_details)
-            
-        display_scores_two_player(game) # Pass the game object
+        if self.two_player:
+            snakes = [(game.get_snake1_body(), game.get_snake1_color()), (game.get_snake2_body(), game.get_snake2_color())]
+            hud = hud_overlays_two_player(ctx, game)
+        else:
+            snakes = [(game.get_snake_body(), GREEN)]
+            hud = hud_overlays_single(ctx, game)
+        if self.motion is not None:
+            snakes = [snake + (motion,) for snake, motion in zip(snakes, self.motion)]
+        cells = board_cells(snakes, game.get_foods(), powerup_details, alpha)
+        overlays = [powerup_overlay(ctx, powerup_details)] if powerup_details else []
+        self.renderer.render(cells, overlays + hud)
+        times.render.record(time.perf_counter_ns() - t0)
 
         if game.is_game_over():
+            return GameOverScene(ctx, self)
+        return self
+
+class GameOverScene(Scene):
+    def __init__(self, ctx, play):
+        super().__init__(ctx)
+        self.play = play
+
+    def enter(self):
+        game = self.play.game
+        if self.play.two_player:
             s1_final_score, s2_final_score = game.get_scores()
-            action = display_game_over_two_player(game.get_winner(), s1_final_score, s2_final_score)
-            if action == 'restart':
-                two_player_game_loop(selected_map_id, game_mode_details) # Restart with same map and mode
-            elif action == 'menu':
-                return # Go back to main_menu
-            return # Exit current loop instance
-
-        pygame.display.flip()
-        clock.tick(FPS)
-
-def main_menu():
-    while True:
-        mode = display_mode_selection()
-        if mode == 'single':
-            single_player_game_loop()
-        elif mode == 'two_player':
-            selected_map_id = display_map_selection_menu()
-            if selected_map_id is not None: 
-                game_mode_details = display_game_mode_selection_menu()
-                if game_mode_details is not None: # If a game mode was selected
-                    two_player_game_loop(selected_map_id, game_mode_details)
-            # If selected_map_id or game_mode_details is None, loop back to main_menu
+            draw_game_over_two_player(self.ctx, game.get_winner(), s1_final_score, s2_final_score)
+        else:
+            draw_game_over_single(self.ctx, game.get_score())
+
+    def key(self, key):
+        if key == pygame.K_r: # Restart with the same mode (and map)
+            self.play.new_game()
+            return self.play
+        if key == pygame.K_m:
+            return MenuScene(self.ctx)
+        if key == pygame.K_q:
+            return None
+        return self
+
+# --- Main Loop ---
+def run_scenes(ctx, scene, events=None):
+    """The frontend's only loop: no scene blocks or calls another, so restarts and menu round trips
+    keep the call depth and memory flat however long it runs. Returns when a scene quits or the
+    window is closed. events(scene) -> iterable of events replaces pygame's queue (scripted input)."""
+    scene.enter()
+    while scene is not None:
+        ctx.tick(scene.fps)
+        for event in pygame.event.get() if events is None else events(scene):
+            if event.type == pygame.QUIT:
+                return
+            if event.type == pygame.KEYDOWN:
+                scene = _switch(scene, scene.key(event.key))
+                if scene is None:
+                    return
+        scene = _switch(scene, scene.frame())
+
+def _switch(current, new):
+    if new is not None and new is not current:
+        new.enter()
+    return new
+
+def main_menu(ctx):
+    run_scenes(ctx, MenuScene(ctx))
+    ctx.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Snake, single player or two players on one keyboard.')
+    parser.add_argument('--renderer', default='dirty', choices=sorted(RENDERERS))
+    parser.add_argument('--maps', metavar='DIR', help='directory of .map / binary map files, added to the map menu after the built-ins')
+    parser.add_argument('--headless', action='store_true', help="SDL's dummy video driver: no display needed")
+    parser.add_argument('--stats', action='store_true', help='print simulation and render time per frame and frame skips on exit')
+    args = parser.parse_args(argv)
+    if args.maps:
+        try: maps.register_dir(args.maps)
+        except (OSError, ValueError) as e: parser.error(f"--maps: {e}")
+    context = RenderContext(headless=args.headless, renderer=args.renderer)
+    main_menu(context)
+    if args.stats: print(context.frame_times.report(context.timestep))
+    return 0
 
 if __name__ == "__main__":
-    main_menu()
+    sys.exit(main())
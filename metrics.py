@@ -0,0 +1,135 @@
+"""Opt-in per-phase profiling for Game/TwoPlayerGame.update().
+
+    profiler = Profiler(JsonLinesSink('ticks.jsonl'), flush_every=1000)
+    game.profiler = profiler   # None (the default) disables all instrumentation
+    ...
+    profiler.flush(); profiler.close()
+
+Each tick is split into phases (powerup_timers, movement, food_scan, spawn, powerup_pickup,
+collision; single-player games check collisions inside movement); the time spent in each phase
+per tick, and the whole tick, goes into a log-bucketed histogram. _generate_location calls are
+counted as spawn attempts. flush() hands a summary dict to the sink.
+"""
+import bisect
+import json
+import os
+import time
+
+# Upper bounds in nanoseconds, growing by 2**0.25 from 250ns to ~1s; percentiles are exact to one bucket
+BUCKET_BOUNDS = [int(250 * 2 ** (i / 4)) for i in range(89)]
+
+class Histogram:
+    def __init__(self, bounds=BUCKET_BOUNDS):
+        self.bounds = bounds; self.buckets = [0] * (len(bounds) + 1) # Last bucket is +Inf
+        self.count = 0; self.total = 0; self.min = None; self.max = None
+
+    def record(self, value):
+        self.buckets[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1; self.total += value
+        if self.min is None or value < self.min: self.min = value
+        if self.max is None or value > self.max: self.max = value
+
+    def percentile(self, q):
+        """Upper bound of the bucket holding the q-th percentile (q in 0..100), clamped to the observed max."""
+        if not self.count: return None
+        rank = q / 100 * self.count; seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= rank: return min(self.bounds[i], self.max) if i < len(self.bounds) else self.max
+        return self.max
+
+    def summary(self):
+        return {'count': self.count, 'sum_ns': self.total, 'min_ns': self.min, 'max_ns': self.max,
+                'p50_ns': self.percentile(50), 'p90_ns': self.percentile(90), 'p99_ns': self.percentile(99),
+                'p999_ns': self.percentile(99.9)}
+
+    def reset(self):
+        self.buckets = [0] * len(self.buckets); self.count = 0; self.total = 0; self.min = None; self.max = None
+
+class Profiler:
+    """Collects tick and phase timings from a game whose `profiler` attribute points at it."""
+    def __init__(self, sink=None, flush_every=0, clock=time.perf_counter_ns):
+        self.sink = sink; self.flush_every = flush_every; self.clock = clock
+        self.tick_latency = Histogram(); self.phases = {}; self.counters = {}
+        self._tick_phases = {}; self._last = 0; self._start = 0; self._ticks_since_flush = 0
+
+    def begin_tick(self):
+        self._start = self._last = self.clock()
+
+    def mark(self, phase):
+        """Charge the time since the previous mark (or the start of the tick) to `phase`."""
+        now = self.clock()
+        self._tick_phases[phase] = self._tick_phases.get(phase, 0) + now - self._last
+        self._last = now
+
+    def end_tick(self):
+        self.tick_latency.record(self.clock() - self._start)
+        phases = self.phases
+        for phase, ns in self._tick_phases.items():
+            h = phases.get(phase)
+            if h is None: h = phases[phase] = Histogram()
+            h.record(ns)
+        self._tick_phases = {}
+        self._ticks_since_flush += 1
+        if self.flush_every and self._ticks_since_flush >= self.flush_every: self.flush()
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def summary(self):
+        return {'time': time.time(), 'ticks': self.tick_latency.summary(),
+                'phases': {name: h.summary() for name, h in self.phases.items()}, 'counters': dict(self.counters)}
+
+    def flush(self, reset=True):
+        """Send the current summary to the sink and, by default, start a new window."""
+        summary = self.summary()
+        if self.sink is not None: self.sink.emit(summary)
+        if reset:
+            self.tick_latency.reset(); self.phases = {}; self.counters = {}
+        self._ticks_since_flush = 0
+        return summary
+
+    def close(self):
+        if self.sink is not None: self.sink.close()
+
+# --- Sinks: anything with emit(summary) and close() ---
+class MemorySink:
+    def __init__(self): self.records = []
+    def emit(self, summary): self.records.append(summary)
+    def close(self): pass
+
+class JsonLinesSink:
+    """Appends one JSON object per flush."""
+    def __init__(self, path):
+        self.file = open(path, 'a')
+    def emit(self, summary):
+        self.file.write(json.dumps(summary) + '\n'); self.file.flush()
+    def close(self): self.file.close()
+
+def prometheus_text(summary, prefix='snake'):
+    """Prometheus text exposition of a summary: per-phase summaries in seconds plus counters."""
+    lines = [f'# TYPE {prefix}_tick_seconds summary']
+    def quantiles(name, s, labels=''):
+        sep = ',' if labels else ''
+        for q, key in ((0.5, 'p50_ns'), (0.9, 'p90_ns'), (0.99, 'p99_ns'), (0.999, 'p999_ns')):
+            if s[key] is not None: lines.append(f'{name}{{{labels}{sep}quantile="{q}"}} {s[key] / 1e9:.9f}')
+        braces = f'{{{labels}}}' if labels else ''
+        lines.append(f'{name}_sum{braces} {s["sum_ns"] / 1e9:.9f}')
+        lines.append(f'{name}_count{braces} {s["count"]}')
+    quantiles(f'{prefix}_tick_seconds', summary['ticks'])
+    if summary['phases']: lines.append(f'# TYPE {prefix}_phase_seconds summary')
+    for phase, s in sorted(summary['phases'].items()):
+        quantiles(f'{prefix}_phase_seconds', s, f'phase="{phase}"')
+    for name, value in sorted(summary['counters'].items()):
+        lines.append(f'# TYPE {prefix}_{name}_total counter'); lines.append(f'{prefix}_{name}_total {value}')
+    return '\n'.join(lines) + '\n'
+
+class PrometheusSink:
+    """Rewrites a text-format file (e.g. for node_exporter's textfile collector) on every flush."""
+    def __init__(self, path, prefix='snake'):
+        self.path = path; self.prefix = prefix
+    def emit(self, summary):
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w') as f: f.write(prometheus_text(summary, self.prefix))
+        os.replace(tmp, self.path) # Scrapers never see a half-written file
+    def close(self): pass
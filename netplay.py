@@ -0,0 +1,261 @@
+"""Rollback netcode: a TwoPlayerGame played by two peers, each simulating ahead of the other's inputs.
+
+RollbackSession is one peer's copy of the game. Local turns (change_snake_direction) apply at
+once; the remote snake's inputs for ticks not heard from yet are predicted as "no turn", so it
+keeps its direction. The state after every tick is snapshotted. When a remote input arrives for
+a tick already simulated and differs from the prediction, advance() restores that tick's snapshot
+and re-simulates up to the present before the next tick, within the same frame. A session never
+runs more than max_rollback ticks past the last confirmed remote input (it stalls instead), which
+bounds both the rollback depth and the snapshots kept. Every CHECK_INTERVAL ticks that are
+confirmed on both sides, the peers compare replay.state_fingerprint to catch desyncs.
+
+Protocol: newline-delimited JSON over TCP, one input message per simulated tick.
+  player 1 -> player 2  {"op": "hello", "seed": n, "map": 0, "mode": "last_snake", "target": 10, "ticks": n}
+  both ways             {"k": tick, "d": ["UP", ...]}   the sender's turns on tick k, in order (often none)
+                        {"k": tick, "h": "hex"}         fingerprint of the state before tick k
+Outgoing messages can be held back by --latency-ms plus up to --jitter-ms (kept in order, as TCP
+would), to try the rollback on loopback. Each peer steers with a bot and prints a JSON report.
+
+    python netplay.py --player 1 [--port 8766] [--ticks 600] [--tick-rate 30] [--latency-ms 50] [--jitter-ms 20]
+    python netplay.py --player 2 [--host 127.0.0.1] [--port 8766] [--latency-ms 50] [--jitter-ms 20]
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import Counter
+from bots import BOTS
+from metrics import Histogram
+from replay import state_fingerprint
+from snake_core import TwoPlayerGame
+
+MAX_ROLLBACK = 8
+CHECK_INTERVAL = 30
+
+def _dumps(obj):
+    return (json.dumps(obj, separators=(',', ':')) + '\n').encode()
+
+class RollbackSession:
+    def __init__(self, game, local_id, max_rollback=MAX_ROLLBACK):
+        self.game = game; self.local_id = local_id; self.remote_id = 3 - local_id
+        self.max_rollback = max_rollback
+        self.frame = 0 # Ticks simulated; unlike game.tick it keeps counting after the game is over
+        self.confirmed = 0 # Remote inputs are known for every tick below this
+        self.inputs = {1: {}, 2: {}} # snake_id -> {tick: directions}; missing remote ticks are predicted as ()
+        self.snapshots = {0: game.snapshot()} # tick -> state before it
+        self._pending = [] # Local turns for the tick about to be simulated
+        self._mispredicted = None # Earliest simulated tick whose remote input differed from the prediction
+        self._probe = game.clone() # Scratch game for fingerprinting snapshots
+        self.fingerprints = {} # tick -> fingerprint of the settled state before it
+        self.remote_fingerprints = {}; self.desyncs = []
+        self.rollbacks = Counter() # depth in ticks -> count
+        self.resimulation = Histogram() # ns per rollback: restore and re-simulation
+        self.resimulated = 0; self.stalls = 0
+
+    @property
+    def settled(self):
+        """Ticks below this are final: both peers' inputs known and re-simulated."""
+        settled = min(self.confirmed, self.frame)
+        return settled if self._mispredicted is None else min(settled, self._mispredicted) # Not re-simulated yet
+
+    def settled_state(self):
+        """The settled snapshot in a scratch game (shared: read it before the next call)."""
+        self._probe.restore(self.snapshots[self.settled])
+        return self._probe
+
+    def change_snake_direction(self, direction):
+        """Turn the local snake; it shows at once and is sent with the next tick's inputs."""
+        self._pending.append(direction)
+        self.game.change_snake_direction(self.local_id, direction)
+
+    def receive(self, tick, directions):
+        """The remote snake's turns on `tick`; ticks must arrive in order."""
+        if tick != self.confirmed: raise ValueError(f"expected remote inputs for tick {self.confirmed}, got {tick}")
+        directions = tuple(directions)
+        if directions: self.inputs[self.remote_id][tick] = directions
+        if tick < self.frame and directions and (self._mispredicted is None or tick < self._mispredicted):
+            self._mispredicted = tick
+        self.confirmed = tick + 1
+
+    def receive_fingerprint(self, tick, digest):
+        self.remote_fingerprints[tick] = digest
+        self._compare(tick)
+
+    def sync(self):
+        """Roll back and re-simulate if a prediction was wrong; fingerprint and forget settled ticks."""
+        if self._mispredicted is not None: self._rollback()
+        self._settle()
+
+    def advance(self):
+        """sync(), then simulate one tick unless max_rollback ticks ahead of the remote inputs.
+        Returns (tick, local directions) to send, or None when stalled."""
+        self.sync()
+        if self.frame - self.confirmed >= self.max_rollback:
+            self.stalls += 1; return None
+        tick = self.frame; game = self.game
+        local = tuple(self._pending); self._pending = []
+        if local: self.inputs[self.local_id][tick] = local
+        for d in self.inputs[self.remote_id].get(tick, ()): game.change_snake_direction(self.remote_id, d)
+        game.update()
+        self.frame = tick + 1; self.snapshots[self.frame] = game.snapshot()
+        return tick, local
+
+    def _simulate(self, tick):
+        game = self.game
+        for sid in (self.local_id, self.remote_id): # The order the live tick applied them in
+            for d in self.inputs[sid].get(tick, ()): game.change_snake_direction(sid, d)
+        game.update()
+        self.snapshots[tick + 1] = game.snapshot()
+
+    def _rollback(self):
+        start = self._mispredicted; self._mispredicted = None
+        t0 = time.perf_counter_ns()
+        self.game.restore(self.snapshots[start])
+        for tick in range(start, self.frame): self._simulate(tick)
+        for d in self._pending: self.game.change_snake_direction(self.local_id, d) # Still on top of the present
+        self.resimulation.record(time.perf_counter_ns() - t0)
+        self.rollbacks[self.frame - start] += 1; self.resimulated += self.frame - start
+
+    def _settle(self):
+        # Fingerprint settled check ticks, then drop what no rollback can reach any more
+        settled = self.settled
+        for tick in range(self._next_check(), settled + 1, CHECK_INTERVAL):
+            self._probe.restore(self.snapshots[tick])
+            self.fingerprints[tick] = state_fingerprint(self._probe); self._compare(tick)
+        for t in [t for t in self.snapshots if t < settled]: del self.snapshots[t]
+        for inputs in self.inputs.values():
+            for t in [t for t in inputs if t < settled]: del inputs[t]
+
+    def _next_check(self):
+        return max(self.fingerprints, default=-CHECK_INTERVAL) + CHECK_INTERVAL
+
+    def _compare(self, tick):
+        mine = self.fingerprints.get(tick); theirs = self.remote_fingerprints.get(tick)
+        if mine is not None and theirs is not None and mine != theirs: self.desyncs.append(tick)
+
+    def new_fingerprints(self, since):
+        """(tick, fingerprint) computed at or after tick `since`, to send to the peer."""
+        return [(t, h) for t, h in sorted(self.fingerprints.items()) if t >= since]
+
+    def report(self):
+        depths = sorted(self.rollbacks.elements())
+        pick = lambda q: depths[min(len(depths) - 1, int(q * len(depths)))] if depths else 0
+        return {'ticks': self.frame, 'settled': self.settled, 'stalls': self.stalls, 'rollbacks': len(depths),
+                'rollback_depth': {'mean': sum(depths) / len(depths) if depths else 0, 'p50': pick(0.5), 'p99': pick(0.99),
+                                   'max': depths[-1] if depths else 0, 'histogram': dict(sorted(self.rollbacks.items()))},
+                'resimulated_ticks': self.resimulated, 'resimulation': self.resimulation.summary(),
+                'checks': len(self.fingerprints), 'desyncs': self.desyncs}
+
+# --- Peers over TCP ---
+class LaggedWriter:
+    """Holds every message back by latency plus up to jitter seconds, delivering them in order."""
+    def __init__(self, writer, latency=0.0, jitter=0.0, rng=None):
+        self.writer = writer; self.latency = latency; self.jitter = jitter; self.rng = rng or random.Random()
+        self.loop = asyncio.get_running_loop(); self._last = 0.0
+
+    def write(self, data):
+        if not (self.latency or self.jitter): self.writer.write(data); return
+        at = max(self._last + 1e-6, self.loop.time() + self.latency + self.rng.uniform(0, self.jitter)) # Equal times could swap
+        self._last = at; self.loop.call_at(at, self.writer.write, data)
+
+    async def drain(self):
+        await asyncio.sleep(max(0.0, self._last - self.loop.time()))
+        await self.writer.drain()
+
+async def _read(reader, session):
+    while True:
+        try: line = await reader.readline()
+        except ConnectionError: return
+        if not line: return
+        msg = json.loads(line)
+        if 'd' in msg: session.receive(msg['k'], msg['d'])
+        elif 'h' in msg: session.receive_fingerprint(msg['k'], msg['h'])
+
+async def _connect(player, host, port, options):
+    if player == 1:
+        accepted = asyncio.get_running_loop().create_future()
+        def on_connect(reader, writer):
+            if accepted.done(): writer.close()
+            else: accepted.set_result((reader, writer))
+        server = await asyncio.start_server(on_connect, host, port)
+        print(json.dumps({'listening': server.sockets[0].getsockname()[1]}), flush=True) # For launchers using --port 0
+        reader, writer = await accepted; server.close()
+        writer.write(_dumps({'op': 'hello', **options}))
+        return reader, writer, options
+    for _ in range(100): # Player 1 may still be starting up
+        try: reader, writer = await asyncio.open_connection(host, port); break
+        except ConnectionRefusedError: await asyncio.sleep(0.05)
+    else: raise ConnectionRefusedError(f"no peer at {host}:{port}")
+    hello = json.loads(await reader.readline())
+    return reader, writer, {k: v for k, v in hello.items() if k != 'op'}
+
+async def run_peer(player, host='127.0.0.1', port=8766, ticks=600, tick_rate=30, latency_ms=0, jitter_ms=0,
+                   bot='random', seed=0, map_id=0, game_mode='last_snake', max_rollback=MAX_ROLLBACK):
+    """Play one side of a match; returns the session report plus the settled result and frame times."""
+    reader, writer, options = await _connect(player, host, port, {'seed': seed, 'map': map_id, 'mode': game_mode,
+                                                                   'target': 10, 'ticks': ticks})
+    ticks = options['ticks']
+    game = TwoPlayerGame(40, 30, map_id=options['map'], game_mode=options['mode'], target_score=options['target'],
+                         seed=options['seed'])
+    session = RollbackSession(game, player, max_rollback)
+    out = LaggedWriter(writer, latency_ms / 1000, jitter_ms / 1000, random.Random(options['seed'] + 10 + player))
+    policy = BOTS[bot]; rng = random.Random(options['seed'] + player); me = game.snake1 if player == 1 else game.snake2
+    reading = asyncio.create_task(_read(reader, session))
+    loop = asyncio.get_running_loop(); period = 1 / tick_rate; next_frame = loop.time()
+    frame_work = Histogram(); checks_sent = 0
+    try:
+        # TwoPlayerGame.snapshot() starts (tick, game_over, ...)
+        while session.settled < ticks and not session.snapshots[session.settled][1]:
+            t0 = time.perf_counter_ns()
+            if session.frame < ticks:
+                if not game.game_over:
+                    d = policy(game, player, rng)
+                    if d != me.direction: session.change_snake_direction(d) # Turns only, like key presses
+                sent = session.advance()
+                if sent: out.write(_dumps({'k': sent[0], 'd': list(sent[1])}))
+            else:
+                session.sync()
+            for tick, digest in session.new_fingerprints(checks_sent):
+                out.write(_dumps({'k': tick, 'h': digest})); checks_sent = tick + 1
+            frame_work.record(time.perf_counter_ns() - t0)
+            if reading.done(): reading.result(); break # Peer left (or sent something broken)
+            next_frame += period
+            if next_frame < loop.time(): next_frame = loop.time()
+            await asyncio.sleep(next_frame - loop.time())
+        session.sync() # The peer may have left right after sending inputs we have not re-simulated
+        await out.drain()
+        # Half-close and wait for the peer's end: closing outright could reset the connection and
+        # drop inputs it has not read yet
+        writer.write_eof()
+        try: await asyncio.wait_for(reading, 10)
+        except asyncio.TimeoutError: pass
+    finally:
+        reading.cancel(); writer.close()
+    final = session.settled_state()
+    return {'player': player, 'latency_ms': latency_ms, 'jitter_ms': jitter_ms, 'tick_rate': tick_rate, **session.report(),
+            'fingerprint': state_fingerprint(final), 'winner': final.winner, 'scores': final.get_scores(),
+            'frame_work': frame_work.summary()}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--player', type=int, choices=(1, 2), required=True)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8766, help='player 1: 0 picks a free port (printed first)')
+    parser.add_argument('--ticks', type=int, default=600, help='player 1: match length in ticks')
+    parser.add_argument('--tick-rate', type=float, default=30)
+    parser.add_argument('--latency-ms', type=float, default=0, help='one-way delay added to outgoing messages')
+    parser.add_argument('--jitter-ms', type=float, default=0, help='extra random delay, 0 to this')
+    parser.add_argument('--bot', default='random', choices=sorted(BOTS))
+    parser.add_argument('--seed', type=int, default=0, help='player 1: game seed')
+    parser.add_argument('--map', type=int, default=0, help='player 1: map id')
+    parser.add_argument('--max-rollback', type=int, default=MAX_ROLLBACK)
+    args = parser.parse_args(argv)
+    report = asyncio.run(run_peer(args.player, args.host, args.port, args.ticks, args.tick_rate, args.latency_ms,
+                                  args.jitter_ms, args.bot, args.seed, args.map, max_rollback=args.max_rollback))
+    print(json.dumps(report), flush=True)
+    return 1 if report['desyncs'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""Incrementally maintained NumPy observations for learning agents.
+
+Observation(game, snake_id) keeps one player's view of a Game or TwoPlayerGame as a
+(len(CHANNELS), height, width) grid plus a vector of TIMERS. update(), called after each
+game.update(), only touches the cells that changed: per snake at most two new heads and two
+popped tails (speed_self moves twice), then eaten/spawned foods and the power-up. When the state
+jumped instead (restore(), set_map() or skipped ticks, seen through game.state_epoch and
+game.tick) it rebuilds from scratch, so the arrays always equal what encode() returns.
+
+The arrays handed out are read-only views of the live buffers, not copies. ObservationBatch lays
+many observations out in one (n, channels, height, width) buffer so a whole batch of environments
+goes to a network without stacking.
+"""
+import numpy as np
+
+CHANNELS = ('own_body', 'own_head', 'opponent_body', 'opponent_head', 'food', 'obstacle',
+            'powerup_speed_self', 'powerup_wall_ghost', 'powerup_slow_opponent')
+OWN_BODY, OWN_HEAD, OPP_BODY, OPP_HEAD, FOOD, OBSTACLE = range(6)
+POWERUP_CHANNEL = {'speed_self': 6, 'wall_ghost': 7, 'slow_opponent': 8}
+TIMERS = ('own_effect', 'own_slowed', 'opponent_effect', 'opponent_slowed', 'powerup_lifespan')
+
+def _perspective(game, snake_id):
+    """(own snake, opponent or None)."""
+    if hasattr(game, 'snake'): # Game or bitboard.BitboardGame
+        if snake_id != 1: raise ValueError("a single-player game only has snake 1")
+        return game.snake, None
+    if snake_id not in (1, 2): raise ValueError(f"no snake {snake_id}")
+    return (game.snake1, game.snake2) if snake_id == 1 else (game.snake2, game.snake1)
+
+def _powerup(game):
+    pu = game.powerup_item
+    return (pu.type_id, pu.position) if pu else None
+
+def _read_only(a):
+    v = a.view(); v.flags.writeable = False
+    return v
+
+def encode(game, snake_id=1, dtype=np.float32):
+    """From-scratch (grid, timers) for one player; what Observation maintains incrementally."""
+    grid = np.zeros((len(CHANNELS), game.height, game.width), dtype); timers = np.zeros(len(TIMERS), dtype)
+    _fill(game, snake_id, grid, timers)
+    return grid, timers
+
+def _fill(game, snake_id, grid, timers):
+    w, h = game.width, game.height
+    def put(channel, cells):
+        for x, y in cells:
+            if 0 <= x < w and 0 <= y < h: grid[channel, y, x] = 1
+    grid.fill(0)
+    put(OBSTACLE, getattr(game, 'obstacles', ())); put(FOOD, game.foods)
+    for (body, head), s in zip(((OWN_BODY, OWN_HEAD), (OPP_BODY, OPP_HEAD)), _perspective(game, snake_id)):
+        if s is not None: put(body, s._segment_counts); put(head, (s.body[0],))
+    pu = _powerup(game)
+    if pu: put(POWERUP_CHANNEL[pu[0]], (pu[1],))
+    _fill_timers(game, snake_id, timers)
+
+def _fill_timers(game, snake_id, timers):
+    own, opp = _perspective(game, snake_id)
+    timers[0] = own.powerup_effect_timer; timers[1] = own.is_slowed_timer
+    timers[2] = opp.powerup_effect_timer if opp else 0; timers[3] = opp.is_slowed_timer if opp else 0
+    timers[4] = game.powerup_on_map_lifespan_timer
+
+class Observation:
+    def __init__(self, game, snake_id=1, dtype=np.float32, out=None, timers_out=None):
+        """out/timers_out: preallocated buffers to maintain in place (ObservationBatch passes slices of its own)."""
+        _perspective(game, snake_id) # Validates snake_id
+        self.game = game; self.snake_id = snake_id
+        self._grid = np.zeros((len(CHANNELS), game.height, game.width), dtype) if out is None else out
+        self._timers = np.zeros(len(TIMERS), dtype) if timers_out is None else timers_out
+        self.grid = _read_only(self._grid); self.timers = _read_only(self._timers)
+        self.rebuilds = 0
+        self.rebuild()
+
+    def rebuild(self):
+        game = self.game
+        _fill(game, self.snake_id, self._grid, self._timers)
+        self._remember(); self.rebuilds += 1
+
+    def _remember(self):
+        game = self.game
+        snakes = _perspective(game, self.snake_id)
+        self._synced = (game.state_epoch, game.tick)
+        self._tails = [() if s is None else (s.body[-1], s.body[max(-2, -len(s.body))]) for s in snakes]
+        self._heads = [s.body[0] if s else None for s in snakes]
+        self._foods = list(game.foods); self._powerup = _powerup(game)
+
+    def update(self):
+        """Bring the arrays up to date with the game; returns the read-only (grid, timers) views."""
+        game = self.game
+        synced = self._synced
+        if synced == (game.state_epoch, game.tick - 1): self._advance()
+        elif synced != (game.state_epoch, game.tick): self.rebuild()
+        return self.grid, self.timers
+
+    def _advance(self):
+        game = self.game; grid = self._grid; w, h = game.width, game.height
+        snakes = _perspective(game, self.snake_id)
+        for (body_ch, head_ch), s, tail, old_head in zip(((OWN_BODY, OWN_HEAD), (OPP_BODY, OPP_HEAD)), snakes, self._tails, self._heads):
+            if s is None: continue
+            body = s.body; counts = s._segment_counts
+            # Only new heads and popped tails can change a body cell; membership decides overlaps
+            for pos in {body[0], body[min(1, len(body) - 1)], *tail}:
+                x, y = pos
+                if 0 <= x < w and 0 <= y < h: grid[body_ch, y, x] = pos in counts
+            x, y = old_head
+            if 0 <= x < w and 0 <= y < h: grid[head_ch, y, x] = 0
+            x, y = body[0]
+            if 0 <= x < w and 0 <= y < h: grid[head_ch, y, x] = 1
+        foods = game.foods
+        if foods != self._foods:
+            old = set(self._foods); new = set(foods)
+            for x, y in old - new: grid[FOOD, y, x] = 0
+            for x, y in new - old: grid[FOOD, y, x] = 1
+        pu = _powerup(game)
+        if pu != self._powerup:
+            if self._powerup: (x, y) = self._powerup[1]; grid[POWERUP_CHANNEL[self._powerup[0]], y, x] = 0
+            if pu: (x, y) = pu[1]; grid[POWERUP_CHANNEL[pu[0]], y, x] = 1
+        _fill_timers(game, self.snake_id, self._timers)
+        self._remember()
+
+class ObservationBatch:
+    """Observations of many same-sized games, maintained in place in one (n, channels, height, width) array."""
+    def __init__(self, games, snake_ids=1, dtype=np.float32):
+        games = list(games)
+        if not games: raise ValueError("no games")
+        width, height = games[0].width, games[0].height
+        if any((g.width, g.height) != (width, height) for g in games): raise ValueError("games differ in board size")
+        ids = [snake_ids] * len(games) if isinstance(snake_ids, int) else list(snake_ids)
+        self._grids = np.zeros((len(games), len(CHANNELS), height, width), dtype)
+        self._timers = np.zeros((len(games), len(TIMERS)), dtype)
+        self.grids = _read_only(self._grids); self.timers = _read_only(self._timers)
+        self.observations = [Observation(g, i, dtype, self._grids[k], self._timers[k]) for k, (g, i) in enumerate(zip(games, ids))]
+
+    def __len__(self): return len(self.observations)
+
+    def attach(self, index, game, snake_id=1):
+        """Point slot `index` at a new game (e.g. after an environment reset)."""
+        if (game.width, game.height) != self._grids.shape[:1:-1]: raise ValueError("game differs in board size")
+        self.observations[index] = Observation(game, snake_id, self._grids.dtype, self._grids[index], self._timers[index])
+
+    def update(self):
+        """Update every observation; returns the read-only (grids, timers) views of the whole batch."""
+        for o in self.observations: o.update()
+        return self.grids, self.timers
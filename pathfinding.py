@@ -0,0 +1,287 @@
+"""Computer opponent for Game and TwoPlayerGame built on a cached food distance field.
+
+DistanceField holds the BFS distance from every cell to the nearest food, with obstacles and
+every snake cell blocked. It is built once and then repaired: each tick only the cells that
+changed (new heads, popped tails, eaten and spawned foods) are edited. Cells that can no longer
+keep their distance are found by walking down from the edited cells in distance order and
+re-seeded from their unaffected neighbours; cells that got closer propagate outwards. A restore()
+or set_map() (seen through game.state_epoch) rebuilds the field; skipped ticks are caught up with
+one edit of everything that differs.
+
+PathBot picks, among the moves that do not hit anything next tick, the one closest to food whose
+flood fill still has room for the whole snake; without such a move it takes the most room. With a
+budget, all of choose() runs against one deadline: field repairs and rebuilds are resumable jobs
+that carry over to the next call when time runs out (the bot keeps deciding on the last complete
+distances meanwhile), and flood fills that do not finish leave the bot on the distances alone.
+
+    bot = PathBot(snake_id=1, budget_ms=1.0)
+    bot.act(game); game.update()
+"""
+import time
+import weakref
+from collections import deque
+
+INF = 1 << 30
+DIRECTIONS = (('UP', 0, -1), ('DOWN', 0, 1), ('LEFT', -1, 0), ('RIGHT', 1, 0))
+OPPOSITE = {'UP': 'DOWN', 'DOWN': 'UP', 'LEFT': 'RIGHT', 'RIGHT': 'LEFT'}
+_NEIGHBOURS = {}
+_CHUNK = 16 # Cells processed between deadline checks (the *_steps generators yield this often)
+
+def neighbours(width, height):
+    """Per cell id (y * width + x), the ids of its in-board neighbours; cached per board size."""
+    key = (width, height)
+    if key not in _NEIGHBOURS:
+        _NEIGHBOURS[key] = [tuple((y + dy) * width + x + dx for _, dx, dy in DIRECTIONS if 0 <= x + dx < width and 0 <= y + dy < height)
+                            for y in range(height) for x in range(width)]
+    return _NEIGHBOURS[key]
+
+class DistanceField:
+    """Multi-source BFS distances over the unblocked cells of a width x height board."""
+    def __init__(self, width, height):
+        self.width = width; self.height = height; self.nbrs = neighbours(width, height)
+        self.dist = [INF] * (width * height); self.blocked = bytearray(width * height); self.sources = set()
+
+    def rebuild(self):
+        _finish(self.rebuild_steps())
+
+    def edit(self, block=(), unblock=(), add_sources=(), remove_sources=()):
+        """Apply cell changes and repair the distances; returns how many cells were recomputed."""
+        return _finish(self.edit_steps(block, unblock, add_sources, remove_sources))
+
+    def rebuild_steps(self):
+        """rebuild() as a generator yielding every _CHUNK cells; self.dist is replaced when it finishes."""
+        dist = [INF] * len(self.dist); blocked = self.blocked; nbrs = self.nbrs
+        queue = deque(s for s in self.sources if not blocked[s])
+        for s in queue: dist[s] = 0
+        n = 0
+        while queue:
+            n += 1
+            if n % _CHUNK == 0: yield
+            u = queue.popleft(); d = dist[u] + 1
+            for v in nbrs[u]:
+                if d < dist[v] and not blocked[v]: dist[v] = d; queue.append(v)
+        self.dist = dist
+
+    def edit_steps(self, block=(), unblock=(), add_sources=(), remove_sources=(), in_place=True):
+        """edit() as a generator yielding every _CHUNK cells. The blocked cells and sources change on the
+        first step; with in_place=False the distances are repaired on a copy that replaces self.dist
+        when the generator finishes, so self.dist stays a complete (if stale) field until then."""
+        dist = self.dist if in_place else self.dist[:]; blocked = self.blocked; nbrs = self.nbrs; sources = self.sources
+        starts = []; n = 0
+        for c in remove_sources:
+            if c in sources: sources.discard(c); starts.append(c)
+        for c in block:
+            if not blocked[c]: blocked[c] = 1; starts.append(c)
+        # 1. Cells whose distance went up: walk down from the edits in distance order; a cell stays if
+        #    an unaffected neighbour is still one step closer to food
+        affected = set(); queue = deque()
+        for d, u in _in_distance_order(sorted((dist[c], c) for c in starts if dist[c] < INF), queue):
+            n += 1
+            if n % _CHUNK == 0: yield
+            if u in affected: continue
+            if not blocked[u] and (u in sources or any(dist[w] == d - 1 and w not in affected and not blocked[w] for w in nbrs[u])):
+                continue
+            affected.add(u)
+            for v in nbrs[u]:
+                if dist[v] == d + 1 and v not in affected: queue.append((d + 1, v))
+        for c in unblock: blocked[c] = 0
+        sources.update(add_sources)
+        if len(affected) > len(dist) // 8: # A plain BFS beats repairing a large region
+            yield from self.rebuild_steps(); return len(dist)
+        for u in affected: dist[u] = INF
+        # 2. Re-seed them and every cell that got closer, then propagate the decreases
+        seeds = []
+        for u in (*affected, *unblock, *add_sources):
+            n += 1
+            if n % _CHUNK == 0: yield
+            if blocked[u]: continue
+            d = 0 if u in sources else min([dist[w] for w in nbrs[u] if not blocked[w]], default=INF) + 1
+            if d < dist[u]: dist[u] = d; seeds.append((d, u))
+        changed = len(affected)
+        for d, u in _in_distance_order(sorted(seeds), queue):
+            n += 1
+            if n % _CHUNK == 0: yield
+            if d > dist[u]: continue
+            d += 1
+            for v in nbrs[u]:
+                if d < dist[v] and not blocked[v]: dist[v] = d; queue.append((d, v)); changed += 1
+        self.dist = dist
+        return changed
+
+def _finish(steps):
+    """Runs a *_steps generator to the end; returns its result."""
+    try:
+        while True: next(steps)
+    except StopIteration as stop:
+        return stop.value
+
+def _in_distance_order(seeds, queue):
+    """Yields (distance, cell) in nondecreasing distance from sorted seeds merged with a FIFO the caller
+    appends to (never with a smaller distance than the last one yielded): BFS from many start distances."""
+    i = 0; n = len(seeds)
+    while i < n or queue:
+        if queue and (i == n or queue[0][0] <= seeds[i][0]): yield queue.popleft()
+        else: yield seeds[i]; i += 1
+
+def _perspective(game, snake_id):
+    if hasattr(game, 'snake'): return game.snake, None # Game or bitboard.BitboardGame
+    return (game.snake1, game.snake2) if snake_id == 1 else (game.snake2, game.snake1)
+
+class PathBot:
+    def __init__(self, snake_id=1, budget_ms=1.0, incremental=True):
+        """budget_ms: time allowed per choose(), field upkeep included (None for no limit); incremental=False
+        rebuilds every tick. Only the first bot on a new board size pays for the shared neighbour table."""
+        self.snake_id = snake_id; self.budget = None if budget_ms is None else budget_ms / 1000
+        self.incremental = incremental
+        self.field = None; self._game = None; self._synced = None; self._job = None
+        self.rebuilds = 0; self.repaired = 0; self.overruns = 0 # overruns: choose() calls that ran out of budget
+        self.stale = 0 # choose() calls decided on a field that was not yet repaired to the current tick
+
+    # --- Field maintenance ---
+    def _sync(self, game, deadline):
+        """Works the field towards the game's current state until deadline; True when it is current.
+        _synced is the state the field reaches once the running job (if any) finishes."""
+        now = (game.state_epoch, game.tick)
+        while True:
+            if self._job is not None and not self._run(deadline): return False
+            synced = self._synced
+            if synced == now: return True
+            if self._game is None or self._game() is not game or not self.incremental or synced[0] != now[0]:
+                self._job = self._rebuild(game)
+            elif synced[1] == now[1] - 1: self._job = self._advance(game)
+            else: self._job = self._catch_up(game)
+
+    def _run(self, deadline):
+        """Steps the running job until it finishes (True) or the deadline passes (False)."""
+        job = self._job
+        try:
+            while deadline is None or time.perf_counter() <= deadline: next(job)
+        except StopIteration:
+            self._job = None; return True
+        return False
+
+    def _is_blocked(self, game, pos):
+        return pos in self._obstacles or any(pos in s._segment_counts for s in _perspective(game, 1) if s)
+
+    def _target_blocked(self, game):
+        """The blocked bitmap the field should have for the game as it is now."""
+        w, h = game.width, game.height; blocked = bytearray(self._obstacle_bits)
+        for s in _perspective(game, 1):
+            if not s: continue
+            for x, y in s._segment_counts:
+                if 0 <= x < w and 0 <= y < h: blocked[y * w + x] = 1
+        return blocked
+
+    def _rebuild(self, game):
+        w, h = game.width, game.height; old = self.field
+        field = self.field = DistanceField(w, h)
+        if old is not None and (old.width, old.height) == (w, h): field.dist = old.dist # Decide on it until the BFS is done
+        self._obstacles = {p for p in getattr(game, 'obstacles', ()) if 0 <= p[0] < w and 0 <= p[1] < h}
+        self._obstacle_bits = bytearray(w * h)
+        for x, y in self._obstacles: self._obstacle_bits[y * w + x] = 1
+        field.blocked = self._target_blocked(game)
+        field.sources = {y * w + x for x, y in game.foods}
+        self._game = weakref.ref(game); self._remember(game)
+        return self._counted(field.rebuild_steps(), 'rebuilds')
+
+    def _remember(self, game):
+        self._synced = (game.state_epoch, game.tick)
+        self._tails = [p for s in _perspective(game, 1) if s for p in (s.body[-1], s.body[max(-2, -len(s.body))])]
+        self._foods = list(game.foods)
+
+    def _edit(self, game, block, unblock):
+        """Repairs the field for block/unblock and the foods that changed since the last sync."""
+        w = game.width; foods = game.foods; added = removed = ()
+        if foods != self._foods:
+            old = set(self._foods); new = set(foods)
+            removed = [y * w + x for x, y in old - new]; added = [y * w + x for x, y in new - old]
+        self._remember(game)
+        return self._counted(self.field.edit_steps(block, unblock, added, removed, in_place=self.budget is None), 'repaired')
+
+    def _counted(self, steps, counter):
+        """A job: the field's steps, then the counter bumped by the result (a cell count) or by one."""
+        result = yield from steps
+        setattr(self, counter, getattr(self, counter) + (1 if result is None else result))
+
+    def _advance(self, game):
+        """One tick later: only the cells around heads and tails can have changed."""
+        w, h = game.width, game.height; field = self.field
+        dirty = set(self._tails) # Per snake at most two new heads and two popped tails changed
+        for s in _perspective(game, 1):
+            if s: dirty.add(s.body[0]); dirty.add(s.body[min(1, len(s.body) - 1)])
+        block = []; unblock = []
+        for pos in dirty:
+            x, y = pos
+            if not (0 <= x < w and 0 <= y < h): continue
+            c = y * w + x; now = self._is_blocked(game, pos)
+            if now and not field.blocked[c]: block.append(c)
+            elif not now and field.blocked[c]: unblock.append(c)
+        return self._edit(game, block, unblock)
+
+    def _catch_up(self, game):
+        """Several ticks later (a job ran over, or ticks were skipped): edit every cell that differs."""
+        target = self._target_blocked(game); current = self.field.blocked
+        diff = int.from_bytes(target, 'little') ^ int.from_bytes(current, 'little') # Byte i of the bitmaps is bit 8 * i
+        block = []; unblock = []
+        while diff:
+            low = diff & -diff; diff ^= low; c = low.bit_length() - 1 >> 3
+            (block if target[c] else unblock).append(c)
+        return self._edit(game, block, unblock)
+
+    # --- Decisions ---
+    def _room(self, start, limit, deadline):
+        """Free cells reachable from start, counting up to limit; None if the budget ran out first."""
+        blocked = self.field.blocked; nbrs = self.field.nbrs
+        seen = {start}; stack = [start]; n = 0
+        while stack and len(seen) < limit:
+            if deadline is not None and n % _CHUNK == 0 and time.perf_counter() > deadline: return None
+            n += 1
+            for v in nbrs[stack.pop()]:
+                if v not in seen and not blocked[v]: seen.add(v); stack.append(v)
+        return len(seen)
+
+    def choose(self, game):
+        """The direction to steer this tick."""
+        deadline = None if self.budget is None else time.perf_counter() + self.budget
+        if not self._sync(game, deadline): self.stale += 1
+        own, opp = _perspective(game, self.snake_id)
+        w, h = game.width, game.height; field = self.field
+        hx, hy = own.body[0]; tail = own.body[-1]
+        opp_next = set()
+        if opp:
+            ox, oy = opp.body[0]
+            opp_next = {(ox + dx, oy + dy) for _, dx, dy in DIRECTIONS}
+        moves = []
+        for d, dx, dy in DIRECTIONS:
+            if own.is_started and d == OPPOSITE[own.direction]: continue
+            x, y = hx + dx, hy + dy
+            if own.is_wall_ghost: x %= w; y %= h
+            if not (0 <= x < w and 0 <= y < h): continue
+            c = y * w + x
+            # The own tail moves away this tick unless the snake is growing. Checked on the game, as the
+            # field's blocked cells lag behind while a repair is carried over
+            if self._is_blocked(game, (x, y)) and not ((x, y) == tail and not own.grow_pending and own._segment_counts[tail] == 1): continue
+            moves.append((d, c, (x, y) in opp_next))
+        if not moves: return own.direction
+        limit = len(own.body) + 1; out_of_time = False; scored = []
+        for d, c, head_on in moves:
+            room = None if out_of_time else self._room(c, limit, deadline)
+            if room is None: out_of_time = True; room = limit # Unknown: trust the distances
+            scored.append((room < limit, head_on, field.dist[c], -room, d != own.direction, d))
+        if deadline is not None and time.perf_counter() > deadline: self.overruns += 1
+        return min(scored)[-1]
+
+    def act(self, game):
+        """Steer the bot's snake through change_snake_direction."""
+        d = self.choose(game)
+        if hasattr(game, 'snake'): game.change_snake_direction(d)
+        else: game.change_snake_direction(self.snake_id, d)
+        return d
+
+_BOTS = weakref.WeakKeyDictionary()
+
+def path_bot(game, snake_id, rng):
+    """bots.BOTS adapter: one PathBot per game and snake. Unbudgeted, so tournaments stay reproducible."""
+    bots = _BOTS.setdefault(game, {})
+    if snake_id not in bots: bots[snake_id] = PathBot(snake_id, budget_ms=None)
+    return bots[snake_id].choose(game)
@@ -0,0 +1,121 @@
+import hashlib
+import struct
+import sys
+import time
+from snake_core import Game, TwoPlayerGame
+
+# --- Replay format ---
+# Header (little-endian): magic, version, kind (1 single / 2 two-player), width, height, map_id,
+# game mode, target score, seed, tick count, event count. Each event is the varint tick delta since
+# the previous event followed by one byte: queued << 4 | snake_id << 2 | direction index, where
+# queued marks a buffered input (queue_turn) rather than an immediate one (change_snake_direction).
+MAGIC = b'SNKR'
+VERSION = 2
+QUEUED = 0x10
+_HEADER = struct.Struct('<4sBBHHIBHQII') # map_id is u32: maps.register() takes ids up to MAX_MAP_ID
+DIRECTIONS = ('UP', 'DOWN', 'LEFT', 'RIGHT')
+GAME_MODES = ('last_snake', 'first_to_x')
+
+class Replay:
+    def __init__(self, kind, width, height, seed, ticks, events, map_id=0, game_mode='last_snake', target_score=10):
+        self.kind = kind; self.width = width; self.height = height; self.seed = seed
+        self.ticks = ticks; self.events = events # events: list of (tick, snake_id, direction, queued)
+        self.map_id = map_id; self.game_mode = game_mode; self.target_score = target_score
+
+    def new_game(self):
+        if self.kind == 1: return Game(self.width, self.height, seed=self.seed)
+        return TwoPlayerGame(self.width, self.height, map_id=self.map_id, game_mode=self.game_mode,
+                             target_score=self.target_score, seed=self.seed)
+
+def record(game):
+    """Start logging direction inputs on a freshly created game."""
+    if game.tick != 0: raise ValueError("recording must start before the first update()")
+    game.input_log = []
+    return game
+
+def _write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80); value >>= 7
+    out.append(value)
+
+def _read_varint(data, pos):
+    value = 0; shift = 0
+    while True:
+        b = data[pos]; pos += 1
+        value |= (b & 0x7F) << shift
+        if b < 0x80: return value, pos
+        shift += 7
+
+def encode_replay(game):
+    if game.input_log is None: raise ValueError("game was not recorded; call replay.record(game) first")
+    if not 0 <= game.seed < 2**64: raise ValueError("replays need an unsigned 64-bit integer seed")
+    two = not hasattr(game, 'snake')
+    events = [(t, sid, DIRECTIONS.index(d), queued) for t, sid, d, queued in game.input_log if d in DIRECTIONS]
+    body = bytearray()
+    last = 0
+    for t, sid, d, queued in events:
+        _write_varint(body, t - last); body.append((QUEUED if queued else 0) | sid << 2 | d); last = t
+    header = _HEADER.pack(MAGIC, VERSION, 2 if two else 1, game.width, game.height,
+                          game.map_id if two else 0, GAME_MODES.index(game.game_mode) if two else 0,
+                          game.target_score if two else 0, game.seed, game.tick, len(events))
+    return header + bytes(body)
+
+def decode_replay(data):
+    magic, version, kind, width, height, map_id, mode, target, seed, ticks, count = _HEADER.unpack_from(data)
+    if magic != MAGIC: raise ValueError("not a snake replay")
+    if version != VERSION: raise ValueError(f"unsupported replay version {version}")
+    pos = _HEADER.size; t = 0; events = []
+    for _ in range(count):
+        delta, pos = _read_varint(data, pos)
+        t += delta; b = data[pos]; pos += 1
+        events.append((t, b >> 2 & 3, DIRECTIONS[b & 3], bool(b & QUEUED)))
+    return Replay(kind, width, height, seed, ticks, events, map_id, GAME_MODES[mode], target)
+
+def save_replay(path, game):
+    with open(path, 'wb') as f: f.write(encode_replay(game))
+
+def load_replay(path):
+    with open(path, 'rb') as f: return decode_replay(f.read())
+
+def play_replay(replay):
+    """Re-simulate a replay headlessly at full speed and return the final game."""
+    if isinstance(replay, (bytes, bytearray)): replay = decode_replay(replay)
+    game = replay.new_game()
+    events = replay.events; i = 0; n = len(events)
+    two = replay.kind == 2
+    def apply(event):
+        _, sid, d, queued = event
+        send = game.queue_turn if queued else game.change_snake_direction
+        if two: send(sid, d)
+        else: send(d)
+    for tick in range(replay.ticks):
+        while i < n and events[i][0] == tick: apply(events[i]); i += 1
+        game.update()
+    while i < n: apply(events[i]); i += 1 # Inputs after the last update (e.g. pressed on the final frame)
+    return game
+
+def game_state(game):
+    """Everything that determines how a game continues, as plain tuples."""
+    snakes = [game.snake] if hasattr(game, 'snake') else [game.snake1, game.snake2]
+    pu = game.powerup_item
+    return (game.tick, game.game_over, getattr(game, 'winner', None), list(game.foods),
+            (pu.type_id, pu.position) if pu else None, game.powerup_on_map_lifespan_timer,
+            [(list(s.body), s.direction, s.grow_pending, s.score, s.is_started, s.active_powerup_type,
+              s.powerup_effect_timer, s.is_wall_ghost, s.steps_per_update, s.is_slowed_timer,
+              s.slow_effect_counter, list(s.input_queue)) for s in snakes],
+            game.rng.getstate())
+
+def state_fingerprint(game):
+    return hashlib.sha256(repr(game_state(game)).encode()).hexdigest()
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2:
+        print("usage: python replay.py REPLAY_FILE"); sys.exit(2)
+    replay = load_replay(sys.argv[1])
+    t0 = time.perf_counter()
+    game = play_replay(replay)
+    elapsed = time.perf_counter() - t0
+    scores = (game.get_score(),) if replay.kind == 1 else game.get_scores()
+    print(f"ticks={replay.ticks} inputs={len(replay.events)} scores={scores} "
+          f"winner={getattr(game, 'winner', None)} ticks/s={replay.ticks / max(elapsed, 1e-9):.0f}")
+    print(f"state={state_fingerprint(game)}")
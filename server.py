@@ -0,0 +1,198 @@
+"""Asyncio server hosting many TwoPlayerGame rooms on one shared tick scheduler.
+
+Protocol: newline-delimited JSON over TCP.
+  client -> server  {"op": "join", "room": "r1", "map": 0, "mode": "last_snake", "target": 10}
+                    {"op": "dir", "d": "UP", "seq": 17}      (seq is optional, echoed back as an ack)
+                    {"op": "stats", "reset": false}          (scheduler timings, for load tests)
+  server -> client  {"t": "joined", "room": "r1", "snake": 1}
+                    {"t": "s", "k": tick, "h": [[x, y], [x, y]], "n": [len1, len2], "sc": [s1, s2],
+                     "f": [[x, y], ...], "p": [type, x, y] | null, "a": [ack1, ack2], "w": winner | null}
+                    {"t": "stats", "rooms": n, "ticks": n, "jitter": {...}, "work": {...}}
+                    {"t": "error", "msg": "..."}
+The first player to join a room picks its options (a registered map id, a game mode and a positive
+integer target; anything else gets an error); the game ticks once both seats are taken. A room whose
+game raises is closed with an error to its players, without stopping the other rooms.
+Bodies are not sent: a client rebuilds them from successive heads and lengths.
+
+    python server.py [--host 127.0.0.1] [--port 8765] [--tick-rate 10] [--restart]
+"""
+import argparse
+import asyncio
+import json
+import sys
+from snake_core import TwoPlayerGame
+from maps import MAPS
+from metrics import Histogram
+from replay import GAME_MODES
+
+GRID_WIDTH, GRID_HEIGHT = 40, 30
+MAX_WRITE_BUFFER = 1 << 16 # Clients that fall this far behind are dropped rather than buffered forever
+
+def _dumps(obj):
+    return (json.dumps(obj, separators=(',', ':')) + '\n').encode()
+
+def _room_options(msg):
+    """(map_id, game_mode, target_score) from a join message; ValueError describes the first bad one."""
+    map_id = msg.get('map', 0); game_mode = msg.get('mode', 'last_snake'); target = msg.get('target', 10)
+    if type(map_id) is not int or map_id not in MAPS: raise ValueError(f'unknown map {map_id!r}')
+    if game_mode not in GAME_MODES: raise ValueError(f'unknown mode {game_mode!r}, expected one of {list(GAME_MODES)}')
+    if type(target) is not int or target <= 0: raise ValueError(f'target must be a positive integer, got {target!r}')
+    return map_id, game_mode, target
+
+class Room:
+    def __init__(self, name, map_id=0, game_mode='last_snake', target_score=10, seed=None):
+        self.name = name; self.options = (map_id, game_mode, target_score)
+        self.game = TwoPlayerGame(GRID_WIDTH, GRID_HEIGHT, map_id=map_id, game_mode=game_mode,
+                                  target_score=target_score, seed=seed)
+        self.players = {1: None, 2: None} # snake_id -> StreamWriter
+        self.acks = [0, 0]
+
+    def is_full(self): return all(self.players.values())
+    def is_empty(self): return not any(self.players.values())
+
+    def restart(self):
+        map_id, game_mode, target_score = self.options
+        self.game = TwoPlayerGame(GRID_WIDTH, GRID_HEIGHT, map_id=map_id, game_mode=game_mode,
+                                  target_score=target_score)
+
+    def state_message(self):
+        g = self.game; pu = g.powerup_item
+        return _dumps({'t': 's', 'k': g.tick, 'h': [g.snake1.body[0], g.snake2.body[0]],
+                       'n': [len(g.snake1.body), len(g.snake2.body)], 'sc': [g.snake1.score, g.snake2.score],
+                       'f': g.foods, 'p': [pu.type_id, *pu.position] if pu else None, 'a': self.acks,
+                       'w': g.winner})
+
+async def _read_line(reader):
+    """reader.readline(), except that a line over the stream limit is skipped whole and gives None."""
+    try: return await reader.readuntil(b'\n')
+    except asyncio.IncompleteReadError as e: return e.partial # EOF, as readline()
+    except asyncio.LimitOverrunError as e: consumed = e.consumed
+    while True: # Drop the buffered part and keep reading until the line's newline
+        await reader.readexactly(consumed)
+        try: await reader.readuntil(b'\n'); return None
+        except asyncio.LimitOverrunError as e: consumed = e.consumed
+
+class GameServer:
+    def __init__(self, tick_rate=10, restart_finished=False):
+        self.tick_rate = tick_rate; self.restart_finished = restart_finished
+        self.rooms = {}
+        self.tick_jitter = Histogram() # ns between a tick's scheduled and actual start
+        self.tick_work = Histogram() # ns spent stepping and broadcasting all rooms
+        self._server = None; self._running = False
+
+    async def start(self, host='127.0.0.1', port=8765):
+        self._server = await asyncio.start_server(self.handle_client, host, port)
+        return self._server
+
+    @property
+    def port(self): return self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        self._running = False
+        if self._server is not None: self._server.close(); await self._server.wait_closed()
+        for room in self.rooms.values():
+            for w in room.players.values():
+                if w is not None: w.close()
+
+    # --- Connections ---
+    async def handle_client(self, reader, writer):
+        room = None; snake_id = None
+        try:
+            while True:
+                line = await _read_line(reader)
+                if line is None: writer.write(_dumps({'t': 'error', 'msg': 'line too long'})); continue
+                if not line: break
+                try: msg = json.loads(line)
+                except ValueError: writer.write(_dumps({'t': 'error', 'msg': 'bad json'})); continue
+                if not isinstance(msg, dict): writer.write(_dumps({'t': 'error', 'msg': 'bad message'})); continue
+                op = msg.get('op')
+                if op == 'dir' and room is not None:
+                    room.game.change_snake_direction(snake_id, msg.get('d'))
+                    if 'seq' in msg: room.acks[snake_id - 1] = msg['seq']
+                elif op == 'join' and room is None:
+                    try: room, snake_id = self._join(msg)
+                    except ValueError as e: writer.write(_dumps({'t': 'error', 'msg': str(e)})); continue
+                    if room is None: writer.write(_dumps({'t': 'error', 'msg': 'room is full'})); continue
+                    room.players[snake_id] = writer
+                    writer.write(_dumps({'t': 'joined', 'room': room.name, 'snake': snake_id}))
+                elif op == 'stats':
+                    writer.write(_dumps(self.stats(reset=bool(msg.get('reset')))))
+                else:
+                    writer.write(_dumps({'t': 'error', 'msg': f'unexpected op {op!r}'}))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if room is not None and room.players[snake_id] is writer: # step() may have dropped it already
+                room.players[snake_id] = None
+                if room.is_empty() and self.rooms.get(room.name) is room: del self.rooms[room.name]
+            writer.close()
+
+    def _join(self, msg):
+        name = str(msg.get('room', 'default'))
+        room = self.rooms.get(name)
+        if room is None:
+            room = self.rooms[name] = Room(name, *_room_options(msg))
+        for snake_id in (1, 2):
+            if room.players[snake_id] is None: return room, snake_id
+        return None, None
+
+    def stats(self, reset=False):
+        out = {'t': 'stats', 'rooms': len(self.rooms), 'ticks': self.tick_jitter.count,
+               'jitter': self.tick_jitter.summary(), 'work': self.tick_work.summary()}
+        if reset: self.tick_jitter.reset(); self.tick_work.reset()
+        return out
+
+    # --- Tick scheduler ---
+    def step(self):
+        """Advance every full room by one tick and broadcast its state."""
+        finished = []; broken = []
+        for room in self.rooms.values():
+            for snake_id, writer in room.players.items():
+                if writer is not None and writer.is_closing(): room.players[snake_id] = None # Left or dropped
+            if not room.is_full(): continue
+            game = room.game
+            if game.game_over: continue # Its final state went out on the tick it ended
+            try: game.update(); data = room.state_message()
+            except Exception as e: broken.append((room, e)); continue
+            for writer in room.players.values():
+                if writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER: writer.close(); continue
+                writer.write(data)
+            if game.game_over: finished.append(room)
+        for room in finished:
+            if self.restart_finished: room.restart()
+        for room, error in broken: self._close_room(room, f'room closed: {type(error).__name__}: {error}')
+        for room in [r for r in self.rooms.values() if r.is_empty()]: del self.rooms[room.name]
+
+    def _close_room(self, room, msg):
+        del self.rooms[room.name]
+        for writer in room.players.values():
+            if writer is not None: writer.write(_dumps({'t': 'error', 'msg': msg})); writer.close()
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        period = 1 / self.tick_rate
+        next_tick = loop.time(); self._running = True
+        while self._running:
+            now = loop.time()
+            self.tick_jitter.record(int(max(0.0, now - next_tick) * 1e9))
+            self.step()
+            self.tick_work.record(int((loop.time() - now) * 1e9))
+            next_tick += period
+            if next_tick < loop.time(): next_tick = loop.time() # Overloaded: skip ahead rather than burst
+            await asyncio.sleep(next_tick - loop.time())
+
+async def _serve(args):
+    server = GameServer(args.tick_rate, args.restart)
+    await server.start(args.host, args.port)
+    print(f"listening on {args.host}:{server.port} at {args.tick_rate} ticks/s", flush=True)
+    try: await server.run()
+    finally: await server.close()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Host TwoPlayerGame rooms over TCP.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--tick-rate', type=float, default=10)
+    parser.add_argument('--restart', action='store_true', help='start a new game in a room when one ends')
+    try: asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt: sys.exit(0)
@@ -1,23 +1,9 @@
+import copy
 import random
+from array import array
+from collections import deque
 
-# --- Map Definitions ---
-# GRID_WIDTH=30, GRID_HEIGHT=20 (based on main.py defaults, assumed for these coordinates)
-MAP_DEFINITIONS = {
-    0: [], # Default empty map
-    1: [ # "Central Blocks" - As per prompt's original design
-        (10,10), (11,10), (12,10), 
-        (18,10), (19,10), (20,10),
-        # Optional extra blocks for more substance
-        (10,12), (11,12), (12,12), 
-        (18,12), (19,12), (20,12),
-    ],
-    2: [ # "Pillars"
-        (7, 4), (7, 5), # Top-Left
-        (22, 4), (22, 5), # Top-Right
-        (7, 14), (7, 15), # Bottom-Left
-        (22, 14), (22, 15), # Bottom-Right
-    ]
-}
+from maps import MAP_DEFINITIONS, map_layout # MAP_DEFINITIONS re-exported for existing imports
 
 # --- PowerUp Class ---
 class PowerUp:
@@ -28,22 +14,145 @@ class PowerUp:
         self.symbol = symbol 
         self.effect_duration = effect_duration
 
+# --- Free Cell Index ---
+class FreeCellIndex:
+    """Incrementally maintained set of empty in-bounds cells.
+
+    Occupants (snake segments, foods, power-ups, obstacles) are reference counted so
+    overlapping occupants (e.g. a head moving onto food) release the cell correctly.
+    Free cells live in a flat array of cell ids (y*width+x) with a cell->slot array for
+    O(1) swap-remove and O(1) uniform sampling. Being flat arrays, the whole index can be
+    snapshotted with a few memcpys, which keeps sampling order (and so spawns) identical
+    after a restore.
+    """
+    def __init__(self, width, height, occupied=()):
+        self.width = width; self.height = height
+        n = width * height
+        code = 'H' if n <= 0xFFFF else 'I'
+        self._free = array(code, range(n))
+        self._slot = array(code, range(n)) # Only meaningful for free cells
+        self._count = array('H', bytes(2 * n))
+        for pos in occupied: self.occupy(pos)
+
+    def occupy(self, pos):
+        x, y = pos
+        if not (0 <= x < self.width and 0 <= y < self.height): return
+        c = y * self.width + x
+        n = self._count[c]
+        self._count[c] = n + 1
+        if n == 0:
+            i = self._slot[c]; last = self._free.pop()
+            if last != c: self._free[i] = last; self._slot[last] = i
+
+    def release(self, pos):
+        x, y = pos
+        if not (0 <= x < self.width and 0 <= y < self.height): return
+        c = y * self.width + x
+        n = self._count[c]
+        if n == 0: return
+        self._count[c] = n - 1
+        if n == 1: self._slot[c] = len(self._free); self._free.append(c)
+
+    def sample(self, rng=random):
+        if not self._free: return None
+        c = self._free[rng.randrange(len(self._free))]
+        return (c % self.width, c // self.width)
+
+    def is_free(self, pos):
+        x, y = pos
+        return 0 <= x < self.width and 0 <= y < self.height and self._count[y * self.width + x] == 0
+    def __len__(self): return len(self._free)
+
+    @classmethod
+    def for_layout(cls, layout):
+        """A fresh index with a maps.MapLayout's obstacles occupied, copied from a template cached on the layout."""
+        template = layout.cache.get('free_cells')
+        if template is None: template = layout.cache['free_cells'] = cls(layout.width, layout.height, layout.obstacles)
+        index = copy.copy(template); index.restore(template.snapshot())
+        return index
+
+    def snapshot(self): return (self._free[:], self._slot[:], self._count[:])
+    def restore(self, state):
+        free, slot, count = state
+        self._free = free[:]; self._slot = slot[:]; self._count = count[:]
+
+# --- Timer Wheel ---
+EFFECT_EXPIRY, SLOW_EXPIRY, ITEM_EXPIRY = range(3)
+
+class TimerWheel:
+    """Expiry events keyed by the tick they fall due on, so a tick where nothing runs out costs one dict lookup.
+
+    Events are (kind, target, tick) and are never cancelled: refreshing or clearing a timer just
+    stores a new end tick on its owner, and the handler drops events whose tick no longer matches
+    (lazy deletion). The wheel takes any number of timers per target, but effects do not stack:
+    a snake has one effect slot (active_powerup_type, effect_ends) and slowed_ends, and a pickup
+    replaces whatever runs on the snake it applies to. Only timers on different snakes (and the
+    map item) run at the same time.
+    """
+    def __init__(self, now=0): self.now = now; self._due = {}
+    def schedule(self, tick, kind, target): self._due.setdefault(tick, []).append((kind, target, tick))
+    def advance(self, tick): # Call once per tick, in order; returns the events due on it
+        self.now = tick
+        return self._due.pop(tick, ())
+    def reset(self, now): self.now = now; self._due = {} # After a jump in time (restore); owners reschedule
+    def __len__(self): return sum(map(len, self._due.values()))
+
+# Game and TwoPlayerGame: the power-up item's lifespan as an end tick on the wheel (read by the HUD as ticks left)
+def _item_lifespan(game): return max(0, game.powerup_item_ends - game.timers.now)
+def _set_item_lifespan(game, ticks):
+    game.powerup_item_ends = game.timers.now + ticks
+    if game.powerup_item: game.timers.schedule(max(game.powerup_item_ends, game.timers.now + 1), ITEM_EXPIRY, game)
+
+def _expire_item(game, kind, tick):
+    if kind == ITEM_EXPIRY and game.powerup_item and game.powerup_item_ends <= tick: game._clear_powerup_item()
+
+# --- Buffered Input ---
+INPUT_BUFFER_SIZE = 3 # Turns a snake can have queued; presses beyond that before the next move step are dropped
+OPPOSITE = {'UP': 'DOWN', 'DOWN': 'UP', 'LEFT': 'RIGHT', 'RIGHT': 'LEFT'}
+
 class Snake:
     def __init__(self, snake_id, initial_pos, initial_direction='RIGHT', color='GREEN'):
         self.id = snake_id
-        self.body = [initial_pos]
+        self.body = deque([initial_pos]) # Head at index 0; O(1) push/pop at both ends
+        self._segment_counts = {initial_pos: 1} # Occupancy index for O(1) body membership
         self.direction = initial_direction
         self.grow_pending = False
         self.color = color 
         self.score = 0 
 
+        self.timers = TimerWheel() # The owning game attaches its own wheel
         self.active_powerup_type = None 
-        self.powerup_effect_timer = 0   
+        self.effect_ends = 0 # Tick the active power-up runs out on; see powerup_effect_timer
         self.is_wall_ghost = False      
         self.steps_per_update = 1       
-        self.is_slowed_timer = 0        
+        self.slowed_ends = 0 # Tick a slow_opponent hit wears off on; see is_slowed_timer
         self.slow_effect_counter = 0    
         self.is_started = False # MODIFIED: For static start
+        self.cell_index = None # FreeCellIndex kept in sync by move()/set_head(), attached by the game
+        self.input_queue = deque() # Buffered turns (queue_turn), taken one per move step by the game
+
+    # Effect durations are stored as end ticks on the game's TimerWheel; these read and set the ticks left
+    @property
+    def powerup_effect_timer(self): return max(0, self.effect_ends - self.timers.now)
+    @powerup_effect_timer.setter
+    def powerup_effect_timer(self, ticks):
+        self.effect_ends = self.timers.now + ticks
+        if ticks > 0: self.timers.schedule(self.effect_ends, EFFECT_EXPIRY, self)
+
+    @property
+    def is_slowed_timer(self): return max(0, self.slowed_ends - self.timers.now)
+    @is_slowed_timer.setter
+    def is_slowed_timer(self, ticks):
+        self.slowed_ends = self.timers.now + ticks
+        if ticks > 0: self.timers.schedule(self.slowed_ends, SLOW_EXPIRY, self)
+
+    def expire(self, kind, tick):
+        """Handle a TimerWheel event for this snake; stale events (the timer was reset since) do nothing."""
+        if kind == EFFECT_EXPIRY and self.effect_ends == tick:
+            if self.active_powerup_type == 'speed_self': self.steps_per_update = 1
+            elif self.active_powerup_type == 'wall_ghost': self.is_wall_ghost = False
+            self.active_powerup_type = None
+        elif kind == SLOW_EXPIRY and self.slowed_ends == tick: self.slow_effect_counter = 0
 
     def move(self):
         head_x, head_y = self.body[0]
@@ -52,9 +161,32 @@ class Snake:
         elif self.direction == 'LEFT': new_head = (head_x - 1, head_y)
         elif self.direction == 'RIGHT': new_head = (head_x + 1, head_y)
         else: new_head = (head_x, head_y)
-        self.body.insert(0, new_head)
+        self.body.appendleft(new_head); self._add_segment(new_head)
+        if self.cell_index is not None: self.cell_index.occupy(new_head)
         if self.grow_pending: self.grow_pending = False
-        else: self.body.pop()
+        else:
+            tail = self.body.pop(); self._remove_segment(tail)
+            if self.cell_index is not None: self.cell_index.release(tail)
+
+    def set_head(self, new_head): # Used for wall_ghost wrapping
+        old_head = self.body[0]
+        if self.cell_index is not None: self.cell_index.release(old_head); self.cell_index.occupy(new_head)
+        self._remove_segment(old_head); self._add_segment(new_head)
+        self.body[0] = new_head
+
+    def reset_body(self, initial_pos):
+        self.body = deque([initial_pos]); self._segment_counts = {initial_pos: 1}
+
+    def _add_segment(self, pos): self._segment_counts[pos] = self._segment_counts.get(pos, 0) + 1
+    def _remove_segment(self, pos):
+        n = self._segment_counts[pos]
+        if n > 1: self._segment_counts[pos] = n - 1
+        else: del self._segment_counts[pos]
+
+    def hits_body(self, pos): # True if pos overlaps any segment other than the head, i.e. `pos in body[1:]`
+        n = self._segment_counts.get(pos, 0)
+        if pos == self.body[0]: n -= 1
+        return n > 0
 
     def turn(self, new_direction): # MODIFIED: For static start
         valid_directions = ['UP', 'DOWN', 'LEFT', 'RIGHT']
@@ -75,15 +207,50 @@ class Snake:
                (new_direction == 'RIGHT' and self.direction != 'LEFT'):
                 self.direction = new_direction
 
+    def queue_turn(self, new_direction):
+        """Buffer a turn for a later move step; False if it is not a direction or the buffer is full."""
+        if new_direction not in OPPOSITE or len(self.input_queue) >= INPUT_BUFFER_SIZE: return False
+        self.input_queue.append(new_direction); return True
+
+    def take_turn(self):
+        """Apply the first buffered turn that changes direction (any turn starts the snake); queued
+        repeats and reversals in front of it are dropped. Returns whether a turn was applied."""
+        q = self.input_queue
+        while q:
+            d = q.popleft()
+            if not self.is_started or (d != self.direction and d != OPPOSITE[self.direction]): self.turn(d); return True
+        return False
+
     def grow(self):
         self.grow_pending = True; self.score +=1
     def get_head_position(self): return self.body[0]
     def get_body(self): return self.body
 
+    def snapshot(self):
+        return (tuple(self.body), self._segment_counts.copy(), self.direction, self.grow_pending, self.score,
+                self.is_started, self.active_powerup_type, self.powerup_effect_timer, self.is_wall_ghost,
+                self.steps_per_update, self.is_slowed_timer, self.slow_effect_counter, tuple(self.input_queue))
+
+    def restore(self, state): # Does not touch cell_index; the owning game restores that (and resets the wheel) first
+        (body, counts, self.direction, self.grow_pending, self.score, self.is_started, self.active_powerup_type,
+         self.powerup_effect_timer, self.is_wall_ghost, self.steps_per_update, self.is_slowed_timer,
+         self.slow_effect_counter, queue) = state
+        self.input_queue = deque(queue)
+        self.body = deque(body); self._segment_counts = counts.copy()
+
 class Game: # Single Player Game
-    def __init__(self, width, height):
+    powerup_on_map_lifespan_timer = property(_item_lifespan, _set_item_lifespan); expire = _expire_item
+
+    def __init__(self, width, height, seed=None):
         self.width = width; self.height = height
-        self.snake = Snake(1, (width // 2, height // 2)) 
+        # Per-game RNG; an unseeded game draws its seed from the global RNG so it can still be replayed
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self.rng = random.Random(self.seed)
+        self.tick = 0; self.input_log = None # input_log: list of (tick, snake_id, direction, queued) while recording
+        self.state_epoch = 0 # Bumped when the state jumps instead of advancing a tick (restore, set_map)
+        self.profiler = None # Optional metrics.Profiler; see update()
+        self.timers = TimerWheel() # Power-up effect and item expiries
+        self.snake = Snake(1, (width // 2, height // 2)); self.snake.timers = self.timers
         self.foods = [] 
         self.MAX_FOOD_ITEMS = 5 
         self.game_over = False
@@ -93,40 +260,37 @@ class Game: # Single Player Game
             'speed_self': {'symbol': 'S', 'color': 'LIGHTBLUE', 'effect_duration': 50, 'applies_to': 'self'},
             'wall_ghost': {'symbol': 'G', 'color': 'PURPLE', 'effect_duration': 70, 'applies_to': 'self'},
         }
+        self._free_cells = FreeCellIndex(width, height, self.snake.get_body())
+        self.snake.cell_index = self._free_cells
         self._generate_food() 
         # self.snake.is_started is False by default
 
-    def _generate_location(self, dynamic_occupied_spaces):
-        full_occupied_spaces = set(dynamic_occupied_spaces) 
-        if len(full_occupied_spaces) >= self.width * self.height: return None 
-        attempts=0; max_attempts = (self.width*self.height)-len(full_occupied_spaces)+10
-        if max_attempts <=0 : max_attempts = 1
-        while attempts < max_attempts:
-            pos = (random.randint(0,self.width-1), random.randint(0,self.height-1))
-            if pos not in full_occupied_spaces: return pos
-            attempts +=1
-        return None 
+    def _generate_location(self):
+        # Uniform pick from the free-cell index (snake body, foods and power-up are kept occupied)
+        pos = self._free_cells.sample(self.rng)
+        if self.profiler:
+            self.profiler.count('spawn_attempts')
+            if pos is None: self.profiler.count('spawn_failures')
+        return pos
 
     def _generate_food(self): 
         while len(self.foods) < self.MAX_FOOD_ITEMS:
-            current_occupied = self.snake.get_body() + self.foods
-            if self.powerup_item: current_occupied.append(self.powerup_item.position)
-            new_food_pos = self._generate_location(current_occupied)
-            if new_food_pos: self.foods.append(new_food_pos)
+            new_food_pos = self._generate_location()
+            if new_food_pos: self.foods.append(new_food_pos); self._free_cells.occupy(new_food_pos)
             else: break 
 
     def _generate_powerup_item(self):
-        if self.powerup_item is None and random.random() < self.powerup_spawn_chance:
-            current_occupied = self.snake.get_body() + self.foods
-            if self.powerup_item: current_occupied.append(self.powerup_item.position)
-            pos = self._generate_location(current_occupied) 
+        if self.powerup_item is None and self.rng.random() < self.powerup_spawn_chance:
+            pos = self._generate_location() 
             if pos is None: return 
-            type_id = random.choice(list(self.POWERUP_DEFINITIONS.keys()))
-            definition = self.POWERUP_DEFINITIONS[type_id]
-            self.powerup_item = PowerUp(type_id,pos,definition['color'],definition['symbol'],definition['effect_duration'])
+            type_id = self.rng.choice(list(self.POWERUP_DEFINITIONS.keys()))
+            self.powerup_item = self._make_powerup(type_id, pos)
+            self._free_cells.occupy(pos)
             self.powerup_on_map_lifespan_timer = self.POWERUP_MAP_LIFESPAN
 
-    def _clear_powerup_item(self): self.powerup_item=None; self.powerup_on_map_lifespan_timer=0
+    def _clear_powerup_item(self):
+        if self.powerup_item: self._free_cells.release(self.powerup_item.position)
+        self.powerup_item=None; self.powerup_on_map_lifespan_timer=0
         
     def _activate_powerup(self, powerup_type): 
         definition = self.POWERUP_DEFINITIONS[powerup_type]
@@ -141,37 +305,42 @@ class Game: # Single Player Game
         if self.snake.active_powerup_type is not None:
              self.snake.active_powerup_type = None; self.snake.powerup_effect_timer = 0
             
-    def _update_powerup_timers(self): 
-        if self.snake.powerup_effect_timer > 0:
-            self.snake.powerup_effect_timer -= 1
-            if self.snake.powerup_effect_timer == 0: 
-                if self.snake.active_powerup_type=='speed_self': self.snake.steps_per_update=1
-                elif self.snake.active_powerup_type=='wall_ghost': self.snake.is_wall_ghost=False
-                self.snake.active_powerup_type = None 
-        if self.powerup_item:
-            self.powerup_on_map_lifespan_timer -=1
-            if self.powerup_on_map_lifespan_timer <= 0: self._clear_powerup_item()
+    def _update_powerup_timers(self): # Only the timers running out this tick cost anything
+        for kind, target, tick in self.timers.advance(self.tick): target.expire(kind, tick)
 
     def update(self):
+        prof = self.profiler
+        if prof is None: return self._step(None)
+        prof.begin_tick()
+        try: self._step(prof)
+        finally: prof.end_tick()
+
+    def _step(self, prof): # One tick; prof.mark(phase) charges the time since the previous mark to phase
         if self.game_over: return
+        self.tick += 1
         self._update_powerup_timers()
+        if prof: prof.mark('powerup_timers')
 
+        # Buffered input: one turn per move step; a buffered first press starts the snake and is this tick's turn
+        started_now = not self.snake.is_started and self.snake.take_turn()
         if not self.snake.is_started: # MODIFIED: Gate game logic until snake starts
             return
 
         head_pos_before_move = self.snake.get_head_position() 
 
-        for _ in range(self.snake.steps_per_update):
+        for step in range(self.snake.steps_per_update):
             if not self.game_over: 
+                 if self.snake.input_queue and not (step == 0 and started_now): self.snake.take_turn()
                  self.snake.move()
                  head_pos = self.snake.get_head_position() 
                  is_out_of_bounds = not (0 <= head_pos[0] < self.width and 0 <= head_pos[1] < self.height)
                  if is_out_of_bounds:
                      if self.snake.is_wall_ghost:
                          new_head_pos = (head_pos[0] % self.width, head_pos[1] % self.height)
-                         self.snake.body[0] = new_head_pos; head_pos = new_head_pos 
+                         self.snake.set_head(new_head_pos); head_pos = new_head_pos 
                      else: self.game_over = True; return
-                 if head_pos in self.snake.get_body()[1:]: self.game_over = True; return
+                 if self.snake.hits_body(head_pos): self.game_over = True; return
+        if prof: prof.mark('movement')
         
         head_pos = self.snake.get_head_position() 
         food_eaten_this_tick = False; eaten_food_index = -1
@@ -181,19 +350,61 @@ class Game: # Single Player Game
                 food_eaten_this_tick = True; break 
         
         if food_eaten_this_tick and eaten_food_index != -1:
-            self.foods.pop(eaten_food_index)
+            self._free_cells.release(self.foods.pop(eaten_food_index))
+            if prof: prof.mark('food_scan')
             self._generate_food() 
             self._generate_powerup_item()
+            if prof: prof.mark('spawn')
+        elif prof: prof.mark('food_scan')
 
         current_head_pos_for_pickup = head_pos 
         if self.powerup_item and current_head_pos_for_pickup == self.powerup_item.position:
             self._activate_powerup(self.powerup_item.type_id); self._clear_powerup_item()
+        if prof: prof.mark('powerup_pickup')
         
         if self.game_over: return
 
+    # --- Snapshot / Restore ---
+    # A snapshot is a flat tuple: immutable copies of the bodies and foods, the RNG state and the
+    # free-cell index arrays. Restoring into this game or a clone() continues bit-identically.
+    def snapshot(self):
+        pu = self.powerup_item
+        return (self.tick, self.game_over, tuple(self.foods), (pu.type_id, pu.position) if pu else None,
+                self.powerup_on_map_lifespan_timer, self.rng.getstate(), self._free_cells.snapshot(), self.snake.snapshot())
+
+    def restore(self, state):
+        (self.tick, self.game_over, foods, pu, lifespan, rng_state, cells_state, snake_state) = state
+        self.timers.reset(self.tick) # Pending expiries belong to the old timeline; the setters below reschedule
+        self.foods = list(foods); self.powerup_item = self._make_powerup(*pu) if pu else None
+        self.powerup_on_map_lifespan_timer = lifespan
+        self.rng.setstate(rng_state); self._free_cells.restore(cells_state); self.snake.restore(snake_state)
+        self.state_epoch += 1
+
+    def clone(self):
+        other = copy.copy(self)
+        other.rng = random.Random.__new__(type(self.rng)); other._free_cells = copy.copy(self._free_cells)
+        other.snake = copy.copy(self.snake); other.snake.cell_index = other._free_cells
+        other.timers = other.snake.timers = TimerWheel()
+        other.input_log = None; other.profiler = None
+        other.restore(self.snapshot())
+        return other
+
+    def _make_powerup(self, type_id, pos):
+        definition = self.POWERUP_DEFINITIONS[type_id]
+        return PowerUp(type_id,pos,definition['color'],definition['symbol'],definition['effect_duration'])
+
     def change_snake_direction(self, new_direction): 
         # is_started logic is now handled in Snake.turn()
-        if not self.game_over: self.snake.turn(new_direction)
+        if not self.game_over:
+            if self.input_log is not None: self.input_log.append((self.tick, 1, new_direction, False))
+            self.snake.turn(new_direction)
+
+    def queue_turn(self, new_direction):
+        """Buffered change_snake_direction: the turn is taken at the snake's next move step (see Snake.take_turn),
+        so presses faster than the tick rate are not lost. Returns False when the input is dropped."""
+        if self.game_over: return False
+        if self.input_log is not None: self.input_log.append((self.tick, 1, new_direction, True))
+        return self.snake.queue_turn(new_direction)
 
     def get_score(self): return self.snake.score
     def is_game_over(self): return self.game_over
@@ -204,11 +415,18 @@ class Game: # Single Player Game
         return None
 
 class TwoPlayerGame:
-    def __init__(self, width, height, map_id=0, game_mode='last_snake', target_score=10): 
+    powerup_on_map_lifespan_timer = property(_item_lifespan, _set_item_lifespan); expire = _expire_item
+
+    def __init__(self, width, height, map_id=0, game_mode='last_snake', target_score=10, seed=None): 
         self.width=width; self.height=height; self.map_id=map_id; self.obstacles=[] 
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self.rng = random.Random(self.seed)
+        self.tick = 0; self.input_log = None; self.profiler = None; self.state_epoch = 0
+        self.timers = TimerWheel()
         self.game_mode=game_mode; self.target_score=target_score
         self.snake1=Snake(1,(width//4,height//2),'RIGHT','GREEN')
         self.snake2=Snake(2,(width*3//4,height//2),'LEFT','BLUE')
+        self.snake1.timers = self.snake2.timers = self.timers
         self.foods=[] ; self.MAX_FOOD_ITEMS=5
         self.game_over=False; self.winner=None
         self.powerup_item=None; self.powerup_spawn_chance=0.20
@@ -222,56 +440,49 @@ class TwoPlayerGame:
 
     def set_map(self, map_id_to_set):
         self.map_id = map_id_to_set
-        self.obstacles = list(MAP_DEFINITIONS.get(self.map_id, [])) 
-        s1_initial = (self.width//4,self.height//2); s2_initial = (self.width*3//4,self.height//2)
-        
-        s2_body_for_s1_spawn = self.snake2.body if hasattr(self, 'snake2') and self.snake2.body else []
-        s1_body_for_s2_spawn = self.snake1.body if hasattr(self, 'snake1') and self.snake1.body else []
-        
-        occupied_for_s1 = s2_body_for_s1_spawn + [s2_initial]
-        occupied_for_s2 = s1_body_for_s2_spawn + [s1_initial]
+        layout = map_layout(self.map_id, self.width, self.height) # Cached per map and board size
+        self.obstacles = layout.obstacles; self.obstacle_set = layout.obstacle_set # Shared with the layout: read-only
+        s1_initial, s2_initial = layout.spawns # Free cells, moved off obstacles when needed
+        if self.powerup_item: self._clear_powerup_item()
 
-        if s1_initial in self.obstacles: s1_initial = self._generate_location(occupied_for_s1) or (1,1)
-        if s2_initial in self.obstacles: s2_initial = self._generate_location(occupied_for_s2) or (self.width-2,self.height-2)
-        
-        self.snake1.body=[s1_initial]; self.snake1.direction='RIGHT'; self._deactivate_direct_effects(self.snake1); self.snake1.is_started = False
-        self.snake2.body=[s2_initial]; self.snake2.direction='LEFT'; self._deactivate_direct_effects(self.snake2); self.snake2.is_started = False
+        # Fresh free-cell index for the new map (copied from the layout's template); obstacles stay occupied for the whole game
+        self._free_cells = FreeCellIndex.for_layout(layout)
+
+        self.snake1.reset_body(s1_initial); self.snake1.direction='RIGHT'; self._deactivate_direct_effects(self.snake1); self.snake1.is_started = False
+        self.snake2.reset_body(s2_initial); self.snake2.direction='LEFT'; self._deactivate_direct_effects(self.snake2); self.snake2.is_started = False
+        for s in [self.snake1, self.snake2]:
+            s.cell_index = self._free_cells; s.input_queue.clear()
+            for pos in s.body: self._free_cells.occupy(pos)
         self.foods=[]; self._generate_food()
-        if self.powerup_item: self._clear_powerup_item()
         self.snake1.score=0; self.snake2.score=0
-        self.game_over=False; self.winner=None
+        self.game_over=False; self.winner=None; self.state_epoch += 1
 
-    def _generate_location(self, dynamic_occupied_spaces):
-        full_occupied_spaces = set(dynamic_occupied_spaces + self.obstacles) 
-        if len(full_occupied_spaces) >= self.width*self.height: return None 
-        attempts=0; max_attempts = (self.width*self.height)-len(full_occupied_spaces)+10
-        if max_attempts <=0 : max_attempts = 1
-        while attempts < max_attempts:
-            pos = (random.randint(0,self.width-1), random.randint(0,self.height-1))
-            if pos not in full_occupied_spaces: return pos
-            attempts +=1
-        return None 
+    def _generate_location(self):
+        # Uniform pick from the free-cell index (both snakes, foods and power-up are kept occupied)
+        pos = self._free_cells.sample(self.rng)
+        if self.profiler:
+            self.profiler.count('spawn_attempts')
+            if pos is None: self.profiler.count('spawn_failures')
+        return pos
 
     def _generate_food(self): 
         while len(self.foods) < self.MAX_FOOD_ITEMS:
-            occupied = self.snake1.get_body()+self.snake2.get_body()+self.foods
-            if self.powerup_item: occupied.append(self.powerup_item.position)
-            new_food_pos = self._generate_location(occupied)
-            if new_food_pos: self.foods.append(new_food_pos)
+            new_food_pos = self._generate_location()
+            if new_food_pos: self.foods.append(new_food_pos); self._free_cells.occupy(new_food_pos)
             else: break
 
     def _generate_powerup_item(self):
-        if self.powerup_item is None and random.random() < self.powerup_spawn_chance:
-            current_occupied = self.snake1.get_body() + self.snake2.get_body() + self.foods
-            if self.powerup_item: current_occupied.append(self.powerup_item.position)
-            pos = self._generate_location(current_occupied) 
+        if self.powerup_item is None and self.rng.random() < self.powerup_spawn_chance:
+            pos = self._generate_location() 
             if pos is None: return 
-            type_id = random.choice(list(self.POWERUP_DEFINITIONS.keys()))
-            definition = self.POWERUP_DEFINITIONS[type_id]
-            self.powerup_item = PowerUp(type_id,pos,definition['color'],definition['symbol'],definition['effect_duration'])
+            type_id = self.rng.choice(list(self.POWERUP_DEFINITIONS.keys()))
+            self.powerup_item = self._make_powerup(type_id, pos)
+            self._free_cells.occupy(pos)
             self.powerup_on_map_lifespan_timer = self.POWERUP_MAP_LIFESPAN
 
-    def _clear_powerup_item(self): self.powerup_item=None; self.powerup_on_map_lifespan_timer=0
+    def _clear_powerup_item(self):
+        if self.powerup_item: self._free_cells.release(self.powerup_item.position)
+        self.powerup_item=None; self.powerup_on_map_lifespan_timer=0
         
     def _activate_powerup(self, snake, opponent_snake, powerup_type):
         definition = self.POWERUP_DEFINITIONS[powerup_type]
@@ -289,69 +500,74 @@ class TwoPlayerGame:
         if snake_to_clear.active_powerup_type is not None:
              snake_to_clear.active_powerup_type = None; snake_to_clear.powerup_effect_timer = 0
             
-    def _update_powerup_timers(self): 
-        for s in [self.snake1, self.snake2]:
-            if s.powerup_effect_timer > 0:
-                s.powerup_effect_timer -= 1
-                if s.powerup_effect_timer == 0: 
-                    if s.active_powerup_type=='speed_self': s.steps_per_update=1
-                    elif s.active_powerup_type=='wall_ghost': s.is_wall_ghost=False
-                    s.active_powerup_type = None 
-            if s.is_slowed_timer > 0:
-                s.is_slowed_timer -= 1
-                if s.is_slowed_timer == 0: s.slow_effect_counter = 0 
-        if self.powerup_item and self.powerup_on_map_lifespan_timer > 0: 
-            self.powerup_on_map_lifespan_timer -=1
-            if self.powerup_on_map_lifespan_timer <= 0: self._clear_powerup_item()
+    def _update_powerup_timers(self): # See Game._update_powerup_timers
+        for kind, target, tick in self.timers.advance(self.tick): target.expire(kind, tick)
 
-    def update(self):
+    def update(self): # See Game.update
+        prof = self.profiler
+        if prof is None: return self._step(None)
+        prof.begin_tick()
+        try: self._step(prof)
+        finally: prof.end_tick()
+
+    def _step(self, prof):
         if self.game_over: return
+        self.tick += 1
         self._update_powerup_timers()
+        if prof: prof.mark('powerup_timers')
 
         # Snake Movement
+        started_now_s1 = not self.snake1.is_started and self.snake1.take_turn() # See Game._step
         if self.snake1.is_started: # MODIFIED: Check if snake has started
             perform_move_s1 = True
-            if self.snake1.is_slowed_timer > 0:
+            if self.snake1.slowed_ends > self.tick:
                 self.snake1.slow_effect_counter=(self.snake1.slow_effect_counter+1)%2
                 if self.snake1.slow_effect_counter == 1: perform_move_s1=False
             if perform_move_s1:
-                for _ in range(self.snake1.steps_per_update): 
+                for step in range(self.snake1.steps_per_update): 
+                    if self.snake1.input_queue and not (step == 0 and started_now_s1): self.snake1.take_turn()
                     if not self.game_over: self.snake1.move()
             if self.game_over: return 
         
+        started_now_s2 = not self.snake2.is_started and self.snake2.take_turn() # See Game._step
         if self.snake2.is_started: # MODIFIED: Check if snake has started
             perform_move_s2 = True
-            if self.snake2.is_slowed_timer > 0:
+            if self.snake2.slowed_ends > self.tick:
                 self.snake2.slow_effect_counter=(self.snake2.slow_effect_counter+1)%2
                 if self.snake2.slow_effect_counter == 1: perform_move_s2=False
             if perform_move_s2:
-                for _ in range(self.snake2.steps_per_update): 
+                for step in range(self.snake2.steps_per_update): 
+                    if self.snake2.input_queue and not (step == 0 and started_now_s2): self.snake2.take_turn()
                     if not self.game_over: self.snake2.move()
             if self.game_over: return 
+        if prof: prof.mark('movement')
 
         if not (self.snake1.is_started or self.snake2.is_started) and not self.game_over : # MODIFIED: Gate main game logic
             return
 
         s1_h=self.snake1.get_head_position(); s2_h=self.snake2.get_head_position()
-        s1_b=self.snake1.get_body(); s2_b=self.snake2.get_body()
 
         food_eaten_s1=False; food_idx_s1=-1
         if self.snake1.is_started: # MODIFIED
             for i,fp in enumerate(list(self.foods)): 
                 if s1_h==fp: self.snake1.grow(); food_idx_s1=i; food_eaten_s1=True; break
             if food_eaten_s1: 
-                if food_idx_s1 != -1 : self.foods.pop(food_idx_s1) 
+                if food_idx_s1 != -1 : self._free_cells.release(self.foods.pop(food_idx_s1)) 
+                if prof: prof.mark('food_scan')
                 self._generate_food(); self._generate_powerup_item()
+                if prof: prof.mark('spawn')
         
         food_eaten_s2=False; food_idx_s2=-1
         if self.snake2.is_started: # MODIFIED
             for i,fp in enumerate(list(self.foods)): 
                 if s2_h==fp: self.snake2.grow(); food_idx_s2=i; food_eaten_s2=True; break
             if food_eaten_s2: 
-                if food_idx_s2 != -1 : self.foods.pop(food_idx_s2)
+                if food_idx_s2 != -1 : self._free_cells.release(self.foods.pop(food_idx_s2))
+                if prof: prof.mark('food_scan')
                 self._generate_food()
                 if not food_eaten_s1 : self._generate_powerup_item()
-
+                if prof: prof.mark('spawn')
+        if prof: prof.mark('food_scan')
 
         if self.powerup_item:
             # Check collection only if snake has started and powerup_item exists
@@ -359,28 +575,65 @@ class TwoPlayerGame:
                 self._activate_powerup(self.snake1,self.snake2,self.powerup_item.type_id); self._clear_powerup_item()
             elif self.snake2.is_started and self.powerup_item and s2_h==self.powerup_item.position: # MODIFIED & Check powerup_item again
                  self._activate_powerup(self.snake2,self.snake1,self.powerup_item.type_id); self._clear_powerup_item()
+        if prof: prof.mark('powerup_pickup')
 
         if self.game_mode=='first_to_x' and not self.game_over:
             s1r=(self.snake1.score>=self.target_score); s2r=(self.snake2.score>=self.target_score)
             if s1r or s2r: self.game_over=True
             if s1r and s2r: self.winner='draw' if self.snake1.score==self.snake2.score else ('player1' if self.snake1.score>self.snake2.score else 'player2')
-            elif s1r: self.winner='player1'; elif s2r: self.winner='player2'
+            elif s1r: self.winner='player1'
+            elif s2r: self.winner='player2'
             if self.game_over: return
 
         if self.game_over: return
-        s1_ob=not self.snake1.is_wall_ghost and not (0<=s1_h[0]<self.width and 0<=s1_h[1]<self.height)
-        s2_ob=not self.snake2.is_wall_ghost and not (0<=s2_h[0]<self.width and 0<=s2_h[1]<self.height)
-        if self.snake1.is_wall_ghost and s1_ob: s1_h=(s1_h[0]%self.width,s1_h[1]%self.height); self.snake1.body[0]=s1_h
-        if self.snake2.is_wall_ghost and s2_ob: s2_h=(s2_h[0]%self.width,s2_h[1]%self.height); self.snake2.body[0]=s2_h
-        s1_sc=s1_h in s1_b[1:]; s2_sc=s2_h in s2_b[1:]
+        s1_out=not (0<=s1_h[0]<self.width and 0<=s1_h[1]<self.height)
+        s2_out=not (0<=s2_h[0]<self.width and 0<=s2_h[1]<self.height)
+        if self.snake1.is_wall_ghost and s1_out: s1_h=(s1_h[0]%self.width,s1_h[1]%self.height); self.snake1.set_head(s1_h)
+        if self.snake2.is_wall_ghost and s2_out: s2_h=(s2_h[0]%self.width,s2_h[1]%self.height); self.snake2.set_head(s2_h)
+        s1_ob=s1_out and not self.snake1.is_wall_ghost; s2_ob=s2_out and not self.snake2.is_wall_ghost
+        s1_sc=self.snake1.hits_body(s1_h); s2_sc=self.snake2.hits_body(s2_h)
         hc=(s1_h==s2_h)
-        s1h2b=s1_h in s2_b[1:] if not hc else False; s2h1b=s2_h in s1_b[1:] if not hc else False
-        s1ho=(s1_h in self.obstacles); s2ho=(s2_h in self.obstacles)
+        s1h2b=self.snake2.hits_body(s1_h) if not hc else False; s2h1b=self.snake1.hits_body(s2_h) if not hc else False
+        s1ho=(s1_h in self.obstacle_set); s2ho=(s2_h in self.obstacle_set)
         p1l=s1_ob or s1_sc or s1h2b or s1ho; p2l=s2_ob or s2_sc or s2h1b or s2ho
         if hc: self.game_over=True;self.winner='draw'
         elif p1l and p2l: self.game_over=True;self.winner='draw'
         elif p1l: self.game_over=True;self.winner='player2'
         elif p2l: self.game_over=True;self.winner='player1'
+        if prof: prof.mark('collision')
+
+    # --- Snapshot / Restore (see Game.snapshot) ---
+    def snapshot(self):
+        pu = self.powerup_item
+        return (self.tick, self.game_over, self.winner, self.map_id, self.obstacles, tuple(self.foods),
+                (pu.type_id, pu.position) if pu else None, self.powerup_on_map_lifespan_timer, self.rng.getstate(),
+                self._free_cells.snapshot(), self.snake1.snapshot(), self.snake2.snapshot())
+
+    def restore(self, state):
+        (self.tick, self.game_over, self.winner, self.map_id, self.obstacles, foods, pu,
+         lifespan, rng_state, cells_state, s1_state, s2_state) = state
+        self.timers.reset(self.tick) # See Game.restore
+        self.foods = list(foods); self.powerup_item = self._make_powerup(*pu) if pu else None
+        self.powerup_on_map_lifespan_timer = lifespan
+        self.rng.setstate(rng_state); self._free_cells.restore(cells_state)
+        self.snake1.restore(s1_state); self.snake2.restore(s2_state)
+        layout = map_layout(self.map_id, self.width, self.height)
+        self.obstacle_set = layout.obstacle_set if self.obstacles is layout.obstacles else frozenset(self.obstacles)
+        self.state_epoch += 1
+
+    def clone(self):
+        other = copy.copy(self)
+        other.rng = random.Random.__new__(type(self.rng)); other._free_cells = copy.copy(self._free_cells)
+        other.snake1 = copy.copy(self.snake1); other.snake2 = copy.copy(self.snake2)
+        other.snake1.cell_index = other._free_cells; other.snake2.cell_index = other._free_cells
+        other.timers = other.snake1.timers = other.snake2.timers = TimerWheel()
+        other.input_log = None; other.profiler = None
+        other.restore(self.snapshot())
+        return other
+
+    def _make_powerup(self, type_id, pos):
+        definition = self.POWERUP_DEFINITIONS[type_id]
+        return PowerUp(type_id,pos,definition['color'],definition['symbol'],definition['effect_duration'])
 
     def get_powerup_item_details(self):
         if self.powerup_item: return {'position':self.powerup_item.position,'symbol':self.powerup_item.symbol,'color':self.powerup_item.color}
@@ -388,8 +641,13 @@ class TwoPlayerGame:
     def get_obstacles(self): return self.obstacles
     def change_snake_direction(self, snake_id, new_direction): 
         if self.game_over: return
+        if self.input_log is not None and snake_id in (1,2): self.input_log.append((self.tick, snake_id, new_direction, False))
         if snake_id==1:self.snake1.turn(new_direction)
         elif snake_id==2:self.snake2.turn(new_direction)
+    def queue_turn(self, snake_id, new_direction): # See Game.queue_turn
+        if self.game_over or snake_id not in (1,2): return False
+        if self.input_log is not None: self.input_log.append((self.tick, snake_id, new_direction, True))
+        return (self.snake1 if snake_id == 1 else self.snake2).queue_turn(new_direction)
     def get_scores(self): return self.snake1.score, self.snake2.score
     def is_game_over(self): return self.game_over
     def get_winner(self): return self.winner
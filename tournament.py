@@ -0,0 +1,159 @@
+"""Round-robin TwoPlayerGame tournaments between bots, fanned out over a process pool.
+
+Every ordered pair of bots plays `--games` matches on every map in every game mode. Each match
+gets a seed derived from the tournament seed and its index, so a tournament is reproducible
+regardless of worker count or completion order.
+
+    python tournament.py --bots random greedy [--games 20] [--maps 0 1 2] [--modes last_snake first_to_x]
+                         [--workers N] [--chunk 16] [--max-ticks 3000] [--seed 0] [--json results.json]
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+from snake_core import MAP_DEFINITIONS, TwoPlayerGame
+from bots import BOTS
+
+GAME_MODES = ('last_snake', 'first_to_x')
+
+def match_seed(tournament_seed, index):
+    digest = hashlib.blake2b(f'{tournament_seed}:{index}'.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+def schedule(bots, games, maps=None, modes=GAME_MODES, target_score=10, max_ticks=3000, seed=0,
+             width=40, height=30):
+    """Match specs: (index, bot1, bot2, map_id, game_mode, target_score, seed, max_ticks, width, height)."""
+    maps = sorted(MAP_DEFINITIONS) if maps is None else maps
+    specs = []
+    for (b1, b2), map_id, mode in itertools.product(itertools.permutations(bots, 2), maps, modes):
+        for _ in range(games):
+            i = len(specs)
+            specs.append((i, b1, b2, map_id, mode, target_score, match_seed(seed, i), max_ticks, width, height))
+    return specs
+
+def play_match(spec):
+    """Returns (index, winner, score1, score2, ticks); winner is 'timeout' if max_ticks ran out."""
+    index, b1, b2, map_id, mode, target_score, seed, max_ticks, width, height = spec
+    game = TwoPlayerGame(width, height, map_id=map_id, game_mode=mode, target_score=target_score, seed=seed)
+    bot1, bot2 = BOTS[b1], BOTS[b2]
+    rng1 = random.Random(seed + 1); rng2 = random.Random(seed + 2)
+    while not game.game_over and game.tick < max_ticks:
+        game.change_snake_direction(1, bot1(game, 1, rng1))
+        game.change_snake_direction(2, bot2(game, 2, rng2))
+        game.update()
+    s1, s2 = game.get_scores()
+    return (index, game.winner if game.game_over else 'timeout', s1, s2, game.tick)
+
+def _run_chunk(chunk):
+    # One round trip per chunk keeps IPC small next to the matches themselves
+    return [play_match(spec) for spec in chunk]
+
+def _distribution(values):
+    if not values: return None
+    ordered = sorted(values)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {'mean': statistics.fmean(ordered), 'p50': pick(0.5), 'p90': pick(0.9), 'min': ordered[0], 'max': ordered[-1]}
+
+class TournamentResults:
+    def __init__(self):
+        self.bots = {}; self.head_to_head = Counter(); self.lengths = {}; self.matches = 0
+
+    def _bot(self, name):
+        if name not in self.bots:
+            self.bots[name] = {'games': 0, 'wins': 0, 'losses': 0, 'draws': 0, 'timeouts': 0, 'scores': Counter()}
+        return self.bots[name]
+
+    def add(self, spec, result):
+        _, b1, b2, map_id, mode = spec[:5]
+        _, winner, s1, s2, ticks = result
+        self.matches += 1
+        self.lengths.setdefault(f'{mode}/map{map_id}', []).append(ticks)
+        for name, score, won, lost in ((b1, s1, 'player1', 'player2'), (b2, s2, 'player2', 'player1')):
+            b = self._bot(name)
+            b['games'] += 1; b['scores'][score] += 1
+            if winner == won: b['wins'] += 1
+            elif winner == lost: b['losses'] += 1
+            elif winner == 'draw': b['draws'] += 1
+            else: b['timeouts'] += 1
+        if winner == 'player1': self.head_to_head[(b1, b2)] += 1
+        elif winner == 'player2': self.head_to_head[(b2, b1)] += 1
+
+    def summary(self):
+        bots = {}
+        for name, b in sorted(self.bots.items()):
+            n = b['games']; scores = list(b['scores'].elements())
+            bots[name] = {'games': n, 'win_rate': b['wins'] / n, 'loss_rate': b['losses'] / n,
+                          'draw_rate': b['draws'] / n, 'timeout_rate': b['timeouts'] / n,
+                          'score': _distribution(scores), 'score_histogram': dict(sorted(b['scores'].items()))}
+        return {'matches': self.matches, 'bots': bots,
+                'head_to_head': {f'{w} beat {l}': n for (w, l), n in sorted(self.head_to_head.items())},
+                'game_length': {k: _distribution(v) for k, v in sorted(self.lengths.items())}}
+
+def run_tournament(specs, workers=None, chunk=16, progress=None):
+    """Plays all specs and aggregates them. Chunks are handed to whichever worker is idle next, so
+    long matches on one worker do not hold up the rest."""
+    workers = workers or os.cpu_count() or 1
+    by_index = {spec[0]: spec for spec in specs}
+    # Deterministic shuffle spreads long and short match types evenly across chunks
+    order = list(specs); random.Random(len(specs)).shuffle(order)
+    chunks = [order[i:i + chunk] for i in range(0, len(order), chunk)]
+    results = TournamentResults()
+    if workers == 1:
+        batches = map(_run_chunk, chunks)
+    else:
+        pool = multiprocessing.Pool(workers)
+        batches = pool.imap_unordered(_run_chunk, chunks)
+    try:
+        for batch in batches:
+            for result in batch: results.add(by_index[result[0]], result)
+            if progress: progress(results.matches, len(specs))
+    finally:
+        if workers != 1: pool.close(); pool.join()
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--bots', nargs='+', default=sorted(BOTS), choices=sorted(BOTS))
+    parser.add_argument('--games', type=int, default=10, help='matches per ordered pairing, map and mode')
+    parser.add_argument('--maps', type=int, nargs='+', default=None, choices=sorted(MAP_DEFINITIONS))
+    parser.add_argument('--modes', nargs='+', default=list(GAME_MODES), choices=GAME_MODES)
+    parser.add_argument('--target-score', type=int, default=10)
+    parser.add_argument('--max-ticks', type=int, default=3000)
+    parser.add_argument('--width', type=int, default=40)
+    parser.add_argument('--height', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None, help='default: one per CPU; 1 runs in-process')
+    parser.add_argument('--chunk', type=int, default=16, help='matches per work item')
+    parser.add_argument('--json', metavar='PATH', help="write the summary as JSON ('-' for stdout)")
+    args = parser.parse_args(argv)
+    if len(args.bots) < 2: parser.error('need at least two bots')
+
+    specs = schedule(args.bots, args.games, args.maps, args.modes, args.target_score, args.max_ticks, args.seed,
+                     args.width, args.height)
+    t0 = time.perf_counter()
+    summary = run_tournament(specs, args.workers, args.chunk).summary()
+    elapsed = time.perf_counter() - t0
+    summary['elapsed_s'] = elapsed; summary['matches_per_s'] = len(specs) / elapsed
+
+    if args.json == '-':
+        json.dump(summary, sys.stdout, indent=1); print(); return 0
+    if args.json:
+        with open(args.json, 'w') as f: json.dump(summary, f, indent=1)
+    print(f"{len(specs)} matches in {elapsed:.1f}s ({summary['matches_per_s']:.1f}/s)")
+    print(f"{'bot':10s} {'games':>6} {'win':>6} {'draw':>6} {'loss':>6} {'t/o':>6} {'score':>6} {'p90':>4}")
+    for name, b in summary['bots'].items():
+        print(f"{name:10s} {b['games']:6d} {b['win_rate']:6.1%} {b['draw_rate']:6.1%} {b['loss_rate']:6.1%} "
+              f"{b['timeout_rate']:6.1%} {b['score']['mean']:6.2f} {b['score']['p90']:4d}")
+    for key, d in summary['game_length'].items():
+        print(f"length {key:22s} mean {d['mean']:7.1f}  p50 {d['p50']:5d}  p90 {d['p90']:5d}  max {d['max']:5d}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())